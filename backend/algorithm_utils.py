@@ -1,5 +1,11 @@
 # backend/algorithm_utils.py
 
+from itertools import groupby
+from operator import itemgetter
+from typing import Sequence, Tuple, Union
+
+SortKey = Union[int, Tuple[int, bool]]      # key_index or (key_index, descending)
+
 # ---------------------------
 # Merge Sort Implementation
 # ---------------------------
@@ -8,12 +14,41 @@ def merge_sort(students, key_index=3):
     Sorts a list of student tuples by a key (default = marks at index 3).
     key_index = 3 corresponds to marks in (roll_no, name, branch, marks, attendance)
     """
+    return multi_key_sort(students, [(key_index, False)])
+
+
+def multi_key_sort(students, keys: Sequence[SortKey] = ((3, False),)):
+    """
+    Stable sort on several keys, each ascending or descending, e.g.
+    [(2, False), (3, True)] = branch A→Z, then marks high→low.
+
+    Lists go through the builtin (stable, C-level) list.sort: one pass per run of
+    same-direction keys, least significant run first, with an itemgetter key and
+    reverse= for descending runs. This works for text keys too, which cannot be
+    negated.
+    """
+    keys = [(k, False) if isinstance(k, int) else (k[0], bool(k[1])) for k in keys]
+    items = list(students)
+    if len(items) <= 1 or not keys:
+        return items
+    runs = [(desc, [idx for idx, _ in run]) for desc, run in groupby(keys, key=itemgetter(1))]
+    for desc, indexes in reversed(runs):
+        # reverse=True keeps equal rows in their order, so earlier passes survive.
+        items.sort(key=itemgetter(*indexes), reverse=desc)
+    return items
+
+
+def merge_sort_recursive(students, key_index=3):
+    """
+    Original top-down merge sort, kept as the reference implementation for
+    benchmarks/bench_sort.py. Prefer merge_sort() / multi_key_sort().
+    """
     if len(students) <= 1:
         return students
 
     mid = len(students) // 2
-    left = merge_sort(students[:mid], key_index)
-    right = merge_sort(students[mid:], key_index)
+    left = merge_sort_recursive(students[:mid], key_index)
+    right = merge_sort_recursive(students[mid:], key_index)
     return merge(left, right, key_index)
 
 def merge(left, right, key_index):
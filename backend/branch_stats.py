@@ -0,0 +1,48 @@
+# backend/branch_stats.py
+
+from typing import Dict, Optional, Sequence, Tuple
+
+from backend.group_stats import DEBAR_THRESHOLD, finish_stats, merge_group_stats
+from backend.scatter_gather import GatherResult, scatter_gather
+
+# Mergeable partials computed on each fragment; the coordinator only adds them up.
+PARTIALS_SQL = (
+    "SELECT UPPER(branch), COUNT(*), SUM(marks), SUM(marks * marks), MIN(marks), MAX(marks), "
+    "SUM(attendance), SUM(attendance * attendance), SUM(attendance < %s) "
+    "FROM students GROUP BY UPPER(branch)"
+)
+PARTIAL_FIELDS = ("count", "marks_sum", "marks_sumsq", "min_marks", "max_marks",
+                  "attendance_sum", "attendance_sumsq", "debarred")
+
+
+def _partial(row: Sequence) -> Dict[str, float]:
+    values = dict(zip(PARTIAL_FIELDS, row[1:]))
+    stats = {k: float(v or 0) for k, v in values.items()}     # SUM() comes back as Decimal
+    stats["count"] = int(stats["count"])
+    stats["debarred"] = int(stats["debarred"])
+    return finish_stats(stats)
+
+
+def fetch_branch_stats_timed(threshold: float = DEBAR_THRESHOLD,
+                             nodes: Optional[Sequence[str]] = None
+                             ) -> Tuple[Dict[str, Dict[str, float]], GatherResult]:
+    """
+    Per-branch count, sums, sums of squares, min/max and debarred count, aggregated on
+    the fragments: each node returns one row per branch it stores. Only the owning
+    node's row is kept, so rows replicated onto another fragment are not counted twice.
+    """
+    gathered = scatter_gather(PARTIALS_SQL, (threshold,), nodes)
+    stats: Dict[str, Dict[str, float]] = {}
+    for node, shard in gathered.shards.items():
+        if shard.error is not None:
+            print(f"⚠ Summary stats unavailable for {node}: {shard.error}")
+            continue
+        for row in shard.rows:
+            if row[0] == node and row[1]:
+                merge_group_stats(stats, {node: _partial(row)})
+    return stats, gathered
+
+
+def fetch_branch_stats(threshold: float = DEBAR_THRESHOLD,
+                       nodes: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, float]]:
+    return fetch_branch_stats_timed(threshold, nodes)[0]
@@ -0,0 +1,180 @@
+# backend/bulk_loader.py
+
+import csv
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from mysql.connector import Error
+
+from backend.connection_pool import get_pool
+from backend.scatter_gather import get_executor
+from backend.shard_router import INSERT_SQL, get_router
+from backend.write_events import WriteEvent, has_write_listeners, publish
+
+FIELDS = ("roll_no", "name", "branch", "marks", "attendance")
+DEFAULT_BATCH_SIZE = 500
+
+ProgressCallback = Callable[[int, int], None]   # (rows processed, total rows)
+
+# ---------------------------
+# Result containers
+# ---------------------------
+@dataclass
+class RowError:
+    row: int                # 1-based position in the input (line number for CSV files)
+    values: Sequence
+    message: str
+
+
+@dataclass
+class BulkResult:
+    total: int = 0
+    inserted: int = 0
+    per_branch: Dict[str, int] = field(default_factory=dict)
+    errors: List[RowError] = field(default_factory=list)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+    def summary(self, max_errors: int = 5) -> str:
+        text = f"Inserted {self.inserted} of {self.total} row(s)"
+        if self.per_branch:
+            text += " (" + ", ".join(f"{b}: {n}" for b, n in self.per_branch.items()) + ")"
+        if self.errors:
+            text += f"\n{self.failed} row(s) rejected:"
+            for err in self.errors[:max_errors]:
+                text += f"\n  row {err.row}: {err.message}"
+            if self.failed > max_errors:
+                text += f"\n  … and {self.failed - max_errors} more"
+        return text
+
+# ---------------------------
+# Validation
+# ---------------------------
+def _normalize(values) -> Tuple:
+    """Coerce one input row (sequence or dict) into (roll_no, name, branch, marks, attendance)."""
+    if isinstance(values, dict):
+        values = [values.get(f) for f in FIELDS]
+    if len(values) != len(FIELDS):
+        raise ValueError(f"expected {len(FIELDS)} columns, got {len(values)}")
+    roll_no, name, branch, marks, attendance = (v.strip() if isinstance(v, str) else v for v in values)
+    if not name:
+        raise ValueError("name is empty")
+    get_router().check_roll(int(roll_no), branch)
+    return int(roll_no), str(name), str(branch), float(marks), float(attendance)
+
+# ---------------------------
+# Loading
+# ---------------------------
+def _load_shard(node: str, rows: List[Tuple[int, Tuple]], batch_size: int, result: BulkResult,
+                report: Callable[[int], None], lock: threading.Lock):
+    """
+    Insert one shard's rows in a single transaction using multi-row INSERT batches.
+    A failing batch is retried row by row so only the offending rows are rejected.
+    """
+    inserted, errors, committed = 0, [], []
+    try:
+        with get_pool(node).connection() as conn:
+            cur = conn.cursor()
+            conn.start_transaction()
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                try:
+                    cur.executemany(INSERT_SQL, [values for _, values in batch])
+                    inserted += len(batch)
+                    committed.extend(values for _, values in batch)
+                except Error:
+                    for row_no, values in batch:
+                        try:
+                            cur.execute(INSERT_SQL, values)
+                            inserted += 1
+                            committed.append(values)
+                        except Error as e:
+                            errors.append(RowError(row_no, values, str(e)))
+                report(len(batch))
+            conn.commit()
+    except Error as e:
+        # Connection or commit failure: nothing from this shard was kept.
+        inserted, committed = 0, []
+        errors = [RowError(row_no, values, f"{node} load failed: {e}") for row_no, values in rows]
+    if has_write_listeners():
+        for values in committed:
+            publish(WriteEvent("insert", values[0], values[2], None, values))
+    with lock:
+        result.inserted += inserted
+        result.per_branch[node] = inserted
+        result.errors.extend(errors)
+
+
+def add_students_bulk(rows: Iterable, batch_size: int = DEFAULT_BATCH_SIZE,
+                      progress: Optional[ProgressCallback] = None, parallel: bool = True) -> BulkResult:
+    """
+    Insert many students at once. Rows are (roll_no, name, branch, marks, attendance)
+    sequences or dicts with those keys. They are grouped by branch and each fragment
+    is written in one transaction with `batch_size` rows per INSERT. Invalid or
+    rejected rows are reported in the result instead of aborting the load.
+    `progress(done, total)` may be called from worker threads when `parallel` is set.
+    """
+    return _bulk_insert(enumerate(rows, start=1), batch_size, progress, parallel)
+
+
+def _bulk_insert(numbered_rows: Iterable[Tuple[int, Sequence]], batch_size: int,
+                 progress: Optional[ProgressCallback], parallel: bool) -> BulkResult:
+    result = BulkResult()
+    by_node: Dict[str, List[Tuple[int, Tuple]]] = {}
+    for row_no, values in numbered_rows:
+        result.total += 1
+        try:
+            clean = _normalize(values)
+        except (Error, ValueError, TypeError) as e:
+            result.errors.append(RowError(row_no, values, str(e)))
+            continue
+        by_node.setdefault(get_router().node_for(clean[2]), []).append((row_no, clean))
+
+    lock = threading.Lock()
+    done = [len(result.errors)]
+
+    def report(count):
+        with lock:
+            done[0] += count
+            current = done[0]
+        if progress:
+            progress(current, result.total)
+
+    if progress:
+        progress(done[0], result.total)
+    batch_size = max(1, int(batch_size))
+    if parallel and len(by_node) > 1:
+        futures = [get_executor().submit(_load_shard, node, shard_rows, batch_size, result, report, lock)
+                   for node, shard_rows in by_node.items()]
+        for f in futures:
+            f.result()
+    else:
+        for node, shard_rows in by_node.items():
+            _load_shard(node, shard_rows, batch_size, result, report, lock)
+    result.errors.sort(key=lambda e: e.row)
+    return result
+
+
+def import_students_csv(path: str, batch_size: int = DEFAULT_BATCH_SIZE,
+                        progress: Optional[ProgressCallback] = None, parallel: bool = True) -> BulkResult:
+    """
+    Load a CSV file into the fragments via add_students_bulk().
+    A header row naming roll_no,name,branch,marks,attendance is optional; without one
+    the columns are read in that order. Row numbers in the error report are file lines.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return BulkResult()
+        header = [c.strip().lower() for c in first]
+        if set(FIELDS) <= set(header):
+            positions = [header.index(name) for name in FIELDS]
+            numbered = [(reader.line_num, [r[i] if i < len(r) else None for i in positions])
+                        for r in reader if r]
+        else:
+            numbered = [(1, first)] + [(reader.line_num, r) for r in reader if r]
+        return _bulk_insert(numbered, batch_size, progress, parallel)
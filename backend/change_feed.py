@@ -0,0 +1,107 @@
+# backend/change_feed.py
+
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.connection_pool import node_configs
+from backend.replication import replication_settings
+from backend.scatter_gather import scatter_each, scatter_gather
+
+SETTLE_SECONDS = 10     # a change_log row this old is assumed to belong to a finished transaction
+
+# Newest settled seq (via idx_change_log_time); with nothing settled yet, just before the oldest row.
+HEAD_SQL = ("SELECT COALESCE((SELECT seq FROM change_log WHERE changed_at < NOW(6) - INTERVAL %s SECOND "
+            "ORDER BY changed_at DESC, seq DESC LIMIT 1), (SELECT MIN(seq) - 1 FROM change_log), 0)")
+CHANGES_SQL = ("SELECT seq, op, roll_no, name, branch, marks, attendance, "
+               "changed_at < NOW(6) - INTERVAL %s SECOND FROM change_log WHERE seq > %s ORDER BY seq")
+
+
+@dataclass
+class ChangeSet:
+    """
+    Net changes since a sync token: final (roll_no, name, branch, marks, attendance)
+    rows to upsert and roll numbers to delete. `full` means the token could not be
+    honoured (no token, expired, unknown fragment, shard error) and the caller must
+    reload everything; `token` is what to pass next time.
+    """
+    upserts: List[Tuple] = field(default_factory=list)
+    deletes: List[int] = field(default_factory=list)
+    token: Optional[str] = None
+    full: bool = False
+
+    def __len__(self):
+        return len(self.upserts) + len(self.deletes)
+
+
+def _encode(seqs: Dict[str, int], issued: float) -> str:
+    return json.dumps({"t": round(issued, 3), "seq": seqs}, separators=(",", ":"))
+
+
+def _decode(token: str) -> Tuple[Dict[str, int], float]:
+    data = json.loads(token)
+    return {k.upper(): int(v) for k, v in data["seq"].items()}, float(data["t"])
+
+
+def current_token(nodes: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    Token for "everything committed up to now". Take it *before* a full load: changes
+    racing with the load are then replayed on the next delta (upserts are idempotent).
+    Like fetch_changes_since(), it only starts past settled rows: a lower seq may belong
+    to a transaction that has not committed yet, so the last SETTLE_SECONDS of changes
+    are replayed rather than risk skipping them. Returns None when a fragment's
+    change_log cannot be read.
+    """
+    issued = time.time()
+    gathered = scatter_gather(HEAD_SQL, (SETTLE_SECONDS,), nodes, routed=False)
+    if gathered.errors:
+        return None
+    return _encode({node: int(shard.rows[0][0]) for node, shard in gathered.shards.items()},
+                   issued - SETTLE_SECONDS)
+
+
+def fetch_changes_since(token: Optional[str], nodes: Optional[Sequence[str]] = None) -> ChangeSet:
+    """
+    Inserts, updates and deletes committed on each fragment after `token`, read from the
+    fragments' change_log tables (database/replication.sql) and collapsed to the final
+    image per roll number, so refresh cost follows churn rather than table size.
+    """
+    nodes = [n.upper() for n in nodes] if nodes is not None else list(node_configs())
+    try:
+        seqs, issued = _decode(token) if token else ({}, 0.0)
+    except (ValueError, KeyError, TypeError):
+        seqs, issued = {}, 0.0
+    retention = float(replication_settings()["retention_hours"]) * 3600
+    if not token or any(n not in seqs for n in nodes) or time.time() - issued > retention:
+        # Older than the change_log retention: purged changes could be missing.
+        return ChangeSet(token=current_token(nodes), full=True)
+
+    started = time.time()
+    gathered = scatter_each({n: (CHANGES_SQL, (SETTLE_SECONDS, seqs[n])) for n in nodes}, routed=False)
+    if gathered.errors:
+        for node, e in gathered.errors.items():
+            print(f"⚠ fetch_changes_since: {node} change_log unavailable: {e}")
+        return ChangeSet(token=None, full=True)
+
+    final: Dict[int, Tuple[str, Tuple]] = {}
+    new_seqs = dict(seqs)
+    for node, shard in gathered.shards.items():
+        settled = True
+        for seq, op, roll, name, branch, marks, attendance, is_settled in shard.rows:
+            final[roll] = (op, (roll, name, branch, marks, attendance))
+            # Sequence numbers are assigned before commit, so a lower seq may still be
+            # uncommitted when a higher one is visible: only advance past settled rows
+            # and re-read the rest next time.
+            settled = settled and bool(is_settled)
+            if settled:
+                new_seqs[node] = int(seq)
+
+    # Everything after the new position is younger than this fetch minus the settle window.
+    changes = ChangeSet(token=_encode(new_seqs, started - SETTLE_SECONDS))
+    for roll, (op, row) in final.items():
+        if op == "D":
+            changes.deletes.append(roll)
+        else:
+            changes.upserts.append(row)
+    return changes
@@ -0,0 +1,301 @@
+# backend/connection_pool.py
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import mysql.connector
+from mysql.connector import Error
+
+from backend.metrics import get_metrics
+
+# ------------------ CONFIGURATION ------------------
+
+META_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "meta_config.json")
+
+POOL_DEFAULTS = {
+    "size": 5,                    # max open connections per node
+    "checkout_timeout": 5.0,      # seconds to wait for a free connection
+    "max_idle": 300.0,            # close connections idle longer than this
+    "health_check_interval": 30.0, # ping connections idle longer than this
+    "read_timeout": 30,           # seconds a MySQL connection waits for the server before giving up
+}
+
+_meta_cache: Optional[dict] = None
+_connect: Optional[Callable[..., object]] = None     # set by backend.storage
+
+
+def load_meta_config(reload: bool = False) -> dict:
+    """Read backend/meta_config.json once and cache it."""
+    global _meta_cache
+    if _meta_cache is None or reload:
+        with open(META_CONFIG_PATH, encoding="utf-8") as f:
+            _meta_cache = json.load(f)
+    return _meta_cache
+
+
+def use_meta_config(meta: dict):
+    """
+    Replace the cached meta_config.json for this process (benchmarks, local stand-ins).
+    Call before the first query: routers and indexes read it when they are created.
+    """
+    global _meta_cache
+    _meta_cache = meta
+
+
+def set_connection_factory(factory: Optional[Callable[..., object]] = None):
+    """
+    Open node connections with `factory(**config)`; None goes back to the storage
+    backend selected in meta_config.json. The factory must return
+    mysql.connector-compatible connections.
+    """
+    global _connect
+    _connect = factory
+
+
+def connect(**config):
+    """Open one unpooled connection through the current connection factory."""
+    factory = _connect
+    if factory is None:
+        # Imported here: backend.storage builds on this module.
+        from backend.storage import get_storage
+        factory = get_storage().connect
+    return factory(**config)
+
+
+def node_configs() -> Dict[str, dict]:
+    """Connection settings of every fragment node, keyed by branch."""
+    return {name.upper(): dict(cfg) for name, cfg in load_meta_config().get("nodes", {}).items()}
+
+
+def roll_ranges() -> Dict[str, tuple]:
+    """Inclusive (low, high) roll_no block stored on each fragment, from "roll_ranges"."""
+    return {name.upper(): (int(lo), int(hi))
+            for name, (lo, hi) in load_meta_config().get("roll_ranges", {}).items()}
+
+
+def pool_settings() -> dict:
+    """Pool settings from the "pool" section of meta_config.json, with defaults."""
+    settings = dict(POOL_DEFAULTS)
+    settings.update(load_meta_config().get("pool", {}))
+    return settings
+
+# ------------------ CONNECTION POOL ------------------
+
+class PoolTimeout(Error):
+    """Raised when no connection becomes free within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Keeps up to `size` warm connections to one MySQL node.
+    Idle connections are pinged before reuse once they have been idle longer than
+    `health_check_interval`, and closed once idle longer than `max_idle`.
+    """
+
+    def __init__(self, name: str, config: dict, size: int = 5, checkout_timeout: float = 5.0,
+                 max_idle: float = 300.0, health_check_interval: float = 30.0,
+                 read_timeout: Optional[int] = None):
+        # read_timeout: the driver gives up on a hung server, freeing workers stuck on
+        # reads abandoned at their deadline (scatter_gather).
+        self.name = name
+        self.config = dict(config)
+        if read_timeout:
+            self.config.setdefault("read_timeout", int(read_timeout))
+        self.size = max(1, int(size))
+        self.checkout_timeout = checkout_timeout
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+
+        self._idle = []                 # stack of (connection, last_used)
+        self._open = 0                  # idle + checked out
+        self._statements = {}           # id(connection) -> {sql: prepared cursor}
+        self._cond = threading.Condition()
+        self._closed = False
+        self.stats = {"created": 0, "reused": 0, "evicted": 0, "failed_checks": 0, "timeouts": 0}
+
+    # ---- checkout / return ----
+    def acquire(self, timeout: Optional[float] = None):
+        """Check out a healthy connection, opening a new one if the pool has room."""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.perf_counter()
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise Error(msg=f"Pool '{self.name}' is closed")
+                self._evict_idle_locked()
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    conn, last_used = None, None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    raise PoolTimeout(msg=f"No free connection for '{self.name}' after {timeout:.1f}s")
+                self._cond.wait(remaining)
+
+        # Network work happens outside the lock.
+        try:
+            if conn is not None and not self._is_healthy(conn, last_used):
+                self.stats["failed_checks"] += 1
+                self._close_quietly(conn)
+                conn = None
+            if conn is None:
+                began = time.perf_counter()
+                conn = connect(**self.config)
+                get_metrics().observe("connect_seconds", time.perf_counter() - began, node=self.name)
+                self.stats["created"] += 1
+            else:
+                self.stats["reused"] += 1
+            get_metrics().observe("pool_checkout_seconds", time.perf_counter() - started, node=self.name)
+            return conn
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, conn, discard: bool = False):
+        """Return a connection; broken or discarded connections are closed instead."""
+        if conn is None:
+            return
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except Exception:
+                discard = True
+        with self._cond:
+            if discard or self._closed:
+                self._open -= 1
+                self._close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """`with pool.connection() as conn:` — always returns the connection to the pool."""
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.release(conn, discard=broken)
+
+    def prepared_cursor(self, conn, sql: str):
+        """
+        Server-side prepared cursor for `sql`, cached per connection so each statement
+        is parsed once per connection rather than once per call.
+        """
+        cache = self._statements.setdefault(id(conn), {})
+        cur = cache.get(sql)
+        if cur is None:
+            cur = conn.cursor(prepared=True)
+            cache[sql] = cur
+        return cur
+
+    # ---- maintenance ----
+    def _is_healthy(self, conn, last_used) -> bool:
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle_locked(self):
+        now = time.monotonic()
+        keep = []
+        for conn, last_used in self._idle:
+            if now - last_used > self.max_idle:
+                self._open -= 1
+                self.stats["evicted"] += 1
+                self._close_quietly(conn)
+            else:
+                keep.append((conn, last_used))
+        self._idle = keep
+
+    def warm_up(self, count: int = 1):
+        """Open connections ahead of the first request so it skips the handshake."""
+        conns = []
+        try:
+            for _ in range(min(count, self.size)):
+                conns.append(self.acquire())
+        finally:
+            for conn in conns:
+                self.release(conn)
+
+    def evict_idle(self):
+        """Close connections that exceeded max_idle (also done lazily on checkout)."""
+        with self._cond:
+            self._evict_idle_locked()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._open -= 1
+                self._close_quietly(conn)
+            self._idle = []
+            self._cond.notify_all()
+
+    def status(self) -> dict:
+        with self._cond:
+            return {"node": self.name, "size": self.size, "open": self._open,
+                    "idle": len(self._idle), **self.stats}
+
+    def _close_quietly(self, conn):
+        self._statements.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+# ------------------ POOL REGISTRY ------------------
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str, config: Optional[dict] = None) -> ConnectionPool:
+    """
+    Return the shared pool for a node, creating it on first use.
+    Fragment nodes are looked up in meta_config.json; other nodes (the catalog)
+    must pass their connection config.
+    """
+    key = name.upper()
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            if config is None:
+                config = node_configs().get(key)
+                if config is None:
+                    raise KeyError(f"Unknown node '{name}' (not in meta_config.json)")
+            pool = ConnectionPool(key, config, **pool_settings())
+            _pools[key] = pool
+        return pool
+
+
+def close_all_pools():
+    """Close every pool (call on application exit)."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+def pool_status() -> Dict[str, dict]:
+    with _pools_lock:
+        return {name: pool.status() for name, pool in _pools.items()}
@@ -1,6 +1,19 @@
-import mysql.connector
 from mysql.connector import Error
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.branch_stats import fetch_branch_stats, fetch_branch_stats_timed
+from backend.bulk_loader import BulkResult, add_students_bulk, import_students_csv
+from backend.change_feed import ChangeSet, current_token, fetch_changes_since
+from backend.connection_pool import connect, get_pool
+from backend.distributed_sort import iter_sorted_students
+from backend.exporter import ExportResult, export_students
+from backend.metrics import instrument
+from backend.name_index import get_name_index
+from backend.query_planner import plan_filter
+from backend.scatter_gather import GatherResult, ShardRows, scatter_each, scatter_gather, stream_shard
+from backend.shard_router import get_router
+from backend.storage import get_storage
+from backend.write_events import WriteEvent, has_write_listeners, publish
 
 # ------------------ CONFIGURATION ------------------
 
@@ -10,126 +23,295 @@ DB_CONFIG = {
     "password": "@Admin123",
     "database": "db_catalog"  # coordinator node
 }
+CATALOG_NODE = "CATALOG"
+STUDENT_COLUMNS = "roll_no, name, branch, marks, attendance"
+DEFAULT_CHUNK_SIZE = 1000
 
+@instrument("db")
 def get_connection():
-    """Get connection to the catalog/coordinator database."""
+    """Get a fresh, unpooled connection to the catalog/coordinator database."""
     try:
-        return mysql.connector.connect(**DB_CONFIG)
+        return connect(**DB_CONFIG)
     except Error as e:
         print(f"❌ Connection error: {e}")
         return None
 
-# ------------------ PROCEDURE CALL HELPERS ------------------
 
+def catalog_connection():
+    """Borrow a warm catalog connection: `with catalog_connection() as conn:`."""
+    return get_pool(CATALOG_NODE, DB_CONFIG).connection()
+
+# Re-exported helpers, timed under their db_handler names like the functions below.
+fetch_branch_stats = instrument("db")(fetch_branch_stats)
+fetch_branch_stats_timed = instrument("db")(fetch_branch_stats_timed)
+add_students_bulk = instrument("db")(add_students_bulk)
+import_students_csv = instrument("db")(import_students_csv)
+current_token = instrument("db")(current_token)
+fetch_changes_since = instrument("db")(fetch_changes_since)
+export_students = instrument("db")(export_students)
+
+# ------------------ WRITE HELPERS (routed to the owning fragment) ------------------
+
+@instrument("db")
 def add_student(roll_no: int, name: str, branch: str, marks: float, attendance: float) -> bool:
-    """Call stored procedure add_student() in MySQL."""
-    conn = get_connection()
-    if not conn:
-        return False
+    """Insert a student directly on the fragment node that owns its branch."""
     try:
-        cur = conn.cursor()
-        cur.callproc("add_student", (roll_no, name, branch, marks, attendance))
-        conn.commit()
+        get_router().insert(roll_no, name, branch, marks, attendance)
+        publish(WriteEvent("insert", roll_no, branch, None, (roll_no, name, branch, marks, attendance)))
         return True
     except Error as e:
         print(f"❌ Error in add_student: {e}")
         return False
-    finally:
-        conn.close()
 
 
+@instrument("db")
 def update_student(roll_no: int, branch: str, new_marks: float, new_attendance: float) -> bool:
-    """Call stored procedure update_student() in MySQL."""
-    conn = get_connection()
-    if not conn:
-        return False
+    """Update marks/attendance on the fragment node that owns the branch."""
     try:
-        cur = conn.cursor()
-        cur.callproc("update_student", (roll_no, branch, new_marks, new_attendance))
-        conn.commit()
+        count, before = get_router().update(roll_no, branch, new_marks, new_attendance,
+                                            capture=has_write_listeners())
+        if count:
+            name, row_branch = (before[1], before[2]) if before else (None, branch)
+            publish(WriteEvent("update", roll_no, branch, before,
+                               (roll_no, name, row_branch, new_marks, new_attendance)))
         return True
     except Error as e:
         print(f"❌ Error in update_student: {e}")
         return False
-    finally:
-        conn.close()
 
 
+@instrument("db")
 def delete_student(roll_no: int, branch: str) -> bool:
-    """Call stored procedure delete_student() in MySQL."""
-    conn = get_connection()
-    if not conn:
-        return False
+    """Delete a student from the fragment node that owns the branch."""
     try:
-        cur = conn.cursor()
-        cur.callproc("delete_student", (roll_no, branch))
-        conn.commit()
+        count, before = get_router().delete(roll_no, branch, capture=has_write_listeners())
+        if count:
+            publish(WriteEvent("delete", roll_no, branch, before, None))
         return True
     except Error as e:
         print(f"❌ Error in delete_student: {e}")
         return False
-    finally:
-        conn.close()
 
 
+@instrument("db")
+def list_branches() -> List[str]:
+    """Branches that have a fragment node in meta_config.json."""
+    return get_router().branches()
+
+# ------------------ READ HELPERS ------------------
+# List reads return ShardRows: a shard that errors or misses its deadline
+# ("shard_deadline" in meta_config.json) is left out and named in `.missing`,
+# so the dashboard shows the healthy shards' rows instead of nothing.
+
+def _partial_rows(gathered: GatherResult, where: str) -> ShardRows:
+    for node, e in gathered.errors.items():
+        print(f"⚠ Error in {where} ({node}): {e}")
+    return ShardRows(gathered.rows, gathered.missing)
+
+
+@instrument("db")
+def fetch_all_students_timed() -> GatherResult:
+    """Read every fragment node in parallel; the result carries per-shard timings."""
+    result = scatter_gather(f"SELECT {STUDENT_COLUMNS} FROM students")
+    for node, e in result.errors.items():
+        print(f"⚠ Error fetching students from {node}: {e}")
+    return result
+
+
+@instrument("db")
 def fetch_all_students() -> List[Tuple]:
-    """Fetch all students using the all_students view in db_catalog."""
-    conn = get_connection()
-    students = []
-    if not conn:
-        return students
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT roll_no, name, branch, marks, attendance FROM all_students;")
-        students = cur.fetchall()
-    except Error as e:
-        print(f"⚠ Error fetching students: {e}")
-    finally:
-        conn.close()
-    return students
+    """Fetch all students by querying the fragment nodes concurrently."""
+    result = fetch_all_students_timed()
+    return ShardRows(result.rows, result.missing)
 
 
+@instrument("db")
 def filter_students(branch=None, roll_from=None, roll_to=None, marks_min=None, marks_max=None,
                     attendance_min=None, attendance_max=None) -> List[Tuple]:
-    """Call stored procedure filter_students() in MySQL."""
-    conn = get_connection()
-    students = []
-    if not conn:
-        return students
+    """
+    Filter with a compiled, parameterized per-shard query, sent only to the shards the
+    branch and roll-range metadata leave in play (see explain_filter()).
+    """
     try:
-        cur = conn.cursor()
-        params = tuple(None if v in ("", "All") else v for v in
-                       (branch, roll_from, roll_to, marks_min, marks_max, attendance_min, attendance_max))
-        cur.callproc("filter_students", params)
-        for result in cur.stored_results():
-            students.extend(result.fetchall())
-    except Error as e:
+        plan = plan_filter(branch, roll_from, roll_to, marks_min, marks_max, attendance_min, attendance_max)
+        gathered = plan.execute()
+    except (Error, ValueError) as e:
         print(f"⚠ Error in filter_students: {e}")
-    finally:
-        conn.close()
-    return students
+        return []
+    return _partial_rows(gathered, "filter_students")
+
+
+@instrument("db")
+def explain_filter(**predicates) -> str:
+    """Which shards filter_students(**predicates) would scan or prune, and the SQL it sends."""
+    return plan_filter(**predicates).explain()
 
+def _name_candidates(keyword: str, branch: Optional[str] = None) -> Dict[str, List[int]]:
+    """Rolls whose name contains `keyword`, from the trigram index, grouped by owning node."""
+    index = get_name_index()
+    if not index.loaded:
+        index.load()
+    groups = index.by_branch(index.substring(keyword))
+    if branch not in (None, "", "All"):
+        node = get_router().node_for(branch)
+        groups = {node: groups[node]} if node in groups else {}
+    return groups
+
+
+def _search_where(rolls: Optional[Sequence[int]], min_marks: Optional[float],
+                  max_marks: Optional[float]) -> Tuple[str, list]:
+    clauses, params = [], []
+    if rolls is not None:
+        clauses.append(f"roll_no IN ({', '.join(['%s'] * len(rolls))})")
+        params.extend(rolls)
+    if min_marks is not None:
+        clauses.append("marks >= %s")
+        params.append(min_marks)
+    if max_marks is not None:
+        clauses.append("marks <= %s")
+        params.append(max_marks)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+@instrument("db")
 def search_students(keyword: Optional[str] = None,
                     min_marks: Optional[float] = None,
                     max_marks: Optional[float] = None,
                     branch: Optional[str] = None) -> List[Tuple]:
-    """Call stored procedure search_students() in MySQL."""
-    conn = get_connection()
-    results = []
-    if not conn:
-        return results
+    """
+    Name search through the trigram index: only the candidate rows are read, each from
+    the shard that owns it, instead of LIKE '%kw%' scans on every fragment.
+    """
     try:
-        cur = conn.cursor()
-        cur.callproc("search_students", (keyword, min_marks, max_marks, branch))
-        for result in cur.stored_results():
-            results.extend(result.fetchall())
+        if keyword:
+            queries = {}
+            for node, rolls in _name_candidates(keyword, branch).items():
+                where, params = _search_where(rolls, min_marks, max_marks)
+                queries[node] = (f"SELECT {STUDENT_COLUMNS} FROM students{where}", params)
+            gathered = scatter_each(queries)
+        else:
+            where, params = _search_where(None, min_marks, max_marks)
+            gathered = scatter_gather(f"SELECT {STUDENT_COLUMNS} FROM students{where}", params,
+                                      _target_nodes(branch))
+        return _partial_rows(gathered, "search_students")
     except Error as e:
         print(f"⚠ Error in search_students: {e}")
-    finally:
-        conn.close()
-    return results
+        return []
+
+
+@instrument("db")
+def fuzzy_search_students(query: str, threshold: float = 0.3, limit: int = 50) -> List[Tuple]:
+    """Closest names by trigram similarity (typo tolerant), best match first."""
+    index = get_name_index()
+    try:
+        if not index.loaded:
+            index.load()
+        scores = dict(index.fuzzy(query, threshold, limit))
+        queries = {}
+        for node, rolls in index.by_branch(scores).items():
+            where, params = _search_where(rolls, None, None)
+            queries[node] = (f"SELECT {STUDENT_COLUMNS} FROM students{where}", params)
+        rows = _partial_rows(scatter_each(queries), "fuzzy_search_students")
+    except Error as e:
+        print(f"⚠ Error in fuzzy_search_students: {e}")
+        return []
+    return ShardRows(sorted(rows, key=lambda r: (-scores.get(r[0], 0.0), r[0])), rows.missing)
+
+
+@instrument("db")
+def fetch_sorted_students(order_by: str = "marks", descending: bool = False,
+                          limit: Optional[int] = None) -> List[Tuple]:
+    """
+    Students in global order. ORDER BY (and LIMIT) run on every fragment and the
+    coordinator k-way merges the sorted shard streams.
+    """
+    missing: Dict[str, str] = {}
+    try:
+        rows = list(iter_sorted_students(order_by, descending, limit, missing=missing))
+    except (Error, ValueError) as e:
+        print(f"⚠ Error in fetch_sorted_students: {e}")
+        return []
+    for node, reason in missing.items():
+        print(f"⚠ Error in fetch_sorted_students ({node}): {reason}")
+    return ShardRows(rows, missing)
+
+
+@instrument("db")
+def fetch_top_students(k: int = 50, order_by: str = "marks") -> List[Tuple]:
+    """Top-k students across all branches; each fragment sends at most k rows."""
+    return fetch_sorted_students(order_by, descending=True, limit=k)
+
+# ------------------ STREAMING READS ------------------
+
+# A shard that fails or misses its deadline is skipped; pass a `missing` dict to learn
+# which ones (shard -> reason) once the stream is exhausted.
+
+def _iter_nodes(nodes: Sequence[str], where: str, params: Sequence,
+                chunk_size: int, missing: Optional[Dict[str, str]] = None) -> Iterator[List[Tuple]]:
+    sql = f"SELECT {STUDENT_COLUMNS} FROM students{where}"
+    for node in nodes:
+        try:
+            yield from stream_shard(node, sql, params, chunk_size)
+        except Error as e:
+            print(f"⚠ Error streaming students from {node}: {e}")
+            if missing is not None:
+                missing[node] = str(e)
+
+
+def _target_nodes(branch: Optional[str]) -> List[str]:
+    if branch in (None, "", "All"):
+        return list_branches()
+    return [get_router().node_for(branch)]
+
+
+@instrument("db")
+def iter_students(chunk_size: int = DEFAULT_CHUNK_SIZE,
+                  missing: Optional[Dict[str, str]] = None) -> Iterator[List[Tuple]]:
+    """
+    Yield every student in chunks of at most `chunk_size` rows, one fragment at a time,
+    so memory stays bounded by the chunk size instead of the table size.
+    """
+    yield from _iter_nodes(list_branches(), "", (), chunk_size, missing)
+
+
+@instrument("db")
+def iter_filter_students(branch=None, roll_from=None, roll_to=None, marks_min=None, marks_max=None,
+                         attendance_min=None, attendance_max=None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         missing: Optional[Dict[str, str]] = None) -> Iterator[List[Tuple]]:
+    """Streaming variant of filter_students(); yields chunks of matching rows."""
+    try:
+        plan = plan_filter(branch, roll_from, roll_to, marks_min, marks_max, attendance_min, attendance_max)
+    except ValueError as e:
+        print(f"⚠ Error in iter_filter_students: {e}")
+        return
+    yield from _iter_nodes(plan.nodes, plan.where, plan.params, chunk_size, missing)
+
+
+@instrument("db")
+def iter_search_students(keyword: Optional[str] = None,
+                         min_marks: Optional[float] = None,
+                         max_marks: Optional[float] = None,
+                         branch: Optional[str] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE,
+                         missing: Optional[Dict[str, str]] = None) -> Iterator[List[Tuple]]:
+    """Streaming variant of search_students(); yields chunks of matching rows."""
+    try:
+        if keyword:
+            targets = _name_candidates(keyword, branch)
+        else:
+            targets = {node: None for node in _target_nodes(branch)}
+    except Error as e:
+        print(f"⚠ Error in iter_search_students: {e}")
+        return
+    for node, rolls in targets.items():
+        where, params = _search_where(rolls, min_marks, max_marks)
+        yield from _iter_nodes([node], where, params, chunk_size, missing)
 
 
+@instrument("db")
 def setup_databases():
-    """Not needed anymore (schema handled by SQL setup)."""
-    print("ℹ️ Setup handled directly in MySQL (distributed_backend.sql).")
+    """Prepare the storage backend selected by "backend" in meta_config.json."""
+    storage = get_storage()
+    storage.prepare()
+    print(f"ℹ️ Storage backend: {storage.describe()}")
@@ -0,0 +1,82 @@
+# backend/distributed_sort.py
+
+import heapq
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from mysql.connector import Error
+
+from backend.connection_pool import node_configs
+from backend.scatter_gather import stream_shard
+
+STUDENT_COLUMNS = "roll_no, name, branch, marks, attendance"
+
+# Sortable keys: SQL expression pushed to each fragment + the same key in Python
+# for the coordinator's merge. roll_no breaks ties so the order is deterministic.
+# Both sides must agree on the order: names are compared as bytes on the fragments
+# (code point order for UTF-8, whatever the column charset), not with the default
+# case/accent-insensitive collation.
+SORT_KEYS: Dict[str, Tuple[str, Callable[[Tuple], object]]] = {
+    "roll_no": ("roll_no", lambda r: r[0]),
+    "name": ("CAST(name AS BINARY)", lambda r: r[1]),
+    "marks": ("marks", lambda r: r[3]),
+    "attendance": ("attendance", lambda r: r[4]),
+    "total": ("marks + attendance", lambda r: r[3] + r[4]),
+}
+
+
+def sorted_shard_sql(order_by: str, descending: bool, limit: Optional[int]) -> Tuple[str, tuple]:
+    """The per-fragment query: ORDER BY (and LIMIT k) run on the fragment node itself."""
+    if order_by not in SORT_KEYS:
+        raise ValueError(f"Cannot sort by {order_by!r}; choose from {', '.join(SORT_KEYS)}")
+    direction = "DESC" if descending else "ASC"
+    sql = (f"SELECT {STUDENT_COLUMNS} FROM students "
+           f"ORDER BY {SORT_KEYS[order_by][0]} {direction}, roll_no {direction}")
+    if limit is not None:
+        return sql + " LIMIT %s", (int(limit),)
+    return sql, ()
+
+
+def _rows(node: str, sql: str, params: tuple, chunk_size: int,
+          missing: Optional[Dict[str, str]]) -> Iterator[Tuple]:
+    try:
+        for chunk in stream_shard(node, sql, params, chunk_size):
+            yield from chunk
+    except Error as e:
+        if missing is None:
+            raise
+        missing[node] = str(e)          # merge the shards that did answer
+
+
+def iter_sorted_students(order_by: str = "marks", descending: bool = False,
+                         limit: Optional[int] = None, nodes: Optional[Sequence[str]] = None,
+                         chunk_size: int = 500,
+                         missing: Optional[Dict[str, str]] = None) -> Iterator[Tuple]:
+    """
+    Globally ordered stream of students. Every fragment sorts (and, with `limit`,
+    truncates to k rows) locally; the coordinator k-way merges the per-shard cursors
+    with a heap, holding one pending row per shard. Top-k therefore moves at most
+    shards × k rows over the wire.
+
+    With a `missing` dict, a shard that fails or times out is recorded there (shard ->
+    reason) and the merge continues with the others instead of raising.
+    """
+    sql, params = sorted_shard_sql(order_by, descending, limit)
+    if limit is not None and limit <= 0:
+        return                          # LIMIT 0: nothing to read (and fetchmany(0) would misbehave)
+    key_fn = SORT_KEYS[order_by][1]
+    nodes = [n.upper() for n in nodes] if nodes is not None else list(node_configs())
+    streams = [_rows(node, sql, params, chunk_size if limit is None else min(chunk_size, limit), missing)
+               for node in nodes]
+    merged = heapq.merge(*streams, key=lambda r: (key_fn(r), r[0]), reverse=descending)
+    try:
+        yield from (merged if limit is None else islice(merged, limit))
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def top_students(k: int = 50, order_by: str = "marks", descending: bool = True,
+                 nodes: Optional[Sequence[str]] = None) -> List[Tuple]:
+    """Top-k across all fragments, e.g. top_students(50) = 50 best marks overall."""
+    return list(iter_sorted_students(order_by, descending, limit=k, nodes=nodes))
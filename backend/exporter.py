@@ -0,0 +1,315 @@
+# backend/exporter.py
+
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from backend.connection_pool import node_configs
+from backend.query_planner import plan_filter
+from backend.scatter_gather import scatter_gather, stream_shard
+
+FIELDS = ("roll_no", "name", "branch", "marks", "attendance")
+STUDENT_COLUMNS = ", ".join(FIELDS)
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+DEFAULT_CHUNK_SIZE = 5000
+QUEUE_CHUNKS = 8                # chunks buffered between the shard readers and the writer
+POLL_SECONDS = 0.5              # how often the writer checks on readers while the queue is empty
+ROW_GROUP_ROWS = 100_000        # Parquet rows per row group
+
+ProgressCallback = Callable[[int, int], None]   # (rows written, estimated total rows)
+
+# ---------------------------
+# Result container
+# ---------------------------
+@dataclass
+class ExportResult:
+    path: str
+    format: str
+    rows: int = 0
+    per_node: Dict[str, int] = field(default_factory=dict)      # fragment node -> rows written
+    missing: Dict[str, str] = field(default_factory=dict)     # shard -> reason it is not in the file
+    elapsed: float = 0.0
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.missing)
+
+    def summary(self) -> str:
+        text = f"Exported {self.rows} row(s) to {os.path.basename(self.path)} in {self.elapsed:.1f} s"
+        if self.per_node:
+            text += " (" + ", ".join(f"{node}: {n}" for node, n in self.per_node.items()) + ")"
+        for node, reason in self.missing.items():
+            text += f"\n⚠ {node} not exported: {reason}"
+        return text
+
+# ---------------------------
+# Writers
+# ---------------------------
+def _record(row: Sequence) -> Tuple:
+    """Plain Python values (DECIMAL columns arrive as Decimal on MySQL)."""
+    roll_no, name, branch, marks, attendance = row
+    return int(roll_no), str(name), str(branch), float(marks), float(attendance)
+
+
+class CsvWriter:
+    def __init__(self, path: str):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(FIELDS)        # the header import_students_csv() recognises
+
+    def write(self, rows: List[Tuple]):
+        self.writer.writerows(_record(r) for r in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class JsonLinesWriter:
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8")
+
+    def write(self, rows: List[Tuple]):
+        self.file.writelines(json.dumps(dict(zip(FIELDS, _record(r))), ensure_ascii=False) + "\n"
+                             for r in rows)
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Buffers up to ROW_GROUP_ROWS rows per row group, so memory stays bounded by that."""
+
+    def __init__(self, path: str):
+        pa, pq = _pyarrow()
+        self.pa = pa
+        self.schema = pa.schema([("roll_no", pa.int64()), ("name", pa.string()), ("branch", pa.string()),
+                                 ("marks", pa.float64()), ("attendance", pa.float64())])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.pending: List[Tuple] = []
+
+    def write(self, rows: List[Tuple]):
+        self.pending.extend(_record(r) for r in rows)
+        if len(self.pending) >= ROW_GROUP_ROWS:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            columns = list(zip(*self.pending))
+            self.writer.write_table(self.pa.Table.from_arrays(
+                [self.pa.array(col, type=f.type) for col, f in zip(columns, self.schema)],
+                schema=self.schema))
+            self.pending = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvWriter, "jsonl": JsonLinesWriter, "parquet": ParquetWriter}
+
+
+def _pyarrow():
+    """pyarrow is optional: only Parquet export needs it."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as e:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from e
+    return pyarrow, pyarrow.parquet
+
+
+def export_format(path: str, fmt: Optional[str] = None) -> str:
+    """'csv', 'jsonl' or 'parquet', from `fmt` or else the file extension."""
+    if fmt is None:
+        fmt = FORMATS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise ValueError(f"Cannot tell the export format of {path!r}; use .csv, .jsonl or .parquet")
+    fmt = fmt.lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r}; choose from {', '.join(WRITERS)}")
+    return fmt
+
+# ---------------------------
+# Export
+# ---------------------------
+_DONE = object()
+_export_executor: Optional[ThreadPoolExecutor] = None
+_export_lock = threading.Lock()
+
+
+def get_export_executor() -> ThreadPoolExecutor:
+    """
+    Shard readers for exports, two per fragment node. Kept apart from the shared
+    executors because a reader holds its worker for the whole shard, however long.
+    """
+    global _export_executor
+    with _export_lock:
+        if _export_executor is None:
+            _export_executor = ThreadPoolExecutor(max_workers=max(4, 2 * len(node_configs())),
+                                                  thread_name_prefix="export")
+        return _export_executor
+
+
+def _put(out: "queue.Queue", item: Tuple, stop: threading.Event) -> bool:
+    """Put unless the export is stopped (nobody drains the queue after that)."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _read_shard(node: str, sql: str, params: Sequence, chunk_size: int,
+                out: "queue.Queue", stop: threading.Event):
+    """Producer: stream one shard into the bounded queue; always ends with (node, _DONE, error)."""
+    error = None
+    try:
+        # No shard_deadline: a multi-million-row shard legitimately streams for a while.
+        chunks = stream_shard(node, sql, params, chunk_size, deadline=0)
+        try:
+            for chunk in chunks:
+                if not _put(out, (node, chunk, None), stop):
+                    return
+        finally:
+            chunks.close()
+    except Exception as e:              # Error, PoolTimeout, ShardTimeout, socket errors…
+        error = e
+    finally:
+        _put(out, (node, _DONE, error), stop)
+
+
+def _shard_chunks(node: str, sql: str, params: Sequence, chunk_size: int,
+                  missing: Dict[str, str]) -> Iterator[List[Tuple]]:
+    """Sequential reader: one shard's chunks; it fails like _read_shard, into `missing`."""
+    try:
+        yield from stream_shard(node, sql, params, chunk_size, deadline=0)
+    except Exception as e:              # only read errors: the writer's own are raised in the caller
+        missing[node] = str(e)
+
+
+def _lost_readers(readers: Dict, finished: set, out: "queue.Queue") -> Dict[str, str]:
+    """
+    Shards whose reader ended without sending _DONE (cancelled before it ran, or
+    killed), so the writer does not wait for them forever. A reader puts _DONE
+    before its future completes, so a done future with an empty queue means it
+    never will.
+    """
+    ended = {node: f for f, node in readers.items() if node not in finished and f.done()}
+    if not ended or not out.empty():
+        return {}
+    return {node: "export reader cancelled" if f.cancelled()
+            else str(f.exception() or "export reader stopped before the end of the shard")
+            for node, f in ended.items()}
+
+
+def export_students(path: str, fmt: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    parallel: bool = True, progress: Optional[ProgressCallback] = None,
+                    **predicates) -> ExportResult:
+    """
+    Stream students to a CSV, JSON Lines or Parquet file (format from `fmt` or the
+    extension). `predicates` are those of filter_students() (branch, roll_from,
+    marks_min, …) and prune shards the same way.
+
+    Every shard is read with an unbuffered cursor on its own export worker and its
+    chunks go through a queue of QUEUE_CHUNKS to a single writer, so memory is bounded
+    by (QUEUE_CHUNKS + shards) × chunk_size rows (plus one row group for Parquet)
+    whatever the table size. Shards are interleaved chunk by chunk; rows keep their
+    order within a shard. A shard that fails is left out and reported in `missing`.
+    The file is written under a temporary name and only renamed to `path` once complete.
+    """
+    fmt = export_format(path, fmt)
+    if fmt == "parquet":
+        _pyarrow()                      # fail before any shard is read
+    plan = plan_filter(**predicates)
+    result = ExportResult(path, fmt)
+    start = time.perf_counter()
+    total = 0
+    if progress and plan.nodes:
+        counts = scatter_gather(f"SELECT COUNT(*) FROM students{plan.where}", plan.params, plan.nodes)
+        total = sum(int(shard.rows[0][0]) for shard in counts.shards.values() if shard.rows)
+        progress(0, total)
+
+    sql = f"SELECT {STUDENT_COLUMNS} FROM students{plan.where}"
+    out: "queue.Queue" = queue.Queue(maxsize=QUEUE_CHUNKS)
+    stop = threading.Event()
+    partial_path = path + ".part"
+    writer = WRITERS[fmt](partial_path)
+    readers = {}
+
+    def write(node, chunk):
+        writer.write(chunk)
+        result.rows += len(chunk)
+        result.per_node[node] = result.per_node.get(node, 0) + len(chunk)
+        if progress:
+            progress(result.rows, max(total, result.rows))
+
+    try:
+        if parallel:
+            executor = get_export_executor()
+            readers = {executor.submit(_read_shard, node, sql, plan.params, chunk_size, out, stop): node
+                       for node in plan.nodes}
+            finished = set()
+            while len(finished) < len(readers):
+                try:
+                    node, chunk, error = out.get(timeout=POLL_SECONDS)
+                except queue.Empty:
+                    for node, reason in _lost_readers(readers, finished, out).items():
+                        finished.add(node)
+                        result.missing[node] = reason
+                    continue
+                if chunk is _DONE:
+                    finished.add(node)
+                    if error is not None:
+                        result.missing[node] = str(error)
+                    continue
+                write(node, chunk)
+        else:
+            for node in plan.nodes:
+                for chunk in _shard_chunks(node, sql, plan.params, chunk_size, result.missing):
+                    write(node, chunk)
+        writer.close()
+        os.replace(partial_path, path)
+    except BaseException:
+        stop.set()                      # producers blocked on the full queue give up
+        for f in readers:
+            f.cancel()
+        try:
+            writer.close()
+        except Exception:
+            pass
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    for node, reason in result.missing.items():
+        print(f"⚠ Export skipped {node}: {reason}")
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    # python -m backend.exporter students.parquet --branch CSE --marks-min 60
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export students to CSV, JSON Lines or Parquet.")
+    parser.add_argument("path", help="output file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--format", choices=sorted(WRITERS), help="override the format implied by the extension")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--sequential", action="store_true", help="read one shard at a time")
+    parser.add_argument("--branch")
+    for arg in ("roll_from", "roll_to"):
+        parser.add_argument("--" + arg.replace("_", "-"), dest=arg, type=int)
+    for arg in ("marks_min", "marks_max", "attendance_min", "attendance_max"):
+        parser.add_argument("--" + arg.replace("_", "-"), dest=arg, type=float)
+    args = parser.parse_args()
+
+    filters = {k: getattr(args, k) for k in ("branch", "roll_from", "roll_to", "marks_min", "marks_max",
+                                             "attendance_min", "attendance_max")}
+    print(export_students(args.path, args.format, args.chunk_size, not args.sequential, **filters).summary())
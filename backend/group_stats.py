@@ -0,0 +1,42 @@
+# backend/group_stats.py
+#
+# Per-branch statistics shared by aggregation pushdown and the summary store.
+# Pure Python so that importing it does not pull in numpy.
+
+import math
+from typing import Dict
+
+DEBAR_THRESHOLD = 75.0
+
+# ---------------------------
+# Combining per-chunk statistics
+# ---------------------------
+def finish_stats(s: Dict[str, float]) -> Dict[str, float]:
+    """Derive the means (and standard deviations) from the running sums."""
+    n = s["count"]
+    s["mean_marks"] = s["marks_sum"] / n
+    s["mean_attendance"] = s["attendance_sum"] / n
+    if "marks_sumsq" in s:
+        s["std_marks"] = math.sqrt(max(s["marks_sumsq"] / n - s["mean_marks"] ** 2, 0.0))
+    if "attendance_sumsq" in s:
+        s["std_attendance"] = math.sqrt(max(s["attendance_sumsq"] / n - s["mean_attendance"] ** 2, 0.0))
+    return s
+
+
+SUM_FIELDS = ("count", "marks_sum", "marks_sumsq", "attendance_sum", "attendance_sumsq", "debarred")
+
+
+def merge_group_stats(total: Dict[str, Dict[str, float]], part: Dict[str, Dict[str, float]]):
+    """Fold one group_stats() result into `total` in place (e.g. one streamed chunk at a time)."""
+    for b, s in part.items():
+        acc = total.get(b)
+        if acc is None:
+            total[b] = dict(s)
+            continue
+        for k in SUM_FIELDS:
+            if k in acc:
+                acc[k] += s.get(k, 0)
+        acc["max_marks"] = max(acc["max_marks"], s["max_marks"])
+        acc["min_marks"] = min(acc["min_marks"], s["min_marks"])
+        finish_stats(acc)
+    return total
@@ -0,0 +1,329 @@
+# backend/metrics.py
+
+import functools
+import inspect
+import json
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Upper bounds in seconds (Prometheus-style cumulative buckets; +Inf is implicit).
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PREFIX = "student_dashboard_"
+BYTES_SAMPLE = 64           # rows sampled to estimate the size of a result
+
+HELP = {
+    "call_seconds": "Latency of db_handler functions (layer=db) and dashboard handlers (layer=ui)",
+    "call_errors_total": "Calls that raised",
+    "call_rows_total": "Rows returned by calls",
+    "shard_seconds": "Per-shard query time, by shard and serving node",
+    "shard_rows_total": "Rows read from each shard",
+    "shard_bytes_total": "Estimated bytes transferred from each shard",
+    "shard_errors_total": "Failed shard reads",
+    "shard_timeouts_total": "Shard reads left out of a result at their deadline",
+    "hedged_reads_total": "Straggling shard reads re-issued to another node, by the node hedged to",
+    "pool_checkout_seconds": "Time to check a connection out of a node's pool",
+    "connect_seconds": "Time to open a new node connection",
+    "job_seconds": "Background job time, from submit to result",
+    "render_seconds": "Tk rendering: Treeview insert batches, virtual windows, charts",
+    "render_rows_total": "Rows painted into the Treeview",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def estimate_bytes(rows: Sequence[Sequence]) -> int:
+    """Approximate payload of a result set from a sample of its rows (text length, 8 bytes per number)."""
+    if not rows:
+        return 0
+    sample = rows[:BYTES_SAMPLE]
+    size = 0
+    for row in sample:
+        for value in row:
+            size += len(value) if isinstance(value, (str, bytes)) else 8
+    return size * len(rows) // len(sample)
+
+
+def _count_rows(result) -> Optional[int]:
+    rows = getattr(result, "rows", result)        # GatherResult carries .rows
+    if isinstance(rows, list):
+        return len(rows)
+    return None
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)       # last slot: above the largest bound
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = self.buckets[i - 1] if i else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+    def summary(self) -> dict:
+        return {"count": self.count, "sum": round(self.sum, 6), "max": round(self.max, 6),
+                "p50": round(self.quantile(0.5), 6), "p95": round(self.quantile(0.95), 6),
+                "p99": round(self.quantile(0.99), 6)}
+
+
+class Metrics:
+    """
+    Process-wide latency histograms and counters, keyed by metric name and labels.
+
+    Recording is a dict lookup and a few additions under one lock, cheap enough for
+    every shard read and Treeview batch. Gauges that already live elsewhere (pool
+    status, read-router EWMA latency, replication lag) are collected at export time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.started = time.time()
+
+    # ---------------------------
+    # Recording
+    # ---------------------------
+    @staticmethod
+    def _key(labels: Dict[str, object]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def observe(self, name: str, seconds: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            family = self._histograms.setdefault(name, {})
+            hist = family.get(key)
+            if hist is None:
+                hist = family[key] = Histogram()
+            hist.observe(seconds)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            family = self._counters.setdefault(name, {})
+            family[key] = family.get(key, 0) + amount
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """`with get_metrics().timer("render_seconds", what="chart"):`"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def record_call(self, layer: str, fn: str, seconds: float, rows: Optional[int] = None, error: bool = False):
+        self.observe("call_seconds", seconds, layer=layer, fn=fn)
+        if error:
+            self.inc("call_errors_total", layer=layer, fn=fn)
+        if rows is not None:
+            self.inc("call_rows_total", rows, layer=layer, fn=fn)
+
+    def record_shard(self, shard: str, node: Optional[str], seconds: float,
+                     rows: Sequence[Sequence] = (), error: bool = False):
+        node = node or shard
+        self.observe("shard_seconds", seconds, shard=shard, node=node)
+        if error:
+            self.inc("shard_errors_total", shard=shard, node=node)
+        elif rows:
+            self.inc("shard_rows_total", len(rows), shard=shard, node=node)
+            self.inc("shard_bytes_total", estimate_bytes(rows), shard=shard, node=node)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    # ---------------------------
+    # Export
+    # ---------------------------
+    def snapshot(self) -> dict:
+        """Plain-data copy: {"histograms": {name: [{labels, count, sum, p50, …}]}, "counters": …, "gauges": …}."""
+        with self._lock:
+            histograms = {name: [{"labels": dict(key), **hist.summary()} for key, hist in family.items()]
+                          for name, family in self._histograms.items()}
+            counters = {name: [{"labels": dict(key), "value": value} for key, value in family.items()]
+                        for name, family in self._counters.items()}
+        gauges: Dict[str, list] = {}
+        for name, labels, value in collect_gauges():
+            gauges.setdefault(name, []).append({"labels": labels, "value": value})
+        return {"started": self.started, "exported": time.time(), "histograms": histograms,
+                "counters": counters, "gauges": gauges}
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+
+        def header(name: str, kind: str, text: str):
+            lines.append(f"# HELP {PREFIX}{name} {text}")
+            lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+        with self._lock:
+            for name, family in sorted(self._histograms.items()):
+                header(name, "histogram", HELP.get(name, name))
+                for key, hist in family.items():
+                    cumulative = 0
+                    for bound, n in zip(hist.buckets + (float("inf"),), hist.counts):
+                        cumulative += n
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        lines.append(f"{PREFIX}{name}_bucket{_labels(key + (('le', le),))} {cumulative}")
+                    lines.append(f"{PREFIX}{name}_sum{_labels(key)} {hist.sum!r}")
+                    lines.append(f"{PREFIX}{name}_count{_labels(key)} {hist.count}")
+            for name, family in sorted(self._counters.items()):
+                header(name, "counter", HELP.get(name, name))
+                for key, value in family.items():
+                    lines.append(f"{PREFIX}{name}{_labels(key)} {value!r}")
+
+        gauges: Dict[str, List[str]] = {}      # a family's samples must be contiguous
+        for name, labels, value in collect_gauges():
+            gauges.setdefault(name, []).append(f"{PREFIX}{name}{_labels(Metrics._key(labels))} {float(value)!r}")
+        for name, samples in gauges.items():
+            header(name, "gauge", GAUGE_HELP.get(name, name))
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+    def export(self, path: str):
+        """Write a snapshot to `path`: Prometheus text for .prom/.txt, JSON otherwise."""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in key) + "}"
+
+# ---------------------------
+# Gauges owned by other modules
+# ---------------------------
+GAUGE_HELP = {
+    "pool_open_connections": "Open connections per node pool",
+    "pool_idle_connections": "Idle connections per node pool",
+    "read_router_ewma_seconds": "Read router EWMA latency per node",
+    "read_router_reads_total": "Reads routed to each node",
+    "replication_lag_seconds": "Age of the oldest change not yet applied, per replication link",
+    "replication_pending_changes": "change_log rows not yet applied, per replication link",
+}
+
+
+def collect_gauges() -> Iterable[Tuple[str, Dict[str, str], float]]:
+    """(name, labels, value) for state kept by the pools, the read router and replication."""
+    # Only report modules that are already in use; never import (or start) them from here.
+    pool = sys.modules.get("backend.connection_pool")
+    if pool is not None:
+        for node, status in pool.pool_status().items():
+            yield "pool_open_connections", {"node": node}, status["open"]
+            yield "pool_idle_connections", {"node": node}, status["idle"]
+    router = sys.modules.get("backend.read_router")
+    if router is not None and router._router is not None:
+        for node, stats in router._router.stats().items():
+            yield "read_router_ewma_seconds", {"node": node}, stats["ewma_ms"] / 1000
+            yield "read_router_reads_total", {"node": node}, stats["reads"]
+    replication = sys.modules.get("backend.replication")
+    manager = replication.get_replication_manager() if replication is not None else None
+    if manager is not None:
+        for link in manager.status():
+            labels = {"source": link.source, "target": link.target}
+            yield "replication_lag_seconds", labels, link.lag_seconds
+            yield "replication_pending_changes", labels, link.pending
+
+# ---------------------------
+# Decorator
+# ---------------------------
+def instrument(layer: str, name: Optional[str] = None) -> Callable:
+    """
+    Record latency, errors and rows returned for every call of the decorated function
+    under call_seconds{layer, fn}. Generators are timed from the first to the last
+    item, counting the rows of each yielded chunk.
+    """
+    def decorate(fn: Callable) -> Callable:
+        fn_name = name or fn.__name__
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def gen_wrapper(*args, **kwargs):
+                start, rows, failed = time.perf_counter(), 0, False
+                try:
+                    for chunk in fn(*args, **kwargs):
+                        rows += _count_rows(chunk) or 0
+                        yield chunk
+                except GeneratorExit:       # consumer stopped early (e.g. a superseded load)
+                    raise
+                except BaseException:
+                    failed = True
+                    raise
+                finally:
+                    get_metrics().record_call(layer, fn_name, time.perf_counter() - start, rows, failed)
+            return gen_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                get_metrics().record_call(layer, fn_name, time.perf_counter() - start, error=True)
+                raise
+            get_metrics().record_call(layer, fn_name, time.perf_counter() - start, _count_rows(result))
+            return result
+        return wrapper
+    return decorate
+
+
+def stopwatch(layer: str, name: str) -> Callable[..., None]:
+    """
+    For work that completes in a callback rather than on return (a click whose job
+    runs in the background): start timing now and record call_seconds{layer, fn}
+    when the returned done(rows=None, error=False) is first called.
+    """
+    start, stopped = time.perf_counter(), threading.Event()
+
+    def done(rows: Optional[int] = None, error: bool = False):
+        if not stopped.is_set():
+            stopped.set()
+            get_metrics().record_call(layer, name, time.perf_counter() - start, rows, error)
+    return done
+
+
+_metrics: Optional[Metrics] = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    global _metrics
+    if _metrics is not None:
+        return _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = Metrics()
+        return _metrics
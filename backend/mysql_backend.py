@@ -0,0 +1,29 @@
+# backend/mysql_backend.py
+
+from typing import Dict, Optional
+
+import mysql.connector
+
+from backend.storage import StorageBackend
+
+
+class MySQLBackend(StorageBackend):
+    """
+    One MySQL server with a database per fragment plus the db_catalog coordinator.
+    The schema, view and stored procedures come from the scripts in database/.
+    """
+    name = "mysql"
+
+    def connect(self, **config):
+        try:
+            return mysql.connector.connect(**config)
+        except AttributeError:
+            if "read_timeout" not in config:
+                raise
+            # Connector releases without read_timeout: connection_timeout also bounds socket reads.
+            config["connection_timeout"] = config.pop("read_timeout")
+            return mysql.connector.connect(**config)
+
+    def prepare(self, nodes: Optional[Dict[str, dict]] = None):
+        # Created once by database/initial_setup.sql, distributed_backend.sql and replication.sql.
+        pass
@@ -0,0 +1,151 @@
+# backend/name_index.py
+
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from backend.scatter_gather import scatter_gather
+from backend.write_events import WriteEvent, add_write_listener
+
+NAMES_SQL = "SELECT roll_no, name, branch FROM students"
+
+
+def normalize(text: str) -> str:
+    return " ".join(str(text).lower().split())
+
+
+def trigrams(text: str, pad: bool = True) -> Set[str]:
+    """
+    Trigrams of normalized text. Names are indexed padded ("  ann " -> "  a", " an",
+    "ann", "nn "), so a word's start and end carry weight in fuzzy matching; substring
+    queries use their unpadded trigrams, which every containing name also has.
+    """
+    text = normalize(text)
+    if pad:
+        text = f"  {text} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """
+    Trigram inverted index over student names: trigram -> roll numbers.
+
+    Substring search intersects the posting sets of the query's trigrams and then
+    confirms each candidate against the stored name; fuzzy search ranks rolls by
+    trigram similarity (shared / union). Either way only candidate roll numbers (with
+    their owning branch) come out, so the caller fetches just those rows from the
+    owning shards instead of running LIKE '%kw%' scans everywhere.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[int]] = {}
+        self._names: Dict[int, Tuple[str, str]] = {}       # roll -> (normalized name, branch)
+        self._sizes: Dict[int, int] = {}                   # roll -> number of trigrams
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._names)
+
+    # ---------------------------
+    # Building / maintenance
+    # ---------------------------
+    def build(self, rows: Iterable[Tuple]):
+        """Index (roll_no, name, branch, ...) rows, replacing the current contents."""
+        with self._lock:
+            self._postings, self._names, self._sizes = {}, {}, {}
+            for row in rows:
+                self.add(row[0], row[1], row[2])
+            self.loaded = True
+
+    def load(self):
+        """Build from the fragments, keeping each row only from the node that owns its branch."""
+        gathered = scatter_gather(NAMES_SQL)
+        for node, e in gathered.errors.items():
+            print(f"⚠ Name index: {node} unavailable: {e}")
+        self.build(row for node, shard in gathered.shards.items()
+                   for row in shard.rows if str(row[2]).upper() == node)
+        # With a shard missing, serve this search but rebuild on the next one.
+        self.loaded = not gathered.errors
+
+    def add(self, roll_no: int, name: str, branch: str):
+        with self._lock:
+            self.remove(roll_no)
+            grams = trigrams(name)
+            self._names[roll_no] = (normalize(name), str(branch).upper())
+            self._sizes[roll_no] = len(grams)
+            for g in grams:
+                self._postings.setdefault(g, set()).add(roll_no)
+
+    def remove(self, roll_no: int):
+        with self._lock:
+            entry = self._names.pop(roll_no, None)
+            if entry is None:
+                return
+            self._sizes.pop(roll_no, None)
+            for g in trigrams(entry[0]):
+                rolls = self._postings.get(g)
+                if rolls is not None:
+                    rolls.discard(roll_no)
+                    if not rolls:
+                        del self._postings[g]
+
+    def apply(self, event: WriteEvent):
+        """Write listener: names only change on insert and delete."""
+        if not self.loaded:
+            return
+        if event.op == "delete":
+            self.remove(event.roll_no)
+        elif event.op == "insert" and event.after is not None:
+            self.add(event.roll_no, event.after[1], event.after[2])
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def branch_of(self, roll_no: int) -> Optional[str]:
+        entry = self._names.get(roll_no)
+        return entry[1] if entry else None
+
+    def substring(self, keyword: str) -> List[int]:
+        """Rolls whose name contains `keyword` (case-insensitive)."""
+        needle = normalize(keyword)
+        with self._lock:
+            if len(needle) < 3:
+                # Too short for a trigram; the names are in memory, so just scan them.
+                candidates = self._names.keys()
+            else:
+                postings = sorted((self._postings.get(g, set()) for g in trigrams(needle, pad=False)), key=len)
+                candidates = set.intersection(*postings) if postings else set()
+            return sorted(r for r in candidates if needle in self._names[r][0])
+
+    def fuzzy(self, query: str, threshold: float = 0.3, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(roll, similarity) pairs with trigram similarity >= threshold, best first."""
+        grams = trigrams(query)
+        with self._lock:
+            shared = Counter(r for g in grams for r in self._postings.get(g, ()))
+            scored = [(r, n / (len(grams) + self._sizes[r] - n)) for r, n in shared.items()]
+        scored = sorted((s for s in scored if s[1] >= threshold), key=lambda s: (-s[1], s[0]))
+        return scored[:limit] if limit is not None else scored
+
+    def by_branch(self, rolls: Iterable[int]) -> Dict[str, List[int]]:
+        """Group candidate rolls by the node that owns them."""
+        groups: Dict[str, List[int]] = {}
+        for r in rolls:
+            branch = self.branch_of(r)
+            if branch is not None:
+                groups.setdefault(branch, []).append(r)
+        return groups
+
+
+_name_index: Optional[NameIndex] = None
+_name_index_lock = threading.Lock()
+
+
+def get_name_index() -> NameIndex:
+    """Process-wide name index, subscribed to db_handler write events on first use."""
+    global _name_index
+    with _name_index_lock:
+        if _name_index is None:
+            _name_index = NameIndex()
+            add_write_listener(_name_index.apply)
+        return _name_index
@@ -0,0 +1,88 @@
+# backend/query_planner.py
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from backend.connection_pool import node_configs, roll_ranges
+from backend.scatter_gather import GatherResult, scatter_gather
+
+STUDENT_COLUMNS = "roll_no, name, branch, marks, attendance"
+
+# filter_students() argument -> (column, operator)
+RANGE_PREDICATES = (
+    ("roll_from", "roll_no", ">="), ("roll_to", "roll_no", "<="),
+    ("marks_min", "marks", ">="), ("marks_max", "marks", "<="),
+    ("attendance_min", "attendance", ">="), ("attendance_max", "attendance", "<="),
+)
+
+
+def _blank(value) -> bool:
+    return value is None or value == "" or value == "All"
+
+
+@dataclass
+class QueryPlan:
+    """A parameterized per-shard query plus the shards it goes to and why the others don't."""
+    sql: str
+    where: str = ""
+    params: List = field(default_factory=list)
+    nodes: List[str] = field(default_factory=list)
+    pruned: Dict[str, str] = field(default_factory=dict)        # node -> reason
+
+    def explain(self) -> str:
+        lines = [f"SQL    {self.sql}", f"PARAMS {tuple(self.params)}",
+                 f"SCAN   {', '.join(self.nodes) or '(none)'}"]
+        lines += [f"PRUNE  {node}: {reason}" for node, reason in self.pruned.items()]
+        return "\n".join(lines)
+
+    def execute(self) -> GatherResult:
+        if not self.nodes:
+            return GatherResult()
+        return scatter_gather(self.sql, self.params, self.nodes)
+
+
+def compile_predicates(**predicates) -> Tuple[str, List]:
+    """WHERE clause with %s placeholders for filter_students()-style range predicates."""
+    clauses, params = [], []
+    for arg, column, op in RANGE_PREDICATES:
+        value = predicates.get(arg)
+        if not _blank(value):
+            clauses.append(f"{column} {op} %s")
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def plan_filter(branch: Optional[str] = None, roll_from=None, roll_to=None, marks_min=None,
+                marks_max=None, attendance_min=None, attendance_max=None,
+                nodes: Optional[Sequence[str]] = None) -> QueryPlan:
+    """
+    Compile a filter into one parameterized query and prune the shards that cannot
+    match: other branches when a branch is given, and shards whose "roll_ranges"
+    block lies outside [roll_from, roll_to]. Shards without range metadata are kept.
+    """
+    where, params = compile_predicates(roll_from=roll_from, roll_to=roll_to, marks_min=marks_min,
+                                       marks_max=marks_max, attendance_min=attendance_min,
+                                       attendance_max=attendance_max)
+    plan = QueryPlan(f"SELECT {STUDENT_COLUMNS} FROM students{where}", where, params)
+    ranges = roll_ranges()
+    wanted = None if _blank(branch) else str(branch).strip().upper()
+    low = None if _blank(roll_from) else int(roll_from)
+    high = None if _blank(roll_to) else int(roll_to)
+
+    for node in ([n.upper() for n in nodes] if nodes is not None else list(node_configs())):
+        block = ranges.get(node)
+        if wanted is not None and node != wanted:
+            plan.pruned[node] = f"branch is {wanted}"
+        elif low is not None and high is not None and low > high:
+            plan.pruned[node] = f"empty roll range [{low}, {high}]"
+        elif block and ((low is not None and block[1] < low) or (high is not None and block[0] > high)):
+            plan.pruned[node] = (f"rolls {block[0]}-{block[1]} outside "
+                                 f"[{'-inf' if low is None else low}, {'inf' if high is None else high}]")
+        else:
+            plan.nodes.append(node)
+    return plan
+
+
+def explain(**predicates) -> str:
+    """Human-readable plan for a filter, e.g. explain(roll_from=150, roll_to=220)."""
+    return plan_filter(**predicates).explain()
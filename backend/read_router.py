@@ -0,0 +1,178 @@
+# backend/read_router.py
+
+import re
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from backend.connection_pool import load_meta_config
+from backend.replication import get_replication_manager, replication_settings
+
+READ_ROUTING_DEFAULTS = {
+    "enabled": True,
+    "max_staleness": 5.0,        # seconds a replica may lag behind its primary
+    "ewma_alpha": 0.3,           # weight of the newest latency sample
+    "error_cooldown": 30.0,      # seconds a node is skipped after a failed read
+    "shard_deadline": 10.0,      # seconds a shard read may take before it is left out (0: wait forever)
+    "hedge": True,               # re-issue reads slower than usual to another eligible node
+    "hedge_percentile": 0.95,    # ... once they run longer than this percentile of the node's latency
+    "hedge_min_delay": 0.02,     # never hedge sooner than this many seconds
+}
+LATENCY_WINDOW = 200             # recent read times kept per node for the hedge delay
+HEDGE_MIN_SAMPLES = 10           # below this, a node's latency distribution is unknown
+_SAFE_NAME = re.compile(r"^[A-Z0-9_]+$")
+
+
+def read_routing_settings() -> dict:
+    settings = dict(READ_ROUTING_DEFAULTS)
+    settings.update(load_meta_config().get("read_routing", {}))
+    return settings
+
+
+class ReadRouter:
+    """
+    Chooses the node that serves each shard read: the primary fragment or one of its
+    replicas (the "replication" section of meta_config.json).
+
+    Per-node latency is tracked as an EWMA of observed query times. A replica is
+    eligible only while replication is running, its link is healthy, and its estimated
+    staleness (last measured lag + time since that measurement) is within
+    `max_staleness`. Among the primary and eligible replicas the lowest EWMA wins; a
+    node that just failed is skipped for `error_cooldown` seconds.
+
+    The last LATENCY_WINDOW read times of each node also give the hedge delay: a read
+    still running past the node's `hedge_percentile` latency is a straggler, and a
+    copy is sent to another eligible node (see scatter_gather.scatter_each()).
+    """
+
+    def __init__(self, settings: Optional[dict] = None, replicas: Optional[Dict[str, List[str]]] = None):
+        self.settings = settings or read_routing_settings()
+        self.replicas = replicas if replicas is not None else replication_settings()["replicas"]
+        # Nodes whose `students` table also holds other branches' replicated rows.
+        self.replica_hosts = {r for targets in self.replicas.values() for r in targets}
+        self._lock = threading.Lock()
+        self._ewma: Dict[str, float] = {}
+        self._failed_at: Dict[str, float] = {}
+        self._samples: Dict[str, deque] = {}
+        self.decisions: Dict[Tuple[str, str], int] = {}     # (shard, node) -> reads routed
+        self.errors: Dict[str, int] = {}
+
+    # ---------------------------
+    # Health / staleness
+    # ---------------------------
+    def staleness(self, shard: str, replica: str) -> Optional[float]:
+        """Estimated seconds `replica` is behind `shard`'s primary; None if unknown."""
+        manager = get_replication_manager()
+        if manager is None:
+            return None
+        link = manager.links.get((shard, replica))
+        if link is None or link.last_error is not None:
+            return None
+        return link.lag_seconds + (time.time() - link.updated)
+
+    def _healthy(self, node: str) -> bool:
+        failed = self._failed_at.get(node)
+        return failed is None or time.time() - failed > self.settings["error_cooldown"]
+
+    def candidates(self, shard: str) -> List[str]:
+        shard = shard.upper()
+        nodes = [shard]
+        if self.settings["enabled"]:
+            for replica in self.replicas.get(shard, []):
+                lag = self.staleness(shard, replica)
+                if lag is not None and lag <= self.settings["max_staleness"] and self._healthy(replica):
+                    nodes.append(replica)
+        return nodes
+
+    # ---------------------------
+    # Routing
+    # ---------------------------
+    def choose(self, shard: str) -> str:
+        """Fastest eligible node for a read of `shard` (the primary when nothing else qualifies)."""
+        shard = shard.upper()
+        with self._lock:
+            nodes = self.candidates(shard)
+            if len(nodes) > 1 and not self._healthy(shard):
+                nodes = nodes[1:]
+            # Unmeasured nodes score 0 so every candidate gets sampled once.
+            node = min(nodes, key=lambda n: self._ewma.get(n, 0.0))
+            self.decisions[(shard, node)] = self.decisions.get((shard, node), 0) + 1
+            return node
+
+    def record(self, node: str, elapsed: float, ok: bool = True):
+        with self._lock:
+            if not ok:
+                self._failed_at[node] = time.time()
+                self.errors[node] = self.errors.get(node, 0) + 1
+                return
+            self._failed_at.pop(node, None)
+            self._samples.setdefault(node, deque(maxlen=LATENCY_WINDOW)).append(elapsed)
+            alpha = self.settings["ewma_alpha"]
+            prev = self._ewma.get(node)
+            self._ewma[node] = elapsed if prev is None else alpha * elapsed + (1 - alpha) * prev
+
+    # ---------------------------
+    # Hedged reads
+    # ---------------------------
+    def percentile(self, node: str, q: float) -> Optional[float]:
+        """q-quantile (0..1) of `node`'s recent read times; None until enough are known."""
+        with self._lock:
+            samples = sorted(self._samples.get(node, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def hedge_delay(self, node: str) -> Optional[float]:
+        """Seconds after which a read on `node` counts as a straggler; None: do not hedge."""
+        if not self.settings["hedge"]:
+            return None
+        latency = self.percentile(node, self.settings["hedge_percentile"])
+        if latency is None:
+            return None
+        return max(latency, self.settings["hedge_min_delay"])
+
+    def hedge_target(self, shard: str, tried: List[str]) -> Optional[str]:
+        """Fastest eligible node for `shard` not already tried, or None when there is none."""
+        shard = shard.upper()
+        with self._lock:
+            nodes = [n for n in self.candidates(shard) if n not in tried and self._healthy(n)]
+            if not nodes:
+                return None
+            node = min(nodes, key=lambda n: self._ewma.get(n, 0.0))
+            self.decisions[(shard, node)] = self.decisions.get((shard, node), 0) + 1
+            return node
+
+    def rewrite(self, sql: str, shard: str, node: str) -> str:
+        """
+        A node that hosts replicas stores other branches' rows next to its own, so a
+        read of `shard` there (on a replica, or the replica host's own primary read)
+        is restricted to the shard's rows: `FROM students` becomes a derived table of
+        the same name. Branch names come from meta_config.json.
+        """
+        if node == shard and node not in self.replica_hosts:
+            return sql
+        if not _SAFE_NAME.match(shard):
+            raise ValueError(f"Unsafe branch name for read routing: {shard!r}")
+        return sql.replace("FROM students",
+                           f"FROM (SELECT * FROM students WHERE UPPER(branch) = '{shard}') AS students", 1)
+
+    def stats(self) -> Dict[str, dict]:
+        """Per-node EWMA latency, routed read count and error count (for metrics)."""
+        with self._lock:
+            nodes = set(self._ewma) | set(self.errors) | {n for _, n in self.decisions}
+            return {n: {"ewma_ms": round(self._ewma.get(n, 0.0) * 1000, 3),
+                        "reads": sum(c for (_, node), c in self.decisions.items() if node == n),
+                        "errors": self.errors.get(n, 0)} for n in sorted(nodes)}
+
+
+_router: Optional[ReadRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_read_router() -> ReadRouter:
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ReadRouter()
+        return _router
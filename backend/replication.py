@@ -0,0 +1,307 @@
+# backend/replication.py
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from mysql.connector import Error
+
+from backend.connection_pool import get_pool, load_meta_config, node_configs
+
+REPLICATION_DEFAULTS = {
+    "replicas": {},               # source branch -> list of replica branches
+    "batch_size": 500,            # change_log rows shipped per transaction
+    "poll_interval": 0.5,         # seconds between polls once a link is caught up
+    "retention_hours": 24,        # applied change_log rows older than this are purged
+}
+PURGE_EVERY = 300.0               # seconds between change_log purges
+
+HEAD_SQL = ("SELECT MAX(seq), TIMESTAMPDIFF(MICROSECOND, MIN(changed_at), NOW(6)) / 1e6 "
+            "FROM change_log WHERE seq > %s")
+BATCH_SQL = ("SELECT seq, op, roll_no, name, branch, marks, attendance FROM change_log "
+             "WHERE seq > %s ORDER BY seq LIMIT %s")
+STATE_SQL = "SELECT last_seq FROM replication_state WHERE source = %s"
+SAVE_STATE_SQL = "REPLACE INTO replication_state (source, last_seq, applied_at) VALUES (%s, %s, NOW(6))"
+APPLY_UPSERT_SQL = ("REPLACE INTO students (roll_no, name, branch, marks, attendance) "
+                    "VALUES (%s, %s, %s, %s, %s)")
+APPLY_DELETE_SQL = "DELETE FROM students WHERE roll_no = %s"
+PURGE_SQL = ("DELETE FROM change_log WHERE seq <= %s "
+             "AND changed_at < NOW(6) - INTERVAL %s HOUR")
+
+
+def replication_settings() -> dict:
+    """The "replication" section of meta_config.json plus the "replication_enabled" switch."""
+    meta = load_meta_config()
+    settings = dict(REPLICATION_DEFAULTS)
+    settings.update(meta.get("replication", {}))
+    settings["enabled"] = bool(meta.get("replication_enabled", False))
+    settings["replicas"] = {src.upper(): [r.upper() for r in targets]
+                            for src, targets in settings["replicas"].items()}
+    return settings
+
+
+@dataclass
+class LinkStatus:
+    source: str
+    target: str
+    applied_seq: int = 0
+    head_seq: int = 0
+    lag_seconds: float = 0.0        # age of the oldest change not yet applied
+    shipped: int = 0                # changes applied since start
+    last_error: Optional[str] = None
+    updated: float = field(default_factory=time.time)
+
+    @property
+    def pending(self) -> int:
+        return max(self.head_seq - self.applied_seq, 0)
+
+
+class ReplicationManager:
+    """
+    Ships each fragment's change_log to its configured replicas on a background thread.
+
+    The write path stays one local transaction on the owning fragment (its trigger adds
+    the change_log row). For every source -> replica link the manager reads the next
+    batch after the replica's `replication_state.last_seq`, collapses it to the final
+    image per roll_no, and applies it with the new position in one replica transaction,
+    so a crash never applies a batch twice or skips one.
+    """
+
+    def __init__(self, settings: Optional[dict] = None):
+        self.settings = settings or replication_settings()
+        self.links: Dict[Tuple[str, str], LinkStatus] = {
+            (src, dst): LinkStatus(src, dst)
+            for src, targets in self.settings["replicas"].items() for dst in targets if dst != src
+        }
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    def start(self) -> "ReplicationManager":
+        if self._thread is None and self.links:
+            self._thread = threading.Thread(target=self._run, name="replication", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            busy = False
+            for link in list(self.links.values()):
+                try:
+                    busy |= self.ship(link) == self.settings["batch_size"]
+                    link.last_error = None
+                except Error as e:
+                    link.last_error = str(e)
+                    print(f"⚠ Replication {link.source} → {link.target}: {e}")
+            if time.time() - self._last_purge > PURGE_EVERY:
+                self.purge()
+            if not busy:
+                self._stop.wait(self.settings["poll_interval"])
+
+    # ---------------------------
+    # Shipping
+    # ---------------------------
+    def ship(self, link: LinkStatus) -> int:
+        """Apply the next batch for one link; returns the number of change_log rows shipped."""
+        with get_pool(link.target).connection() as target:
+            cur = target.cursor()
+            try:
+                cur.execute("SET @replicating = 1")     # keep the replica's own triggers quiet
+                target.start_transaction()
+                cur.execute(STATE_SQL, (link.source,))
+                row = cur.fetchall()
+                applied = int(row[0][0]) if row else 0
+
+                with get_pool(link.source).connection() as source:
+                    src = source.cursor()
+                    src.execute(HEAD_SQL, (applied,))
+                    head, lag = src.fetchall()[0]
+                    batch = []
+                    if head is not None:
+                        src.execute(BATCH_SQL, (applied, self.settings["batch_size"]))
+                        batch = src.fetchall()
+                    src.close()
+                    source.commit()     # end the read snapshot so the next poll sees new changes
+
+                with self._lock:
+                    link.applied_seq = applied
+                    link.head_seq = int(head) if head is not None else applied
+                    link.lag_seconds = float(lag or 0.0)
+                    link.updated = time.time()
+                if not batch:
+                    target.rollback()
+                    return 0
+
+                # Only the last change per roll matters within a batch.
+                final: Dict[int, tuple] = {}
+                for seq, op, roll, name, branch, marks, attendance in batch:
+                    final[roll] = (op, (roll, name, branch, marks, attendance))
+                upserts = [r for op, r in final.values() if op != "D"]
+                deletes = [(r[0],) for op, r in final.values() if op == "D"]
+                last_seq = int(batch[-1][0])
+
+                if upserts:
+                    cur.executemany(APPLY_UPSERT_SQL, upserts)
+                if deletes:
+                    cur.executemany(APPLY_DELETE_SQL, deletes)
+                cur.execute(SAVE_STATE_SQL, (link.source, last_seq))
+                target.commit()
+            finally:
+                # Pooled connection: never hand it back with logging switched off.
+                cur.execute("SET @replicating = NULL")
+                cur.close()
+
+        with self._lock:
+            link.applied_seq = last_seq
+            link.shipped += len(batch)
+            if link.head_seq <= last_seq:
+                link.lag_seconds = 0.0
+        return len(batch)
+
+    def purge(self):
+        """
+        Drop change_log rows past retention that every replica has applied. Fragments
+        without replicas are purged by age alone.
+        """
+        self._last_purge = time.time()
+        applied_by_source: Dict[str, int] = {}
+        for (src, _), link in self.links.items():
+            applied_by_source[src] = min(applied_by_source.get(src, link.applied_seq), link.applied_seq)
+        purge_change_log(self.settings["retention_hours"], applied_by_source)
+
+    # ---------------------------
+    # Lag reporting
+    # ---------------------------
+    def status(self) -> List[LinkStatus]:
+        with self._lock:
+            return [LinkStatus(**vars(link)) for link in self.links.values()]
+
+    def lag(self, target: str) -> float:
+        """Worst lag in seconds of any link feeding `target` (0 when fully caught up)."""
+        with self._lock:
+            lags = [l.lag_seconds for l in self.links.values() if l.target == target.upper()]
+        return max(lags, default=0.0)
+
+    def report(self) -> str:
+        lines = []
+        for s in self.status():
+            state = f"ERROR {s.last_error}" if s.last_error else f"{s.pending} pending"
+            lines.append(f"{s.source:>5} → {s.target:<5} seq {s.applied_seq:<8} {state:<14}"
+                         f"lag {s.lag_seconds:6.2f} s")
+        return "\n".join(lines) or "Replication: no replicas configured"
+
+
+# ---------------------------
+# change_log retention
+# ---------------------------
+def purge_change_log(retention_hours: float, applied: Optional[Dict[str, int]] = None):
+    """
+    Delete change_log rows older than `retention_hours` on every fragment. With
+    `applied` (source -> seq every replica has applied), a source's rows are only
+    deleted up to that seq.
+    """
+    for src in node_configs():
+        seq = (applied or {}).get(src, 2 ** 62)
+        try:
+            with get_pool(src).connection() as conn:
+                cur = conn.cursor()
+                cur.execute(PURGE_SQL, (seq, retention_hours))
+                conn.commit()
+                cur.close()
+        except Error as e:
+            print(f"⚠ change_log purge on {src} failed: {e}")
+
+
+class ChangeLogPurger:
+    """
+    Age-based change_log purge while no ReplicationManager runs. The triggers log every
+    write whether or not replication is on, and delta refresh (change_feed) relies on
+    rows older than `retention_hours` being gone, so the log must be trimmed anyway.
+    """
+
+    def __init__(self, retention_hours: float, interval: float = PURGE_EVERY):
+        self.retention_hours = retention_hours
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ChangeLogPurger":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="change-log-purge", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            purge_change_log(self.retention_hours)
+            self._stop.wait(self.interval)
+
+
+_manager: Optional[ReplicationManager] = None
+_purger: Optional[ChangeLogPurger] = None
+_manager_lock = threading.Lock()
+
+
+def start_replication() -> Optional[ReplicationManager]:
+    """
+    Start the process-wide manager when "replication_enabled" is true; otherwise start
+    only the change_log purge (when the storage backend keeps a change_log) and return None.
+    """
+    global _manager, _purger
+    with _manager_lock:
+        if _manager is None:
+            settings = replication_settings()
+            if not settings["enabled"]:
+                from backend.storage import get_storage
+                if _purger is None and get_storage().change_log:
+                    _purger = ChangeLogPurger(settings["retention_hours"]).start()
+                return None
+            _manager = ReplicationManager(settings).start()
+        return _manager
+
+
+def get_replication_manager() -> Optional[ReplicationManager]:
+    return _manager
+
+
+def stop_replication():
+    global _manager, _purger
+    with _manager_lock:
+        if _manager is not None:
+            _manager.stop()
+            _manager = None
+        if _purger is not None:
+            _purger.stop()
+            _purger = None
+
+
+if __name__ == "__main__":
+    # Standalone replication daemon: python -m backend.replication
+    manager = ReplicationManager().start()
+    if not manager.links:
+        print("ℹ️ No replicas configured in meta_config.json.")
+    try:
+        while manager.links:
+            time.sleep(5)
+            print(manager.report(), flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.stop()
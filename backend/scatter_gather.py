@@ -0,0 +1,415 @@
+# backend/scatter_gather.py
+
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from mysql.connector.errors import OperationalError
+
+from backend.connection_pool import get_pool, node_configs, pool_settings
+from backend.metrics import estimate_bytes, get_metrics
+from backend.read_router import get_read_router
+
+class ShardTimeout(OperationalError):
+    """A shard read that missed its deadline; the other shards' rows are returned without it."""
+
+# ---------------------------
+# Result containers
+# ---------------------------
+@dataclass
+class ShardResult:
+    node: str
+    rows: List[Tuple] = field(default_factory=list)
+    elapsed: float = 0.0            # seconds spent on this shard
+    error: Optional[Exception] = None
+    served_by: Optional[str] = None # node that answered (a replica, when routed to one)
+
+
+@dataclass
+class GatherResult:
+    rows: List[Tuple] = field(default_factory=list)
+    shards: Dict[str, ShardResult] = field(default_factory=dict)
+    elapsed: float = 0.0            # wall-clock time for the whole scatter-gather
+
+    @property
+    def timings(self) -> Dict[str, float]:
+        return {node: r.elapsed for node, r in self.shards.items()}
+
+    @property
+    def errors(self) -> Dict[str, Exception]:
+        return {node: r.error for node, r in self.shards.items() if r.error is not None}
+
+    @property
+    def missing(self) -> Dict[str, str]:
+        """Shards whose rows are not in `rows`, with the reason (a timeout or an error)."""
+        return {node: str(e) for node, e in self.errors.items()}
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.errors)
+
+    def report(self) -> str:
+        """One line per shard, e.g. 'CSE   3 rows   4.1 ms'."""
+        lines = []
+        for node, r in self.shards.items():
+            if isinstance(r.error, ShardTimeout):
+                status = "TIMEOUT"
+            else:
+                status = f"ERROR {r.error}" if r.error else f"{len(r.rows)} rows"
+            via = f"  via {r.served_by}" if r.served_by and r.served_by != node else ""
+            lines.append(f"{node:<6}{status:<14}{r.elapsed * 1000:8.1f} ms{via}")
+        lines.append(f"{'total':<6}{len(self.rows):<5}rows     {self.elapsed * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+class ShardRows(list):
+    """
+    Rows of a fan-out read that tolerates failed shards. `missing` maps each shard
+    that did not answer to the reason, so callers can show partial results as such.
+    """
+
+    def __init__(self, rows: Sequence[Tuple] = (), missing: Optional[Dict[str, str]] = None):
+        super().__init__(rows)
+        self.missing: Dict[str, str] = dict(missing or {})
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.missing)
+
+# ---------------------------
+# Shared worker pool
+# ---------------------------
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Thread pool for per-shard work other than reads (bulk loads), two workers per fragment node."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(4, 2 * len(node_configs())),
+                                           thread_name_prefix="shard")
+        return _executor
+
+
+_node_executors: Dict[str, ThreadPoolExecutor] = {}
+_stalled: Dict[str, int] = {}       # node -> reads abandoned at their deadline, still running
+
+
+def get_node_executor(node: str) -> ThreadPoolExecutor:
+    """
+    Workers for reads served by `node`, one per pooled connection. Reads stuck on a
+    stalled node only tie up that node's workers, never another shard's.
+    """
+    node = node.upper()
+    with _executor_lock:
+        executor = _node_executors.get(node)
+        if executor is None:
+            executor = _node_executors[node] = ThreadPoolExecutor(
+                max_workers=int(pool_settings()["size"]), thread_name_prefix=f"read-{node.lower()}")
+        return executor
+
+
+def _abandon(node: str, future: Future):
+    """Count a read left running past its deadline until its worker is freed."""
+    if future.done():
+        return
+
+    def freed(_):
+        with _executor_lock:
+            _stalled[node] -= 1
+
+    with _executor_lock:
+        _stalled[node] = _stalled.get(node, 0) + 1
+    future.add_done_callback(freed)
+
+
+def is_stalled(node: str) -> bool:
+    """True while an earlier read of `node` that missed its deadline is still running."""
+    with _executor_lock:
+        return _stalled.get(node.upper(), 0) > 0
+
+# ---------------------------
+# Scatter-gather
+# ---------------------------
+def with_time_limit(sql: str, seconds: Optional[float]) -> str:
+    """
+    Ask the server to abort a SELECT after `seconds` (MySQL's MAX_EXECUTION_TIME
+    hint), so a read abandoned at its deadline does not hold a connection and a
+    worker for long. Engines without optimizer hints read it as a comment.
+    """
+    stripped = sql.lstrip()
+    if not seconds or stripped[:6].upper() != "SELECT":
+        return sql
+    return f"{stripped[:6]} /*+ MAX_EXECUTION_TIME({max(1, int(seconds * 1000))}) */{stripped[6:]}"
+
+
+def _run(node: str, sql: str, params: Sequence) -> List[Tuple]:
+    with get_pool(node).connection() as conn:
+        cur = conn.cursor()
+        cur.execute(sql, tuple(params))
+        rows = cur.fetchall()
+        cur.close()
+        return rows
+
+
+def _attempt(shard: str, target: str, sql: str, params: Sequence, time_limit: Optional[float]) -> List[Tuple]:
+    """One read of `shard` served by `target`, recorded for the router and metrics."""
+    router = get_read_router()
+    began = time.perf_counter()
+    try:
+        rows = _run(target, with_time_limit(router.rewrite(sql, shard, target), time_limit), params)
+    except Exception:
+        router.record(target, time.perf_counter() - began, ok=False)
+        get_metrics().record_shard(shard, target, time.perf_counter() - began, error=True)
+        raise
+    router.record(target, time.perf_counter() - began)
+    get_metrics().record_shard(shard, target, time.perf_counter() - began, rows)
+    return rows
+
+
+@dataclass
+class _ShardRead:
+    """scatter_each() bookkeeping for one shard: the nodes tried and when to hedge."""
+    result: ShardResult
+    sql: str
+    params: Sequence
+    tried: List[str] = field(default_factory=list)
+    hedge_at: Optional[float] = None
+    done: bool = False
+
+
+def query_shard(node: str, sql: str, params: Sequence = (), routed: bool = True) -> ShardResult:
+    """
+    Run one read of one shard through a connection pool. The read router may serve it
+    from a replica (fastest healthy, fresh enough); a failed replica read is retried on
+    the primary. `routed=False` always reads the primary (e.g. its change_log).
+    """
+    return scatter_each({node: (sql, params)}, routed).shards[node.upper()]
+
+
+def scatter_gather(sql: str, params: Sequence = (), nodes: Optional[Sequence[str]] = None,
+                   routed: bool = True) -> GatherResult:
+    """
+    Send the same query to every fragment node concurrently and concatenate the rows
+    in node order. Latency is that of the slowest shard rather than the sum of all.
+    `sql` is written against the node-local `students` table.
+    """
+    nodes = [n.upper() for n in nodes] if nodes is not None else list(node_configs())
+    return scatter_each({node: (sql, params) for node in nodes}, routed)
+
+
+def scatter_each(queries: Dict[str, Tuple[str, Sequence]], routed: bool = True,
+                 deadline: Optional[float] = None) -> GatherResult:
+    """
+    scatter_gather() with a different (sql, params) per node, e.g. per-shard key lists.
+
+    Each shard has `deadline` seconds (read_routing "shard_deadline" by default) to
+    answer. A shard still running then gets a ShardTimeout error and the result
+    carries the other shards' rows (see GatherResult.missing); the late read is
+    abandoned to its worker and cut short by the server-side time limit.
+
+    Routed reads are hedged: one still running past its node's usual latency
+    (ReadRouter.hedge_delay()) is re-issued to another eligible node, a fresh replica
+    or the primary, and the first answer wins.
+
+    Reads run on per-node workers (get_node_executor()). A node with an abandoned
+    read still running is stalled: routed reads go to another eligible node, and
+    anything else fails at once with ShardTimeout instead of queueing behind it.
+    """
+    router = get_read_router()
+    deadline = router.settings["shard_deadline"] if deadline is None else deadline
+    start = time.perf_counter()
+    expires = start + deadline if deadline else None
+    reads: Dict[str, _ShardRead] = {}
+    pending: Dict[Future, Tuple[_ShardRead, str]] = {}
+
+    def launch(read: _ShardRead, target: Optional[str]):
+        while target is not None and is_stalled(target):
+            read.tried.append(target)
+            target = router.hedge_target(read.result.node, read.tried) if routed else None
+        if target is None:
+            if not any(r is read for r, _ in pending.values()):
+                finish(read, [], None, read.result.error or ShardTimeout(
+                    msg=f"{read.tried[-1]} is stalled on an earlier read that timed out"))
+            return
+        read.tried.append(target)
+        limit = expires - time.perf_counter() if expires else None
+        future = get_node_executor(target).submit(_attempt, read.result.node, target, read.sql,
+                                                  read.params, limit)
+        pending[future] = (read, target)
+
+    def finish(read: _ShardRead, rows: List[Tuple], served_by: Optional[str], error: Optional[Exception],
+               timed_out: bool = False):
+        read.done = True
+        read.result.rows, read.result.served_by, read.result.error = rows, served_by, error
+        read.result.elapsed = time.perf_counter() - start
+        for future, (r, target) in list(pending.items()):
+            if r is read:
+                # Not started yet: dropped. Running past the deadline: the node is stalled.
+                if not future.cancel() and timed_out:
+                    _abandon(target, future)
+                del pending[future]
+
+    for node, (sql, params) in queries.items():
+        read = reads[node.upper()] = _ShardRead(ShardResult(node.upper()), sql, params)
+        target = router.choose(read.result.node) if routed else read.result.node
+        launch(read, target)
+        delay = router.hedge_delay(target) if routed else None
+        read.hedge_at = start + delay if delay is not None else None
+
+    while pending:
+        wake = [r.hedge_at for r in reads.values() if r.hedge_at is not None and not r.done]
+        if expires is not None:
+            wake.append(expires)
+        timeout = max(0.0, min(wake) - time.perf_counter()) if wake else None
+        done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future not in pending:
+                continue
+            read, target = pending.pop(future)
+            try:
+                finish(read, future.result(), target, None)
+            except Exception as e:
+                read.result.error = e
+                if routed and read.result.node not in read.tried:
+                    launch(read, read.result.node)       # a failed replica read retries on the primary
+                elif not any(r is read for r, _ in pending.values()):
+                    finish(read, [], None, e)
+
+        now = time.perf_counter()
+        if expires is not None and now >= expires:
+            break
+        for read in reads.values():
+            if read.done or read.hedge_at is None or now < read.hedge_at:
+                continue
+            read.hedge_at = None
+            alternative = router.hedge_target(read.result.node, read.tried)
+            if alternative is not None and not is_stalled(alternative):
+                get_metrics().inc("hedged_reads_total", shard=read.result.node, node=alternative)
+                launch(read, alternative)
+
+    for read in reads.values():
+        if not read.done:
+            get_metrics().inc("shard_timeouts_total", shard=read.result.node)
+            finish(read, [], None, ShardTimeout(msg=f"timed out after {deadline:.1f} s"), timed_out=True)
+
+    gathered = GatherResult()
+    for node, read in reads.items():
+        gathered.shards[node] = read.result
+        gathered.rows.extend(read.result.rows)
+    gathered.elapsed = time.perf_counter() - start
+    return gathered
+
+
+def _stream(node: str, sql: str, params: Sequence, chunk_size: int) -> Iterator[List[Tuple]]:
+    """Unbuffered read of one node in the calling thread, `chunk_size` rows at a time."""
+    pool = get_pool(node)
+    conn = pool.acquire()
+    finished = False
+    try:
+        cur = conn.cursor(buffered=False)
+        cur.execute(sql, tuple(params))
+        while True:
+            chunk = cur.fetchmany(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+        cur.close()
+        finished = True
+    finally:
+        # A half-read unbuffered result would have to be drained before reuse; drop it instead.
+        pool.release(conn, discard=not finished)
+
+
+@dataclass
+class _StreamEnd:
+    error: Optional[Exception] = None
+
+
+def _produce(node: str, sql: str, params: Sequence, chunk_size: int,
+             out: "queue.Queue", stop: threading.Event):
+    """Worker side of a deadline-bound stream_shard(): the chunks, then a _StreamEnd."""
+    chunks = _stream(node, sql, params, chunk_size)
+    end = _StreamEnd()
+    try:
+        for chunk in chunks:
+            if not _put(out, chunk, stop):
+                return
+    except Exception as e:
+        end.error = e
+    finally:
+        chunks.close()
+    _put(out, end, stop)
+
+
+def _put(out: "queue.Queue", item, stop: threading.Event) -> bool:
+    """Block on a full queue until there is room or the consumer has gone (False)."""
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def stream_shard(node: str, sql: str, params: Sequence = (), chunk_size: int = 1000,
+                 deadline: Optional[float] = None) -> Iterator[List[Tuple]]:
+    """
+    Stream one node's result with an unbuffered cursor, `chunk_size` rows at a time.
+
+    With a `deadline` (read_routing "shard_deadline" by default; 0 for none) the
+    cursor is read on one of the node's workers, two chunks ahead, and ShardTimeout
+    is raised once this side has waited more than `deadline` seconds in total for
+    rows, even while the node hangs inside a single fetch. Time the consumer spends
+    on a chunk does not count. A stream abandoned that way marks the node stalled
+    until its worker returns (freed by the pool's read_timeout at the latest).
+    """
+    router = get_read_router()
+    deadline = router.settings["shard_deadline"] if deadline is None else deadline
+    sql = router.rewrite(sql, node.upper(), node.upper())      # drop replicated rows hosted there
+    busy, rows, size = 0.0, 0, 0       # time spent waiting for rows, excluding the consumer
+    stop = threading.Event()
+    try:
+        if not deadline:
+            chunks = _stream(node, sql, params, chunk_size)
+            began = time.perf_counter()
+            for chunk in chunks:
+                busy += time.perf_counter() - began
+                rows, size = rows + len(chunk), size + estimate_bytes(chunk)
+                yield chunk
+                began = time.perf_counter()
+            busy += time.perf_counter() - began
+            return
+
+        if is_stalled(node):
+            raise ShardTimeout(msg=f"{node.upper()} is stalled on an earlier read that timed out")
+        out: "queue.Queue" = queue.Queue(maxsize=2)
+        future = get_node_executor(node).submit(_produce, node, sql, params, chunk_size, out, stop)
+        while True:
+            began = time.perf_counter()
+            try:
+                item = out.get(timeout=max(0.0, deadline - busy))
+            except queue.Empty:
+                get_metrics().inc("shard_timeouts_total", shard=node.upper())
+                _abandon(node.upper(), future)
+                raise ShardTimeout(msg=f"timed out after {deadline:.1f} s")
+            finally:
+                busy += time.perf_counter() - began
+            if isinstance(item, _StreamEnd):
+                if item.error is not None:
+                    raise item.error
+                break
+            rows, size = rows + len(item), size + estimate_bytes(item)
+            yield item
+    finally:
+        stop.set()                      # an early close or a timeout lets the worker go
+        metrics = get_metrics()
+        metrics.observe("shard_seconds", busy, shard=node.upper(), node=node.upper())
+        metrics.inc("shard_rows_total", rows, shard=node.upper(), node=node.upper())
+        metrics.inc("shard_bytes_total", size, shard=node.upper(), node=node.upper())
@@ -0,0 +1,105 @@
+# backend/shard_router.py
+
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from mysql.connector import Error
+
+from backend.connection_pool import get_pool, node_configs, roll_ranges
+
+# ---------------------------
+# Write statements (node-local `students` table)
+# ---------------------------
+INSERT_SQL = ("INSERT INTO students (roll_no, name, branch, marks, attendance) "
+              "VALUES (%s, %s, %s, %s, %s)")
+UPDATE_SQL = "UPDATE students SET marks = %s, attendance = %s WHERE roll_no = %s"
+DELETE_SQL = "DELETE FROM students WHERE roll_no = %s"
+BEFORE_IMAGE_SQL = ("SELECT roll_no, name, branch, marks, attendance FROM students "
+                    "WHERE roll_no = %s FOR UPDATE")
+
+
+class UnknownBranchError(Error):
+    """Raised for a branch that has no fragment node in meta_config.json."""
+
+
+class RollRangeError(Error):
+    """Raised for a roll number outside its branch's "roll_ranges" block in meta_config.json."""
+
+
+class ShardRouter:
+    """
+    Routes each write straight to the fragment node that owns the branch,
+    replacing the CASE UPPER(p_branch) mapping in the catalog procedures.
+    The branch -> node mapping is the "nodes" section of meta_config.json,
+    so a new branch only needs a new entry there.
+
+    Inserts must also fall inside the branch's "roll_ranges" block: the query
+    planner prunes shards by those blocks, so a row outside its block would be
+    invisible to roll-range filters.
+    """
+
+    def __init__(self, nodes: Optional[Dict[str, dict]] = None):
+        self.nodes = {k.upper(): v for k, v in (nodes or node_configs()).items()}
+
+    def branches(self) -> List[str]:
+        return list(self.nodes)
+
+    def node_for(self, branch: str) -> str:
+        node = (branch or "").strip().upper()
+        if node not in self.nodes:
+            raise UnknownBranchError(msg=f"Invalid branch specified: {branch!r}")
+        return node
+
+    def check_roll(self, roll_no: int, branch: str) -> str:
+        """The owning node of `branch`, after checking `roll_no` lies in its roll block."""
+        node = self.node_for(branch)
+        block = roll_ranges().get(node)
+        if block and not block[0] <= int(roll_no) <= block[1]:
+            raise RollRangeError(msg=f"Roll No {roll_no} is outside the {node} block {block[0]}-{block[1]} "
+                                     f"(roll_ranges in meta_config.json)")
+        return node
+
+    def execute(self, branch: str, sql: str, params: Sequence,
+                before_roll: Optional[int] = None) -> Tuple[int, Optional[Tuple]]:
+        """
+        Run one write on the owning node with a cached prepared statement.
+        With `before_roll`, the row's previous image is read (and locked) in the same
+        transaction first. Returns (rowcount, before image or None).
+        """
+        pool = get_pool(self.node_for(branch))
+        with pool.connection() as conn:
+            before = None
+            if before_roll is not None:
+                sel = pool.prepared_cursor(conn, BEFORE_IMAGE_SQL)
+                sel.execute(BEFORE_IMAGE_SQL, (before_roll,))
+                rows = sel.fetchall()
+                before = tuple(rows[0]) if rows else None
+            cur = pool.prepared_cursor(conn, sql)
+            cur.execute(sql, tuple(params))
+            conn.commit()
+            return cur.rowcount, before
+
+    # ---- CRUD ----
+    def insert(self, roll_no: int, name: str, branch: str, marks: float, attendance: float):
+        self.check_roll(roll_no, branch)
+        return self.execute(branch, INSERT_SQL, (roll_no, name, branch, marks, attendance))
+
+    def update(self, roll_no: int, branch: str, marks: float, attendance: float, capture: bool = False):
+        return self.execute(branch, UPDATE_SQL, (marks, attendance, roll_no),
+                            before_roll=roll_no if capture else None)
+
+    def delete(self, roll_no: int, branch: str, capture: bool = False):
+        return self.execute(branch, DELETE_SQL, (roll_no,), before_roll=roll_no if capture else None)
+
+
+_router: Optional[ShardRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ShardRouter:
+    """Process-wide router built from meta_config.json."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = ShardRouter()
+        return _router
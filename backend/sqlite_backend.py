@@ -0,0 +1,286 @@
+# backend/sqlite_backend.py
+
+import os
+import re
+import sqlite3
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from mysql.connector import errors
+
+from backend.connection_pool import node_configs
+from backend.storage import StorageBackend
+
+CATALOG = "db_catalog"
+
+# Same table as database/initial_setup.sql, plus indexes for the per-fragment queries:
+# range filters and ORDER BY on marks/attendance, GROUP BY / WHERE UPPER(branch).
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS students (
+        roll_no INT PRIMARY KEY,
+        name VARCHAR(100),
+        branch VARCHAR(20),
+        marks FLOAT,
+        attendance FLOAT
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_students_marks ON students (marks, roll_no)",
+    "CREATE INDEX IF NOT EXISTS idx_students_attendance ON students (attendance, roll_no)",
+    "CREATE INDEX IF NOT EXISTS idx_students_branch ON students (UPPER(branch))",
+)
+_PLACEHOLDER = re.compile(r"%s")
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE)
+_BINARY_CAST = re.compile(r"\bCAST\((\w+)\s+AS\s+BINARY\)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=512)
+def translate(sql: str) -> str:
+    """MySQL statement text -> SQLite: ? placeholders, no row-lock clauses, byte-order compares."""
+    # CAST(x AS BINARY) would take NUMERIC affinity in SQLite; BINARY collation is the equivalent.
+    return _BINARY_CAST.sub(r"\1 COLLATE BINARY", _FOR_UPDATE.sub("", _PLACEHOLDER.sub("?", sql)))
+
+
+def _wrap(e: sqlite3.Error) -> errors.Error:
+    if isinstance(e, sqlite3.IntegrityError):
+        return errors.IntegrityError(msg=str(e), errno=1062)
+    if isinstance(e, sqlite3.OperationalError):
+        return errors.OperationalError(msg=str(e))
+    return errors.DatabaseError(msg=str(e))
+
+# ---------------------------
+# Stored procedures (database/distributed_backend.sql, section 3-5)
+# ---------------------------
+def _fragment(fragments: Sequence[str], branch: Optional[str]) -> str:
+    name = f"db_{(branch or '').strip().lower()}"
+    if name not in fragments:
+        raise errors.DatabaseError(msg="Invalid branch specified!", sqlstate="45000")
+    return name
+
+
+def _where(conditions: Sequence[tuple]) -> tuple:
+    clauses, params = [" WHERE 1=1"], []
+    for sql, value in conditions:
+        if value is not None and value != "":
+            clauses.append(sql)
+            params.append(value)
+    return " AND ".join(clauses), params
+
+
+def _select_fragments(fragments: Sequence[str], branch: Optional[str], where: str, params: list) -> tuple:
+    if branch:
+        return f"SELECT * FROM {_fragment(fragments, branch)}.students{where}", params
+    parts = [f"SELECT * FROM {db}.students{where}" for db in fragments]
+    return " UNION ALL ".join(parts), params * len(parts)
+
+
+def _proc_add_student(fragments, roll, name, branch, marks, att):
+    sql = f"INSERT INTO {_fragment(fragments, branch)}.students VALUES (?, ?, ?, ?, ?)"
+    return sql, [roll, name, branch, marks, att], False
+
+
+def _proc_update_student(fragments, roll, branch, marks, att):
+    sql = f"UPDATE {_fragment(fragments, branch)}.students SET marks = ?, attendance = ? WHERE roll_no = ?"
+    return sql, [marks, att, roll], False
+
+
+def _proc_delete_student(fragments, roll, branch):
+    return f"DELETE FROM {_fragment(fragments, branch)}.students WHERE roll_no = ?", [roll], False
+
+
+def _proc_filter_students(fragments, branch, marks_min, marks_max, att_min, att_max):
+    where, params = _where((("marks >= ?", marks_min), ("marks <= ?", marks_max),
+                            ("attendance >= ?", att_min), ("attendance <= ?", att_max)))
+    return _select_fragments(fragments, branch, where, params) + (True,)
+
+
+def _proc_search_students(fragments, keyword, min_marks, max_marks, branch):
+    where, params = _where((("name LIKE ?", f"%{keyword}%" if keyword else None),
+                            ("marks >= ?", min_marks), ("marks <= ?", max_marks)))
+    return _select_fragments(fragments, branch, where, params) + (True,)
+
+
+PROCEDURES = {
+    "add_student": _proc_add_student,
+    "update_student": _proc_update_student,
+    "delete_student": _proc_delete_student,
+    "filter_students": _proc_filter_students,
+    "search_students": _proc_search_students,
+}
+
+# ---------------------------
+# mysql.connector-compatible connection
+# ---------------------------
+class SQLiteCursor:
+    def __init__(self, conn: "SQLiteConnection"):
+        self._conn = conn
+        self._cur = conn.raw.cursor()
+        self._results: List["SQLiteCursor"] = []
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def execute(self, sql: str, params: Sequence = ()):
+        try:
+            self._cur.execute(translate(sql), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise _wrap(e) from e
+        self.rowcount = self._cur.rowcount
+        self.lastrowid = self._cur.lastrowid
+
+    def executemany(self, sql: str, seq_params):
+        # mysql.connector sends an INSERT batch as one multi-row statement, which fails
+        # as a whole; sqlite3 would keep the rows before the failing one.
+        raw = self._conn.raw
+        raw.execute("SAVEPOINT executemany")
+        try:
+            self._cur.executemany(translate(sql), [tuple(p) for p in seq_params])
+        except sqlite3.Error as e:
+            raw.execute("ROLLBACK TO SAVEPOINT executemany")
+            raw.execute("RELEASE SAVEPOINT executemany")
+            raise _wrap(e) from e
+        raw.execute("RELEASE SAVEPOINT executemany")
+        self.rowcount = self._cur.rowcount
+
+    def callproc(self, name: str, args: Sequence = ()):
+        proc = PROCEDURES.get(name)
+        if proc is None:
+            raise errors.ProgrammingError(msg=f"PROCEDURE {name} does not exist", errno=1305)
+        sql, params, returns_rows = proc(self._conn.fragments, *args)
+        cur = SQLiteCursor(self._conn)
+        cur.execute(sql, params)
+        self._results = [cur] if returns_rows else []
+        self.rowcount = cur.rowcount
+        return tuple(args)
+
+    def stored_results(self):
+        return iter(self._results)
+
+    def fetchone(self):
+        return self._cur.fetchone()
+
+    def fetchmany(self, size: int = 1):
+        return self._cur.fetchmany(size)
+
+    def fetchall(self):
+        return self._cur.fetchall()
+
+    def close(self):
+        self._cur.close()
+
+
+class SQLiteConnection:
+    """One SQLite connection in autocommit mode; start_transaction() opens BEGIN … COMMIT."""
+
+    def __init__(self, path: str, database: str, fragments: Sequence[str], attach: Dict[str, str]):
+        self.database = database
+        self.fragments = list(fragments)
+        # Pool connections are handed between worker threads, one user at a time.
+        self.raw = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.raw.execute("PRAGMA journal_mode = WAL")
+        self.raw.execute("PRAGMA synchronous = NORMAL")
+        for schema, other in attach.items():
+            self.raw.execute("ATTACH DATABASE ? AS " + schema, (other,))
+        if attach:
+            union = " UNION ALL ".join(f"SELECT * FROM {schema}.students" for schema in attach)
+            self.raw.execute(f"CREATE TEMP VIEW IF NOT EXISTS all_students AS {union}")
+
+    @property
+    def in_transaction(self) -> bool:
+        return self.raw.in_transaction
+
+    def cursor(self, prepared: bool = False, **_):
+        return SQLiteCursor(self)
+
+    def start_transaction(self, **_):
+        if self.raw.in_transaction:
+            raise errors.ProgrammingError(msg="Transaction already in progress")
+        self.raw.execute("BEGIN")
+
+    def commit(self):
+        if self.raw.in_transaction:
+            self.raw.execute("COMMIT")
+
+    def rollback(self):
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK")
+
+    def ping(self, reconnect: bool = False, **_):
+        self.raw.execute("SELECT 1")
+
+    def is_connected(self) -> bool:
+        return True
+
+    def close(self):
+        self.raw.close()
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Embedded engine for single-node and laptop deployments: every fragment database
+    of meta_config.json ("nodes" → "database") is one SQLite file in `directory`, in
+    WAL mode so the scatter-gather readers never block each other or a writer.
+    The coordinator (`db_catalog`) attaches the fragments under their MySQL names, so
+    `db_cse.students`, the `all_students` view and the stored procedures of
+    database/distributed_backend.sql (answered by cursor.callproc()) behave as on
+    MySQL. Host, user and password are ignored.
+
+    Connections mimic the parts of mysql.connector the backend uses: %s placeholders,
+    prepared cursors, fetchmany, start_transaction and mysql.connector.Error
+    subclasses. Not emulated: change_log triggers and replication (NOW(6)/INTERVAL
+    arithmetic; delta refresh falls back to full reloads) and row locks (FOR UPDATE
+    is dropped, SQLite serializes writers per file).
+    """
+    name = "sqlite"
+    change_log = False
+
+    def __init__(self, directory: str, fragments: Optional[Sequence[str]] = None):
+        self.directory = directory
+        self.fragments = [f.lower() for f in fragments] if fragments is not None else None
+        if self.fragments is not None:
+            self.prepare()
+
+    def describe(self) -> str:
+        return f"sqlite ({self.directory})"
+
+    def prepare(self, nodes: Optional[Dict[str, dict]] = None):
+        """Create the fragment files, tables and indexes (idempotent)."""
+        if nodes is not None or self.fragments is None:
+            nodes = nodes if nodes is not None else node_configs()
+            self.fragments = [str(cfg["database"]).lower() for cfg in nodes.values()]
+        os.makedirs(self.directory, exist_ok=True)
+        for db in self.fragments:
+            conn = sqlite3.connect(self.path(db))
+            conn.execute("PRAGMA journal_mode = WAL")
+            for statement in SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            conn.close()
+
+    def path(self, database: str) -> str:
+        return os.path.join(self.directory, f"{database.lower()}.sqlite3")
+
+    def connect(self, **config) -> SQLiteConnection:
+        if self.fragments is None:
+            self.prepare()
+        database = str(config.get("database", CATALOG)).lower()
+        if database == CATALOG:
+            attach = {db: self.path(db) for db in self.fragments}
+        elif database in self.fragments:
+            attach = {}
+        else:
+            raise errors.ProgrammingError(msg=f"Unknown database '{database}'", errno=1049)
+        return SQLiteConnection(self.path(database), database, self.fragments, attach)
+
+    def load(self, database: str, rows: Iterable[Sequence], batch_size: int = 50_000) -> int:
+        """Fast unlogged load of one fragment (benchmarks, seeding). Returns the row count."""
+        conn = sqlite3.connect(self.path(database))
+        conn.execute("PRAGMA journal_mode = WAL")
+        rows, count = iter(rows), 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            conn.executemany("INSERT INTO students VALUES (?, ?, ?, ?, ?)", batch)
+            count += len(batch)
+        conn.commit()
+        conn.close()
+        return count
@@ -0,0 +1,83 @@
+# backend/storage.py
+
+import os
+import threading
+from typing import Dict, Optional
+
+from backend.connection_pool import META_CONFIG_PATH, load_meta_config, node_configs, set_connection_factory
+
+STORAGE_DEFAULTS = {
+    "engine": "mysql",          # "mysql" (one server, a database per fragment) or "sqlite"
+    "path": "data",             # sqlite: directory of the fragment files, relative to the project root
+}
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(META_CONFIG_PATH), ".."))
+
+
+def storage_settings() -> dict:
+    """The "backend" section of meta_config.json (a bare string names the engine)."""
+    section = load_meta_config().get("backend", {})
+    settings = dict(STORAGE_DEFAULTS)
+    settings.update({"engine": section} if isinstance(section, str) else section)
+    settings["engine"] = str(settings["engine"]).lower()
+    return settings
+
+
+class StorageBackend:
+    """
+    Where the fragment nodes live. The rest of the backend only sees
+    mysql.connector-compatible connections: connection pools open them through
+    `connect(**node_config)`, so db_handler, scatter-gather and the shard router run
+    unchanged on every engine.
+    """
+    name = "base"
+    change_log = True           # fragments carry database/replication.sql's change_log and triggers
+
+    def connect(self, **config):
+        """Open one connection to the node described by a meta_config.json "nodes" entry."""
+        raise NotImplementedError
+
+    def prepare(self, nodes: Optional[Dict[str, dict]] = None):
+        """Create whatever the engine needs before the first query (schema, indexes)."""
+
+    def describe(self) -> str:
+        return self.name
+
+
+_storage: Optional[StorageBackend] = None
+_storage_lock = threading.Lock()
+
+
+def create_storage(settings: Optional[dict] = None) -> StorageBackend:
+    settings = settings or storage_settings()
+    engine = settings["engine"]
+    if engine == "mysql":
+        from backend.mysql_backend import MySQLBackend
+        return MySQLBackend()
+    if engine == "sqlite":
+        from backend.sqlite_backend import SQLiteBackend
+        path = settings["path"]
+        return SQLiteBackend(path if os.path.isabs(path) else os.path.join(PROJECT_ROOT, path))
+    raise ValueError(f"Unknown storage engine {engine!r} in meta_config.json (use 'mysql' or 'sqlite')")
+
+
+def _install(storage: StorageBackend) -> StorageBackend:
+    global _storage
+    _storage = storage
+    set_connection_factory(storage.connect)
+    return storage
+
+
+def use_storage(storage: StorageBackend) -> StorageBackend:
+    """Make `storage` the process-wide backend; pools opened afterwards connect through it."""
+    with _storage_lock:
+        return _install(storage)
+
+
+def get_storage() -> StorageBackend:
+    """The backend selected by meta_config.json ("backend"), created on first use."""
+    with _storage_lock:
+        if _storage is None:
+            storage = create_storage()
+            storage.prepare(node_configs())
+            _install(storage)
+        return _storage
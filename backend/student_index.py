@@ -0,0 +1,145 @@
+# backend/student_index.py
+
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from backend.write_events import WriteEvent, add_write_listener
+
+# Columns with a sorted index, by position in (roll_no, name, branch, marks, attendance)
+RANGE_COLUMNS = {"roll_no": 0, "marks": 3, "attendance": 4}
+
+
+class StudentIndex:
+    """
+    In-memory indexes over the student table:
+      * a hash index roll_no -> row for point lookups, and
+      * sorted (value, roll_no) lists on roll_no, marks and attendance for bisect
+        range queries.
+    Kept current incrementally from write events, so lookups need no round trip.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_roll: Dict[int, Tuple] = {}
+        self._sorted: Dict[str, List[Tuple]] = {col: [] for col in RANGE_COLUMNS}
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._by_roll)
+
+    # ---------------------------
+    # Building / maintenance
+    # ---------------------------
+    def build(self, rows: Iterable[Tuple]):
+        """Replace the index contents with `rows` (e.g. a full fetch)."""
+        with self._lock:
+            self._by_roll = {row[0]: tuple(row) for row in rows}
+            for col, pos in RANGE_COLUMNS.items():
+                self._sorted[col] = sorted((row[pos], row[0]) for row in self._by_roll.values())
+            self.loaded = True
+
+    def upsert(self, row: Tuple):
+        with self._lock:
+            self.remove(row[0])
+            row = tuple(row)
+            self._by_roll[row[0]] = row
+            for col, pos in RANGE_COLUMNS.items():
+                insort(self._sorted[col], (row[pos], row[0]))
+
+    def remove(self, roll_no: int):
+        with self._lock:
+            row = self._by_roll.pop(roll_no, None)
+            if row is None:
+                return
+            for col, pos in RANGE_COLUMNS.items():
+                entries = self._sorted[col]
+                i = bisect_left(entries, (row[pos], roll_no))
+                if i < len(entries) and entries[i] == (row[pos], roll_no):
+                    del entries[i]
+
+    def apply(self, event: WriteEvent):
+        """Write listener: keep the index in step with committed CRUD operations."""
+        if not self.loaded:
+            return
+        if event.op == "delete":
+            self.remove(event.roll_no)
+        elif event.after is not None:
+            after = event.after
+            if after[1] is None:  # update without a before image: keep the known name/branch
+                known = self._by_roll.get(event.roll_no)
+                if known is None:
+                    return
+                after = (known[0], known[1], known[2], after[3], after[4])
+            self.upsert(after)
+
+    def clear(self):
+        with self._lock:
+            self._by_roll.clear()
+            for col in self._sorted:
+                self._sorted[col] = []
+            self.loaded = False
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def get(self, roll_no: int) -> Optional[Tuple]:
+        """O(1) point lookup by roll number."""
+        return self._by_roll.get(roll_no)
+
+    def range(self, column: str, low=None, high=None) -> List[Tuple]:
+        """Rows with low <= column <= high (either bound optional), ordered by that column."""
+        if column not in RANGE_COLUMNS:
+            raise ValueError(f"No range index on {column!r}")
+        with self._lock:
+            start, stop = self._span(column, low, high)
+            return [self._by_roll[roll] for _, roll in self._sorted[column][start:stop]]
+
+    def _span(self, column: str, low, high) -> Tuple[int, int]:
+        """Positions [start, stop) of the entries with low <= value <= high."""
+        entries = self._sorted[column]
+        start = 0 if low is None else bisect_left(entries, (low, float("-inf")))
+        stop = len(entries) if high is None else bisect_right(entries, (high, float("inf")))
+        return start, stop
+
+    def filter(self, roll_from=None, roll_to=None, marks_min=None, marks_max=None,
+               attendance_min=None, attendance_max=None, branch=None) -> List[Tuple]:
+        """
+        Answer a filter_students()-style query from memory: the bound column whose
+        bisected range holds the fewest entries drives the scan and the remaining
+        predicates are checked per row.
+        """
+        bounds = {"roll_no": (roll_from, roll_to), "marks": (marks_min, marks_max),
+                  "attendance": (attendance_min, attendance_max)}
+        with self._lock:
+            spans = {c: self._span(c, lo, hi) for c, (lo, hi) in bounds.items()
+                     if lo is not None or hi is not None} or {"roll_no": self._span("roll_no", None, None)}
+            driving = min(spans, key=lambda c: spans[c][1] - spans[c][0])
+            start, stop = spans[driving]
+            rows = [self._by_roll[roll] for _, roll in self._sorted[driving][start:stop]]
+        branch = branch.upper() if branch not in (None, "", "All") else None
+
+        def keep(row):
+            if branch and str(row[2]).upper() != branch:
+                return False
+            for col, (lo, hi) in bounds.items():
+                value = row[RANGE_COLUMNS[col]]
+                if (lo is not None and value < lo) or (hi is not None and value > hi):
+                    return False
+            return True
+
+        return [row for row in rows if keep(row)]
+
+
+_index: Optional[StudentIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> StudentIndex:
+    """Process-wide index, subscribed to db_handler write events on first use."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = StudentIndex()
+            add_write_listener(_index.apply)
+        return _index
@@ -0,0 +1,161 @@
+# backend/summary_store.py
+
+import threading
+from typing import Dict, List, Optional, Set
+
+from backend.branch_stats import fetch_branch_stats
+from backend.group_stats import DEBAR_THRESHOLD, SUM_FIELDS, finish_stats
+from backend.scatter_gather import query_shard
+from backend.write_events import WriteEvent, add_write_listener
+
+EXTREMES_SQL = "SELECT MIN(marks), MAX(marks) FROM students WHERE UPPER(branch) = %s"
+
+
+class SummaryStore:
+    """
+    Materialized per-branch aggregates for the Summary Stats window (count, sums,
+    sums of squares, min/max marks, debarred count), kept current from write events.
+
+    Sums and counts are adjusted exactly on every insert/update/delete. Min/max cannot
+    be "un-applied": when the current extreme leaves a branch, the branch is marked
+    stale and its MIN/MAX is re-read from the owning fragment on the next snapshot().
+    That read runs outside the lock, so write listeners never wait on a fragment.
+    """
+
+    def __init__(self, threshold: float = DEBAR_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.RLock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._stale_extremes: Set[str] = set()
+        self._versions: Dict[str, int] = {}     # branch -> writes applied, to spot a racing write
+        self._generation = 0                    # bumped by build() / invalidate()
+        self.loaded = False
+
+    # ---------------------------
+    # Building / consistency
+    # ---------------------------
+    def build(self, stats: Dict[str, Dict[str, float]]):
+        with self._lock:
+            self._stats = {b: {k: s[k] for k in SUM_FIELDS + ("min_marks", "max_marks")}
+                           for b, s in stats.items()}
+            self._stale_extremes.clear()
+            self._generation += 1
+            self.loaded = True
+
+    def rebuild(self) -> List[str]:
+        """
+        Recompute everything from the fragments (aggregation pushdown) and return the
+        branches whose incrementally maintained totals had drifted.
+        """
+        fresh = fetch_branch_stats(self.threshold)
+        with self._lock:
+            drifted = []
+            if self.loaded:
+                for b in set(fresh) | set(self._stats):
+                    old, new = self._stats.get(b), fresh.get(b)
+                    if old is None or new is None or any(
+                            abs(old[k] - new[k]) > 1e-6 for k in SUM_FIELDS):
+                        drifted.append(b)
+            self.build(fresh)
+            return sorted(drifted)
+
+    def invalidate(self):
+        with self._lock:
+            self._stats.clear()
+            self._stale_extremes.clear()
+            self._generation += 1
+            self.loaded = False
+
+    # ---------------------------
+    # Incremental maintenance
+    # ---------------------------
+    def _add(self, branch: str, marks: float, attendance: float, sign: int):
+        self._versions[branch] = self._versions.get(branch, 0) + 1
+        s = self._stats.get(branch)
+        if s is None:
+            if sign < 0:
+                return
+            s = self._stats[branch] = {k: 0 for k in SUM_FIELDS}
+            s.update(min_marks=marks, max_marks=marks)
+        s["count"] += sign
+        s["marks_sum"] += sign * marks
+        s["marks_sumsq"] += sign * marks * marks
+        s["attendance_sum"] += sign * attendance
+        s["attendance_sumsq"] += sign * attendance * attendance
+        s["debarred"] += sign * (attendance < self.threshold)
+        if sign > 0:
+            s["min_marks"] = min(s["min_marks"], marks)
+            s["max_marks"] = max(s["max_marks"], marks)
+        elif s["count"] <= 0:
+            del self._stats[branch]
+            self._stale_extremes.discard(branch)
+        elif marks <= s["min_marks"] or marks >= s["max_marks"]:
+            self._stale_extremes.add(branch)
+
+    def apply(self, event: WriteEvent):
+        """Write listener: fold one committed write into the aggregates."""
+        if not self.loaded:
+            return
+        with self._lock:
+            if event.op != "insert" and event.before is None:
+                # Without the previous image the old values cannot be subtracted.
+                self.invalidate()
+                return
+            if event.before is not None:
+                b = event.before
+                self._add(str(b[2]).upper(), float(b[3]), float(b[4]), -1)
+            if event.after is not None:
+                a = event.after
+                branch = str(a[2] or event.branch).upper()
+                self._add(branch, float(a[3]), float(a[4]), +1)
+
+    def _refresh_extremes(self):
+        """
+        Re-read MIN/MAX of the stale branches without holding the lock. A branch that
+        was written to (or a store rebuilt) while its query ran keeps the read's result
+        out and stays stale for the next snapshot().
+        """
+        with self._lock:
+            generation = self._generation
+            pending = {b: self._versions.get(b, 0) for b in self._stale_extremes}
+        fresh = {}
+        for branch in pending:
+            shard = query_shard(branch, EXTREMES_SQL, (branch,))
+            if shard.error is not None or not shard.rows or shard.rows[0][0] is None:
+                continue
+            fresh[branch] = shard.rows[0]
+        if not fresh:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            for branch, (low, high) in fresh.items():
+                if self._versions.get(branch, 0) != pending[branch] or branch not in self._stats:
+                    continue
+                self._stats[branch].update(min_marks=float(low), max_marks=float(high))
+                self._stale_extremes.discard(branch)
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-branch stats in the fetch_branch_stats() shape; O(branches) once loaded."""
+        if not self.loaded:
+            self.rebuild()
+        self._refresh_extremes()
+        with self._lock:
+            return {b: finish_stats(dict(s)) for b, s in self._stats.items() if s["count"] > 0}
+
+
+_store: Optional[SummaryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_summary_store() -> SummaryStore:
+    """Process-wide summary store, subscribed to db_handler write events on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SummaryStore()
+            add_write_listener(_store.apply)
+        return _store
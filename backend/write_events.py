@@ -0,0 +1,50 @@
+# backend/write_events.py
+
+import threading
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+
+class WriteEvent(NamedTuple):
+    """
+    One committed write. `before` / `after` are full (roll_no, name, branch, marks,
+    attendance) rows: `before` is None for inserts, `after` is None for deletes.
+    """
+    op: str                     # "insert" | "update" | "delete"
+    roll_no: int
+    branch: str
+    before: Optional[Tuple]
+    after: Optional[Tuple]
+
+
+Listener = Callable[[WriteEvent], None]
+
+_listeners: List[Listener] = []
+_lock = threading.Lock()
+
+
+def add_write_listener(listener: Listener):
+    """Call `listener(event)` after every committed add/update/delete (and bulk insert row)."""
+    with _lock:
+        if listener not in _listeners:
+            _listeners.append(listener)
+
+
+def remove_write_listener(listener: Listener):
+    with _lock:
+        if listener in _listeners:
+            _listeners.remove(listener)
+
+
+def has_write_listeners() -> bool:
+    return bool(_listeners)
+
+
+def publish(event: WriteEvent):
+    """Deliver an event to every listener; a failing listener never fails the write."""
+    with _lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(event)
+        except Exception as e:
+            print(f"⚠ Write listener {getattr(listener, '__qualname__', listener)} failed: {e}")
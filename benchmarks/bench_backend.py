@@ -0,0 +1,260 @@
+"""
+Backend benchmark suite on synthetic multi-shard data, without a MySQL server.
+
+    python benchmarks/bench_backend.py                              # 10k and 100k students
+    python benchmarks/bench_backend.py --sizes 10000 1000000 10000000 --json run.json
+    python benchmarks/bench_backend.py --compare run.json           # exit 1 on a regression
+    python benchmarks/bench_backend.py --check                      # consistency checks only
+
+Students are generated across the four branches (each branch owns one block of
+roll numbers, recorded as "roll_ranges") and loaded into the embedded SQLite
+engine of backend/sqlite_backend.py in a temporary directory. The backend then
+runs unchanged against it through storage.use_storage(), so the numbers cover the
+real db_handler code paths: pools, scatter-gather, planning, merging and indexes.
+The fragments share one disk and one process, so absolute timings are only
+comparable between runs on the same machine.
+
+Each case reports the median of --runs. --json writes the results plus the git
+commit and interpreter; --compare checks them against an earlier --json file and
+flags any case more than --tolerance slower. --check runs the consistency checks
+(write paths against the in-memory indexes and summary) instead, exiting 1 on a
+failure.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from backend.algorithm_utils import binary_search, multi_key_sort
+from backend.bulk_loader import add_students_bulk
+from backend.connection_pool import close_all_pools, load_meta_config, use_meta_config
+from backend.db_handler import (fetch_all_students, fetch_branch_stats, fetch_sorted_students,
+                                fetch_top_students, filter_students, fuzzy_search_students,
+                                iter_students, search_students)
+from backend.name_index import get_name_index
+from backend.sqlite_backend import SQLiteBackend
+from backend.storage import use_storage
+from backend.student_index import StudentIndex, get_index
+from backend.summary_store import get_summary_store
+
+BRANCHES = ("CSE", "AIML", "DS", "CC")
+FIRST = ("Aman", "Riya", "Karan", "Ananya", "Harsh", "Sanya", "Rohit", "Priya", "Vikram", "Neha",
+         "Arjun", "Isha", "Kabir", "Meera", "Dev", "Tara")
+LAST = ("Sharma", "Gupta", "Patel", "Verma", "Mehta", "Iyer", "Singh", "Reddy", "Nair", "Khan",
+        "Das", "Joshi", "Kapoor", "Rao")
+LOOKUPS = 1000          # point lookups per lookup case
+
+
+def roll_block(per_branch: int, spare: int) -> int:
+    """Power-of-ten roll block per branch, at least 100 like meta_config.json's ranges."""
+    block = 100
+    while block < per_branch + spare:
+        block *= 10
+    return block
+
+
+def synthetic_students(branch_no: int, branch: str, count: int, block: int, first_roll: int = 0,
+                       seed: int = 42) -> Iterator[Tuple]:
+    rng = random.Random(seed * 31 + branch_no * 7 + first_roll)
+    base = (branch_no + 1) * block
+    for i in range(first_roll, first_roll + count):
+        yield (base + i, f"{rng.choice(FIRST)} {rng.choice(LAST)}", branch,
+               round(rng.uniform(30, 100), 1), round(rng.uniform(50, 100), 1))
+
+
+def setup(n: int, directory: str, spare: int) -> Dict[str, Tuple[int, int]]:
+    """Generate and load n students into SQLite files and point the backend at them. Returns roll_ranges."""
+    close_all_pools()
+    per_branch = -(-n // len(BRANCHES))
+    block = roll_block(per_branch, spare)
+    meta = json.loads(json.dumps(load_meta_config()))
+    storage = SQLiteBackend(directory, [cfg["database"] for cfg in meta["nodes"].values()])
+    ranges = {}
+    for i, branch in enumerate(BRANCHES):
+        count = min(per_branch, n - i * per_branch)
+        storage.load(meta["nodes"][branch]["database"], synthetic_students(i, branch, max(count, 0), block))
+        ranges[branch] = ((i + 1) * block, (i + 2) * block - 1)
+    meta["roll_ranges"] = {b: list(r) for b, r in ranges.items()}
+    meta["replication_enabled"] = False
+    use_meta_config(meta)
+    use_storage(storage)
+    return ranges
+
+
+def timed(fn: Callable, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def cases(n: int, ranges: Dict[str, Tuple[int, int]], insert_rows: int) -> Dict[str, Callable]:
+    rng = random.Random(7)
+    per_branch = -(-n // len(BRANCHES))
+    lo, _ = ranges["CSE"]
+    probes = [ranges[rng.choice(BRANCHES)][0] + rng.randrange(max(per_branch, 1)) for _ in range(LOOKUPS)]
+    state = {"rows": fetch_all_students(), "inserted": 0}
+    by_roll = sorted(state["rows"])
+    index = StudentIndex()
+    index.build(state["rows"])
+
+    def bulk_insert():
+        # Fresh roll numbers every run, after the loaded rows of each block.
+        block = ranges["CSE"][1] - ranges["CSE"][0] + 1
+        first = per_branch + state["inserted"]
+        rows = [row for i, branch in enumerate(BRANCHES)
+                for row in synthetic_students(i, branch, insert_rows // len(BRANCHES), block, first)]
+        state["inserted"] += insert_rows // len(BRANCHES)
+        result = add_students_bulk(rows)
+        if result.errors:
+            raise RuntimeError(result.summary())
+
+    return {
+        "fetch_all": fetch_all_students,
+        "iter_students": lambda: sum(len(chunk) for chunk in iter_students()),
+        "filter (marks 60-80)": lambda: filter_students(marks_min=60, marks_max=80),
+        "filter (1k rolls, pruned)": lambda: filter_students(roll_from=lo, roll_to=lo + 999),
+        "name_index_load": lambda: get_name_index().load(),
+        "search (keyword)": lambda: search_students(keyword="Sharma"),
+        "search (fuzzy)": lambda: fuzzy_search_students("Shrma"),
+        "sort (marks)": lambda: fetch_sorted_students("marks"),
+        "top_50": lambda: fetch_top_students(50),
+        "summary (branch stats)": fetch_branch_stats,
+        "local multi_key_sort": lambda: multi_key_sort(state["rows"], [(2, False), (3, True)]),
+        f"lookup x{LOOKUPS} (binary_search)": lambda: [binary_search(by_roll, r) for r in probes],
+        f"lookup x{LOOKUPS} (StudentIndex)": lambda: [index.get(r) for r in probes],
+        "lookup x20 (shard point query)": lambda: [filter_students(roll_from=r, roll_to=r) for r in probes[:20]],
+        f"bulk_insert ({insert_rows} rows)": bulk_insert,
+    }
+
+
+def run(sizes: List[int], runs: int, insert_rows: int) -> List[dict]:
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory(prefix="bench_backend_") as directory:
+            start = time.perf_counter()
+            ranges = setup(n, directory, spare=insert_rows * runs)
+            print(f"{n:>10,}  {'(generate + load)':<40}{(time.perf_counter() - start) * 1000:12.1f} ms")
+            for name, fn in cases(n, ranges, insert_rows).items():
+                seconds = timed(fn, runs)
+                results.append({"rows": n, "case": name, "seconds": round(seconds, 6), "runs": runs})
+                print(f"{n:>10,}  {name:<40}{seconds * 1000:12.1f} ms")
+            close_all_pools()
+    return results
+
+
+# ---------------------------
+# Consistency checks
+# ---------------------------
+def check_bulk_batch_rollback(directory: str) -> List[str]:
+    """
+    A duplicate roll in the middle of a batch: the batch must insert nothing before
+    the row-by-row retry, so BulkResult, the fragment, StudentIndex and SummaryStore
+    all agree that only the duplicate was rejected.
+    """
+    ranges = setup(100, directory, spare=100)
+    index, store = get_index(), get_summary_store()
+    index.build(fetch_all_students())
+    store.rebuild()
+    lo, hi = ranges["CSE"]
+    before = len(filter_students(roll_from=lo, roll_to=hi))
+    rows = [(lo + 50 + i, "Check Row", "CSE", 50.0, 80.0) for i in range(9)]
+    rows[4] = (lo + 3, "Check Row", "CSE", 50.0, 80.0)     # already loaded
+    result = add_students_bulk(rows, batch_size=len(rows), parallel=False)
+
+    failures = []
+    if (result.inserted, [e.row for e in result.errors]) != (8, [5]):
+        failures.append(f"expected 8 inserted and row 5 rejected, got: {result.summary()}")
+    in_table = len(filter_students(roll_from=lo, roll_to=hi))
+    if in_table != before + result.inserted:
+        failures.append(f"{in_table - before} row(s) in the fragment, {result.inserted} reported inserted")
+    indexed = len(index.filter(roll_from=lo, roll_to=hi))
+    if indexed != in_table:
+        failures.append(f"StudentIndex has {indexed} CSE row(s), the fragment {in_table}")
+    summarized = store.snapshot().get("CSE", {}).get("count")
+    if summarized != in_table:
+        failures.append(f"SummaryStore counts {summarized} CSE row(s), the fragment {in_table}")
+    return failures
+
+
+CHECKS = {"bulk batch rollback": check_bulk_batch_rollback}
+
+
+def run_checks() -> bool:
+    """Run every check on fresh data; True when all pass."""
+    ok = True
+    for name, check in CHECKS.items():
+        with tempfile.TemporaryDirectory(prefix="bench_check_") as directory:
+            failures = check(directory)
+            close_all_pools()
+        ok &= not failures
+        print(f"{'FAIL' if failures else 'OK':<6}{name}")
+        for failure in failures:
+            print(f"      {failure}")
+    return ok
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(results: List[dict], baseline_path: str, tolerance: float) -> bool:
+    """Print each case against the baseline; True when any is slower than the tolerance allows."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["rows"], r["case"]): r["seconds"] for r in json.load(f)["results"]}
+    failed = False
+    for r in results:
+        before = baseline.get((r["rows"], r["case"]))
+        if before is None:
+            continue
+        limit = before * (1 + tolerance)
+        status = "OK" if r["seconds"] <= limit else "REGRESSION"
+        failed |= r["seconds"] > limit
+        print(f"{r['rows']:>10,}  {r['case']:<40}{status:<11}{r['seconds'] * 1000:9.1f} ms  "
+              f"(baseline {before * 1000:.1f} ms)")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--insert-rows", type=int, default=2_000, help="rows per bulk_insert run")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="earlier --json output to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline (default 0.25)")
+    parser.add_argument("--check", action="store_true", help="run the consistency checks instead")
+    args = parser.parse_args()
+
+    if args.check:
+        return 0 if run_checks() else 1
+    results = run(args.sizes, args.runs, args.insert_rows)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+    if args.compare:
+        return 1 if compare(results, args.compare, args.tolerance) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Sort benchmark: original recursive merge sort vs. multi_key_sort (stable builtin
+passes) vs. a plain builtin sorted().
+
+    python benchmarks/bench_sort.py                       # 10k, 1M, 10M rows
+    python benchmarks/bench_sort.py --sizes 10000 100000 --json sort.json
+
+The recursive merge sort is skipped above --python-max rows (default 1M) because
+it takes minutes at 10M.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.algorithm_utils import merge_sort_recursive, multi_key_sort
+
+BRANCHES = ("CSE", "AIML", "DS", "CC")
+
+
+def make_rows(n, seed=42):
+    rng = random.Random(seed)
+    return [(100 + i, f"Student {i}", rng.choice(BRANCHES),
+             round(rng.uniform(30, 100), 1), round(rng.uniform(50, 100), 1)) for i in range(n)]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def run(sizes, python_max):
+    results = []
+    for n in sizes:
+        rows = make_rows(n)
+        cases = {
+            "multi_key_sort (marks)": lambda: multi_key_sort(rows, [(3, False)]),
+            "multi_key_sort (branch, -marks)": lambda: multi_key_sort(rows, [(2, False), (3, True)]),
+            "builtin sorted (marks)": lambda: sorted(rows, key=lambda r: r[3]),
+        }
+        if n <= python_max:
+            cases = {"recursive merge_sort (marks)": lambda: merge_sort_recursive(rows, 3), **cases}
+        for name, fn in cases.items():
+            seconds = timed(fn)
+            results.append({"rows": n, "case": name, "seconds": round(seconds, 6)})
+            print(f"{n:>10,}  {name:<44}{seconds * 1000:12.1f} ms")
+        rows = None                     # free it before the next size is generated
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--python-max", type=int, default=1_000_000,
+                        help="largest size for the recursive merge sort")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.python_max)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
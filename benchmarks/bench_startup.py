@@ -0,0 +1,98 @@
+"""
+Cold-start regression benchmark for the dashboard.
+
+    python benchmarks/bench_startup.py                    # compare with the saved baseline
+    python benchmarks/bench_startup.py --gui              # also time first paint (needs a display)
+    python benchmarks/bench_startup.py --update-baseline  # record the current timings
+
+Each run is a fresh interpreter. "import" is the time to import ui/dashboard.py;
+"first_paint" launches the dashboard with --exit-after-paint and reads the
+startup profiler's "first paint" mark. The median of --runs is compared with
+benchmarks/startup_baseline.json and the script exits with status 1 when any
+metric is more than --tolerance slower. Without a baseline the timings are saved
+as the new one.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+
+IMPORT_SNIPPET = ("import time; t = time.perf_counter(); import ui.dashboard; "
+                  "print(time.perf_counter() - t)")
+
+
+def time_import() -> float:
+    out = subprocess.run([sys.executable, "-c", IMPORT_SNIPPET], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def time_first_paint() -> float:
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        proc = subprocess.run([sys.executable, os.path.join("ui", "dashboard.py"), "--exit-after-paint",
+                               "--profile-json", path], cwd=ROOT, capture_output=True, text=True, timeout=60)
+        if proc.returncode != 0:
+            raise RuntimeError(f"dashboard exited with {proc.returncode}: {proc.stderr.strip()[-300:]}")
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["marks"]["first paint"]
+    finally:
+        os.remove(path)
+
+
+def measure(runs: int, gui: bool) -> dict:
+    metrics = {"import": time_import}
+    if gui:
+        metrics["first_paint"] = time_first_paint
+    results = {}
+    for name, fn in metrics.items():
+        samples = [fn() for _ in range(runs)]
+        results[name] = round(statistics.median(samples), 4)
+        print(f"{name:<12}{results[name] * 1000:9.1f} ms  (median of {runs})")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--gui", action="store_true", help="also time the first paint of the window")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown as a fraction of the baseline (default 0.25)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    try:
+        results = measure(args.runs, args.gui)
+    except (RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"❌ Could not measure startup: {e}")
+        return 2
+    if args.update_baseline or not os.path.exists(args.baseline):
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    failed = False
+    for name, seconds in results.items():
+        if name not in baseline:
+            continue
+        limit = baseline[name] * (1 + args.tolerance)
+        status = "OK" if seconds <= limit else "REGRESSION"
+        failed |= seconds > limit
+        print(f"{name:<12}{status:<11}{seconds * 1000:9.1f} ms  (baseline {baseline[name] * 1000:.1f} ms, "
+              f"limit {limit * 1000:.1f} ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,19 @@
-import mysql.connector
+from backend.read_router import get_read_router
+from backend.scatter_gather import scatter_gather
 
-db_nodes = {
-    "CSE": {
-        "host": "localhost",
-        "user": "root",
-        "password": "@Admin123",
-        "database": "db_cse"
-    },
-    "AIML": {
-        "host": "localhost",
-        "user": "root",
-        "password": "@Admin123",
-        "database": "db_aiml"
-    }
-}
+# query every fragment node listed in backend/meta_config.json in parallel
+result = scatter_gather("SELECT * FROM students;")
 
-for name, config in db_nodes.items():
-    conn = mysql.connector.connect(**config)
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM students;")
-    rows = cursor.fetchall()
+for name, shard in result.shards.items():
     print(f"\nData from {name} node:")
-    for r in rows:
+    if shard.error:
+        print(f"⚠ {shard.error}")
+    for r in shard.rows:
         print(r)
-    conn.close()
+
+print("\nPer-shard timings:")
+print(result.report())
+
+print("\nRead routing (per node):")
+for node, s in get_read_router().stats().items():
+    print(f"{node:<6}{s['reads']:>5} reads  {s['ewma_ms']:8.1f} ms EWMA  {s['errors']} errors")
@@ -212,18 +212,13 @@ END $$
 
 
 -- ======================================================================
--- 6. REPLICATION TRIGGER (CSE → AIML)
+-- 6. REPLICATION
 -- ======================================================================
+-- The synchronous trg_cse_rep trigger is gone: run database/replication.sql
+-- for the per-fragment change logs shipped by backend/replication.py.
 USE db_cse $$
 
 DROP TRIGGER IF EXISTS trg_cse_rep $$
-CREATE TRIGGER trg_cse_rep
-AFTER INSERT ON students
-FOR EACH ROW
-BEGIN
-  REPLACE INTO db_aiml.students (roll_no, name, branch, marks, attendance)
-  VALUES (NEW.roll_no, NEW.name, NEW.branch, NEW.marks, NEW.attendance);
-END $$
 
 DELIMITER ;
 
@@ -0,0 +1,195 @@
+-- ======================================================================
+-- CHANGE LOG + ASYNCHRONOUS REPLICATION SUPPORT
+-- Run after distributed_backend.sql. Replaces the synchronous trg_cse_rep
+-- trigger: every fragment records its own inserts/updates/deletes in a local
+-- change_log table, and backend/replication.py ships the log to the replicas
+-- configured in meta_config.json ("replication" section) in batches.
+-- ======================================================================
+
+DELIMITER $$
+
+-- The old synchronous CSE → AIML copy.
+USE db_cse $$
+DROP TRIGGER IF EXISTS trg_cse_rep $$
+
+-- ----------------------------------------------------------------------
+-- Per-fragment objects (same definition on every fragment database)
+--   change_log         : one row per committed change, seq gives the order
+--   replication_state  : on a replica, last seq applied from each source
+--   trg_students_log_* : write the change_log row in the same transaction.
+--                        Rows applied by the replication manager set
+--                        @replicating = 1 and are not logged again.
+-- ----------------------------------------------------------------------
+USE db_cse $$
+CREATE TABLE IF NOT EXISTS change_log (
+  seq         BIGINT AUTO_INCREMENT PRIMARY KEY,
+  op          CHAR(1) NOT NULL,              -- 'I' insert, 'U' update, 'D' delete
+  roll_no     INT NOT NULL,
+  name        VARCHAR(100),
+  branch      VARCHAR(20),
+  marks       FLOAT,
+  attendance  FLOAT,
+  changed_at  TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  KEY idx_change_log_time (changed_at)
+) $$
+CREATE TABLE IF NOT EXISTS replication_state (
+  source      VARCHAR(20) PRIMARY KEY,
+  last_seq    BIGINT NOT NULL,
+  applied_at  TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+) $$
+DROP TRIGGER IF EXISTS trg_students_log_ins $$
+CREATE TRIGGER trg_students_log_ins AFTER INSERT ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('I', NEW.roll_no, NEW.name, NEW.branch, NEW.marks, NEW.attendance);
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS trg_students_log_upd $$
+CREATE TRIGGER trg_students_log_upd AFTER UPDATE ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('U', NEW.roll_no, NEW.name, NEW.branch, NEW.marks, NEW.attendance);
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS trg_students_log_del $$
+CREATE TRIGGER trg_students_log_del AFTER DELETE ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('D', OLD.roll_no, OLD.name, OLD.branch, OLD.marks, OLD.attendance);
+  END IF;
+END $$
+
+USE db_aiml $$
+CREATE TABLE IF NOT EXISTS change_log (
+  seq         BIGINT AUTO_INCREMENT PRIMARY KEY,
+  op          CHAR(1) NOT NULL,
+  roll_no     INT NOT NULL,
+  name        VARCHAR(100),
+  branch      VARCHAR(20),
+  marks       FLOAT,
+  attendance  FLOAT,
+  changed_at  TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  KEY idx_change_log_time (changed_at)
+) $$
+CREATE TABLE IF NOT EXISTS replication_state (
+  source      VARCHAR(20) PRIMARY KEY,
+  last_seq    BIGINT NOT NULL,
+  applied_at  TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+) $$
+DROP TRIGGER IF EXISTS trg_students_log_ins $$
+CREATE TRIGGER trg_students_log_ins AFTER INSERT ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('I', NEW.roll_no, NEW.name, NEW.branch, NEW.marks, NEW.attendance);
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS trg_students_log_upd $$
+CREATE TRIGGER trg_students_log_upd AFTER UPDATE ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('U', NEW.roll_no, NEW.name, NEW.branch, NEW.marks, NEW.attendance);
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS trg_students_log_del $$
+CREATE TRIGGER trg_students_log_del AFTER DELETE ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('D', OLD.roll_no, OLD.name, OLD.branch, OLD.marks, OLD.attendance);
+  END IF;
+END $$
+
+USE db_ds $$
+CREATE TABLE IF NOT EXISTS change_log (
+  seq         BIGINT AUTO_INCREMENT PRIMARY KEY,
+  op          CHAR(1) NOT NULL,
+  roll_no     INT NOT NULL,
+  name        VARCHAR(100),
+  branch      VARCHAR(20),
+  marks       FLOAT,
+  attendance  FLOAT,
+  changed_at  TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  KEY idx_change_log_time (changed_at)
+) $$
+CREATE TABLE IF NOT EXISTS replication_state (
+  source      VARCHAR(20) PRIMARY KEY,
+  last_seq    BIGINT NOT NULL,
+  applied_at  TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+) $$
+DROP TRIGGER IF EXISTS trg_students_log_ins $$
+CREATE TRIGGER trg_students_log_ins AFTER INSERT ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('I', NEW.roll_no, NEW.name, NEW.branch, NEW.marks, NEW.attendance);
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS trg_students_log_upd $$
+CREATE TRIGGER trg_students_log_upd AFTER UPDATE ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('U', NEW.roll_no, NEW.name, NEW.branch, NEW.marks, NEW.attendance);
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS trg_students_log_del $$
+CREATE TRIGGER trg_students_log_del AFTER DELETE ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('D', OLD.roll_no, OLD.name, OLD.branch, OLD.marks, OLD.attendance);
+  END IF;
+END $$
+
+USE db_cc $$
+CREATE TABLE IF NOT EXISTS change_log (
+  seq         BIGINT AUTO_INCREMENT PRIMARY KEY,
+  op          CHAR(1) NOT NULL,
+  roll_no     INT NOT NULL,
+  name        VARCHAR(100),
+  branch      VARCHAR(20),
+  marks       FLOAT,
+  attendance  FLOAT,
+  changed_at  TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+  KEY idx_change_log_time (changed_at)
+) $$
+CREATE TABLE IF NOT EXISTS replication_state (
+  source      VARCHAR(20) PRIMARY KEY,
+  last_seq    BIGINT NOT NULL,
+  applied_at  TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+) $$
+DROP TRIGGER IF EXISTS trg_students_log_ins $$
+CREATE TRIGGER trg_students_log_ins AFTER INSERT ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('I', NEW.roll_no, NEW.name, NEW.branch, NEW.marks, NEW.attendance);
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS trg_students_log_upd $$
+CREATE TRIGGER trg_students_log_upd AFTER UPDATE ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('U', NEW.roll_no, NEW.name, NEW.branch, NEW.marks, NEW.attendance);
+  END IF;
+END $$
+DROP TRIGGER IF EXISTS trg_students_log_del $$
+CREATE TRIGGER trg_students_log_del AFTER DELETE ON students FOR EACH ROW
+BEGIN
+  IF @replicating IS NULL THEN
+    INSERT INTO change_log (op, roll_no, name, branch, marks, attendance)
+    VALUES ('D', OLD.roll_no, OLD.name, OLD.branch, OLD.marks, OLD.attendance);
+  END IF;
+END $$
+
+DELIMITER ;
+
+-- ======================================================================
+-- ✅ END OF FILE: replication.sql
+-- ======================================================================
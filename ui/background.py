@@ -0,0 +1,200 @@
+# ui/background.py
+
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from backend.metrics import get_metrics
+
+
+class Cancelled(Exception):
+    """Raised inside a streaming job once its request has been superseded or cancelled."""
+
+
+class BackgroundRunner:
+    """
+    Runs database calls on worker threads so the Tk main loop never blocks.
+
+    Workers never touch Tk: they put results on a queue that the main thread drains
+    with after(). Jobs submitted with the same `key` supersede each other — only the
+    newest one's callbacks run, and older ones are cancelled if they have not started
+    (streams stop at their next chunk).
+    """
+
+    def __init__(self, root, status_label=None, max_workers: int = 4, poll_ms: int = 40,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        self.root = root
+        self.status_label = status_label
+        self.on_error = on_error
+        self.poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ui-db")
+        self._queue: "queue.Queue" = queue.Queue()
+        self._tickets = itertools.count(1)
+        self._latest: Dict[str, int] = {}       # key -> newest ticket
+        self._jobs: Dict[int, dict] = {}        # ticket -> {label, future, key}
+        self._lock = threading.Lock()
+        self._polling = False
+        self._status_text = ""
+
+    # ---------------------------
+    # Submitting work
+    # ---------------------------
+    def submit(self, fn: Callable, *args, key: Optional[str] = None, label: str = "Working",
+               on_success: Optional[Callable] = None, on_error: Optional[Callable] = None, **kwargs) -> int:
+        """Run fn(*args, **kwargs) on a worker; on_success(result) runs on the Tk thread."""
+        ticket = self._register(key, label)
+
+        def job():
+            if not self.is_current(ticket):
+                return self._queue.put((ticket, "cancelled", None, None))
+            start = time.perf_counter()
+            try:
+                self._queue.put((ticket, "result", on_success, fn(*args, **kwargs)))
+            except Exception as e:
+                self._queue.put((ticket, "error", on_error, e))
+            finally:
+                get_metrics().observe("job_seconds", time.perf_counter() - start, label=label)
+
+        self._start(ticket, job)
+        return ticket
+
+    def submit_stream(self, gen_fn: Callable, *args, key: Optional[str] = None, label: str = "Loading",
+                      on_chunk: Optional[Callable] = None, on_success: Optional[Callable] = None,
+                      on_error: Optional[Callable] = None, **kwargs) -> int:
+        """
+        Iterate gen_fn(*args, **kwargs) on a worker, delivering each item to on_chunk on
+        the Tk thread; on_success() runs after the last one. Stops early when superseded.
+        """
+        ticket = self._register(key, label)
+
+        def job():
+            gen = None
+            start = time.perf_counter()
+            try:
+                gen = gen_fn(*args, **kwargs)
+                for item in gen:
+                    if not self.is_current(ticket):
+                        raise Cancelled()
+                    self._queue.put((ticket, "chunk", on_chunk, item))
+                self._queue.put((ticket, "finished", on_success, None))
+            except Cancelled:
+                self._queue.put((ticket, "cancelled", None, None))
+            except Exception as e:
+                self._queue.put((ticket, "error", on_error, e))
+            finally:
+                if gen is not None and hasattr(gen, "close"):
+                    gen.close()
+                get_metrics().observe("job_seconds", time.perf_counter() - start, label=label)
+
+        self._start(ticket, job)
+        return ticket
+
+    def call_soon(self, fn: Callable, *args):
+        """
+        Schedule fn(*args) on the Tk thread; safe to call from a running job (e.g. to
+        report progress), since the queue is polled for as long as jobs are in flight.
+        """
+        self._queue.put((None, "call", fn, args))
+
+    def cancel(self, key: str):
+        """Cancel the newest job for `key`; its callbacks will not run."""
+        with self._lock:
+            ticket = self._latest.pop(key, None)
+            job = self._jobs.get(ticket)
+            if job and job["future"] is not None and job["future"].cancel():
+                self._jobs.pop(ticket, None)
+        self._update_status()
+
+    def is_current(self, ticket: int) -> bool:
+        with self._lock:
+            return self._is_current_locked(ticket)
+
+    def shutdown(self):
+        with self._lock:
+            self._latest.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ---------------------------
+    # Internals
+    # ---------------------------
+    def _register(self, key, label) -> int:
+        ticket = next(self._tickets)
+        with self._lock:
+            if key is not None:
+                previous = self._jobs.get(self._latest.get(key))
+                if previous and previous["future"] is not None and previous["future"].cancel():
+                    self._jobs.pop(self._latest[key], None)
+                self._latest[key] = ticket
+            self._jobs[ticket] = {"label": label, "future": None, "key": key}
+        return ticket
+
+    def _start(self, ticket, job):
+        future = self._executor.submit(job)
+        with self._lock:
+            if ticket in self._jobs:
+                self._jobs[ticket]["future"] = future
+        self._update_status()
+        self._ensure_polling()
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        try:
+            while True:
+                ticket, kind, callback, value = self._queue.get_nowait()
+                if kind == "call":
+                    callback(*value)
+                    continue
+                current = self.is_current(ticket)
+                if kind != "chunk":
+                    with self._lock:
+                        self._jobs.pop(ticket, None)
+                if not current or kind == "cancelled":
+                    continue
+                if kind == "error":
+                    callback = callback or self.on_error
+                if callback is None:
+                    continue
+                if kind == "finished":
+                    callback()
+                else:
+                    callback(value)
+        except queue.Empty:
+            pass
+        finally:
+            self._update_status()
+            with self._lock:
+                busy = bool(self._jobs)
+            if busy or not self._queue.empty():
+                self.root.after(self.poll_ms, self._poll)
+            else:
+                self._polling = False
+
+    def _update_status(self):
+        if self.status_label is None:
+            return
+        with self._lock:
+            labels = [j["label"] for t, j in self._jobs.items() if self._is_current_locked(t)]
+        if not labels:
+            text = ""
+        elif len(labels) == 1:
+            text = f"⏳ {labels[0]}…"
+        else:
+            text = f"⏳ {labels[-1]}… (+{len(labels) - 1} more)"
+        if text == self._status_text:
+            return
+        self._status_text = text
+        try:
+            self.status_label.configure(text=text)
+        except Exception:
+            pass
+
+    def _is_current_locked(self, ticket: int) -> bool:
+        job = self._jobs.get(ticket)
+        return job is not None and (job["key"] is None or self._latest.get(job["key"]) == ticket)
@@ -1,25 +1,53 @@
-import time, sys, os
-import customtkinter as ctk
-from tkinter import ttk
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.ticker as mticker
-import numpy as np
+import sys, os
+import base64
 
 # Backend path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+# First, so --profile-startup can time every import below.
+from ui.startup_profile import profiler
+
+import customtkinter as ctk
+import tkinter as tk
+from tkinter import ttk, filedialog
+
 from backend.db_handler import (
     fetch_all_students,
+    iter_students,
     add_student,
     update_student,
     delete_student,
     search_students,
+    fuzzy_search_students,
     filter_students,
+    fetch_sorted_students,
+    fetch_top_students,
+    list_branches,
+    import_students_csv,
+    export_students,
+    current_token,
+    fetch_changes_since,
 )
-from backend.algorithm_utils import merge_sort, binary_search
+from backend.connection_pool import close_all_pools
+from backend.metrics import instrument, stopwatch
+from backend.replication import start_replication, stop_replication
+from backend.name_index import get_name_index
+from backend.student_index import get_index
+from backend.summary_store import get_summary_store
+from ui.background import BackgroundRunner
+from ui.virtual_table import VirtualTable
 
 # ------------------ Helpers ------------------
+def row_tags(s):
+    """Treeview tags for a student row: highlight debarred students (attendance < 75)."""
+    return ("debarred",) if s[4] < 75 else ()
+
+def missing_note(missing):
+    """'' or one line naming the branches left out of a partial result, with why."""
+    if not missing:
+        return ""
+    return "⚠ Partial results, missing: " + "; ".join(f"{b} ({reason})" for b, reason in missing.items())
+
 def center_window(win, parent, width, height):
     parent.update_idletasks()
     try:
@@ -193,7 +221,7 @@ class ColumnFilterDialog(ctk.CTkToplevel):
         # ---- Different filter UIs per column ----
         if column_name == "Branch":
             self.value = ctk.CTkComboBox(
-                frame, values=["All", "CSE", "AIML", "DS", "CC"]
+                frame, values=["All", *list_branches()]
             )
             self.value.set("All")
             self.value.pack(pady=8)
@@ -285,6 +313,24 @@ class StudentDashboard:
         ctk.set_appearance_mode("dark")
         ctk.set_default_color_theme("blue")
         self.setup_ui()
+        profiler.mark("window built")
+        # Load once the window is on screen, so the first paint never waits for data.
+        self._mapped = False
+        self.root.bind("<Map>", self._on_first_map, add="+")
+
+    def _on_first_map(self, _event=None):
+        if self._mapped:
+            return
+        self._mapped = True
+        # Idle callbacks run after the redraws queued by mapping the window.
+        self.root.after_idle(self._after_first_paint)
+
+    def _after_first_paint(self):
+        profiler.mark("first paint")
+        profiler.finish()
+        if profiler.exit_after_paint:
+            self.root.event_generate("<<StartupDone>>")
+            return
         self.load_data()
 
     def setup_ui(self):
@@ -302,7 +348,7 @@ class StudentDashboard:
 
         ctk.CTkButton(btn_inner, text="⟳", width=40, height=26,
                       fg_color="#0D6EFD", font=("Helvetica", 18, "bold"),
-                      command=self.load_data).grid(row=0, column=0, padx=12, pady=12)
+                      command=self.refresh_data).grid(row=0, column=0, padx=12, pady=12)
 
         crud = ctk.CTkFrame(btn_inner, fg_color="transparent")
         crud.grid(row=0, column=1, padx=12)
@@ -313,6 +359,10 @@ class StudentDashboard:
                       **button_cfg).pack(side="left", padx=6)
         ctk.CTkButton(crud, text="🗑 Delete", fg_color="#DC3545",
                       command=self.delete_student_ui, **button_cfg).pack(side="left", padx=6)
+        ctk.CTkButton(crud, text="📥 Import", fg_color="#0DCAF0", text_color="black",
+                      command=self.import_csv_ui, **button_cfg).pack(side="left", padx=6)
+        ctk.CTkButton(crud, text="📤 Export", fg_color="#0DCAF0", text_color="black",
+                      command=self.export_ui, **button_cfg).pack(side="left", padx=6)
 
         actions = ctk.CTkFrame(btn_inner, fg_color="transparent")
         actions.grid(row=0, column=2, padx=20)
@@ -320,9 +370,14 @@ class StudentDashboard:
                       command=self.sort_data, **button_cfg).pack(side="left", padx=6)
         ctk.CTkButton(actions, text="🔍 Search", fg_color="#20C997",
                       command=self.search_data, **button_cfg).pack(side="left", padx=6)
+        ctk.CTkButton(actions, text="🏆 Top 50", fg_color="#FD7E14",
+                      command=self.top_students, **button_cfg).pack(side="left", padx=6)
 
         ctk.CTkButton(btn_inner, text="📈 Summary Stats", fg_color="#6F42C1",
-                      command=self.show_summary, **button_cfg).grid(row=0, column=3, padx=16)
+                      command=self.show_summary, **button_cfg).grid(row=0, column=3, padx=(16, 6))
+        ctk.CTkButton(btn_inner, text="⏱", width=40, height=26, fg_color="#495057",
+                      font=("Helvetica", 18, "bold"),
+                      command=self.show_metrics).grid(row=0, column=4, padx=(6, 12))
 
         table_frame = ctk.CTkFrame(self.root, fg_color="#343A40", corner_radius=12)
         table_frame.pack(pady=12, padx=25, fill="both", expand=True)
@@ -340,36 +395,145 @@ class StudentDashboard:
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, anchor="center", width=160)
-        self.tree.pack(pady=10, fill="both", expand=True)
+        scrollbar = ctk.CTkScrollbar(table_frame, orientation="vertical")
+        scrollbar.pack(side="right", fill="y", pady=10)
+        self.tree.pack(side="left", pady=10, fill="both", expand=True)
         self.tree.bind("<Button-1>", self.on_column_click)
+        self.tree.tag_configure("debarred", foreground="#FF4D4D", background="#3B0000")
+        self.table = VirtualTable(self.tree, scrollbar, tag_fn=row_tags)
 
         self.progress_container = ctk.CTkFrame(self.root, fg_color="transparent")
         self.progress_container.pack(side="bottom", pady=12)
-
-    # ------------------ Data Loading ------------------
-    def load_data(self):
-        for r in self.tree.get_children():
-            self.tree.delete(r)
-        for c in self.progress_container.winfo_children():
+        self.activity_label = ctk.CTkLabel(self.progress_container, text="", text_color="#FFC107")
+        self.activity_label.pack(side="bottom")
+        # Names the branches whose shard failed or timed out when the table is partial.
+        self.partial_label = ctk.CTkLabel(self.progress_container, text="", text_color="#FF6B6B")
+        self.partial_label.pack(side="bottom")
+        self.progress_slot = ctk.CTkFrame(self.progress_container, fg_color="transparent")
+        self.progress_slot.pack()
+
+        # All database calls run on worker threads; results come back via after().
+        self.runner = BackgroundRunner(self.root, self.activity_label, on_error=self.show_error)
+        # In-memory roll/marks/attendance indexes, rebuilt on every full load.
+        self.index = get_index()
+        self.names = get_name_index()
+        self.sync_token = None          # change_log position of the last full load
+        self.table_is_full = False      # the table shows load_data()'s rows, not a sort/filter
+        self.summary = get_summary_store()
+
+    def show_error(self, e):
+        ModernDialog(self.root, "Error", f"⚠ {e}", "error")
+
+    def failed(self, done, then=None):
+        """on_error for a timed handler: record the failure, then report it (or run `then`)."""
+        def on_error(e):
+            done(error=True)
+            (then or self.show_error)(e)
+        return on_error
+
+    def show_partial(self, missing):
+        """Flag (or clear) the branches missing from what the table now shows."""
+        self.partial_label.configure(text=missing_note(missing))
+
+    def new_progress(self):
+        """Replace the progress widgets with a fresh bar and status line."""
+        for c in self.progress_slot.winfo_children():
             c.destroy()
-        progress = ctk.CTkProgressBar(self.progress_container, width=480, height=18)
+        progress = ctk.CTkProgressBar(self.progress_slot, width=480, height=18)
         progress.pack()
         progress.set(0)
-        self.root.update_idletasks()
-
-        students = fetch_all_students()
-        total = len(students) or 1
-        for i, s in enumerate(students):
-            time.sleep(0.02)
-            tag = "debarred" if s[4] < 75 else ""
-            self.tree.insert("", "end", values=s, tags=(tag,))
-            progress.set((i + 1) / total)
-            self.root.update_idletasks()
-        self.tree.tag_configure("debarred", foreground="#FF4D4D", background="#3B0000")
-        if self.root.winfo_exists():
-            self.root.after(200, lambda: ModernDialog(
-                self.root, "Data Loaded",
-                f"✅ Loaded {len(students)} student records!", "success"))
+        status = ctk.CTkLabel(self.progress_slot, text="", text_color="#ADB5BD")
+        status.pack()
+        return progress, status
+
+    # ------------------ Data Loading ------------------
+    def load_data(self):
+        # Timed from the click until the last row is painted; the handler itself only queues the job.
+        done_timing = stopwatch("ui", "load_data")
+        self.table_is_full = False
+        progress, status = self.new_progress()
+
+        def on_progress(done, total):
+            progress.set(done / (total or 1))
+            status.configure(text=f"Rendered {done} of {total} rows")
+
+        sync = {"missing": {}}
+
+        def on_done(total):
+            done_timing(total)
+            missing = sync["missing"]
+            self.show_partial(missing)
+            progress.set(1)
+            status.configure(text=f"Loaded {total} rows")
+            if missing:
+                # Healthy shards' rows stay on screen; the next refresh retries a full load.
+                message = f"⚠ Loaded {total} student records.\n{missing_note(missing)}"
+                if self.root.winfo_exists():
+                    self.root.after(200, lambda: ModernDialog(self.root, "Partial Data", message, "warning"))
+                return
+            self.sync_token = sync.get("token")
+            self.table_is_full = True
+            self.index.build(self.table.rows)
+            self.names.build(self.table.rows)
+            if self.root.winfo_exists():
+                self.root.after(200, lambda: ModernDialog(
+                    self.root, "Data Loaded",
+                    f"✅ Loaded {total} student records!", "success"))
+
+        def on_chunk(chunk):
+            self.table.append_rows(chunk)
+            status.configure(text=f"Fetched {len(self.table.rows)} rows…")
+
+        # Chunks are handed to the table as each fragment streams them in; it paints
+        # them in after() batches (or virtually, for large results). A newer load,
+        # sort or filter supersedes this one (same "table" key).
+        def stream():
+            # Taken before the first row is read, so writes racing with the load are
+            # replayed by the next refresh_data().
+            sync["token"] = current_token()
+            yield from iter_students(missing=sync["missing"])
+
+        self.table.begin(on_progress, on_done)
+        self.runner.submit_stream(stream, key="table", label="Loading students",
+                                  on_chunk=on_chunk, on_success=self.table.finish,
+                                  on_error=self.failed(done_timing))
+
+    def refresh_data(self):
+        """
+        Bring the table up to date with only the rows changed since the last full
+        load (the fragments' change_log), patching them in place. Falls back to
+        load_data() when there is no sync token, the table shows a sort/filter
+        result, or the feed asks for a full reload.
+        """
+        if self.sync_token is None or not self.table_is_full:
+            self.load_data()
+            return
+        done_timing = stopwatch("ui", "refresh_data")
+
+        def apply(changes):
+            if changes.full or not self.table_is_full or not self.table.apply_changes(
+                    changes.upserts, changes.deletes):
+                self.load_data()
+                return
+            self.sync_token = changes.token
+            done_timing(len(changes))
+            self.show_partial(None)
+            for row in changes.upserts:
+                if self.index.loaded:
+                    self.index.upsert(row)
+                if self.names.loaded:
+                    self.names.add(row[0], row[1], row[2])
+            for roll in changes.deletes:
+                if self.index.loaded:
+                    self.index.remove(roll)
+                if self.names.loaded:
+                    self.names.remove(roll)
+            _, status = self.new_progress()
+            status.configure(text=f"Synced {len(changes)} change(s); {len(self.table.rows)} rows")
+
+        self.runner.submit(fetch_changes_since, self.sync_token, key="table",
+                           label="Refreshing students", on_success=apply,
+                           on_error=self.failed(done_timing, lambda e: self.load_data()))
 
     # ------------------ Column Filters ------------------
     def on_column_click(self, event):
@@ -382,19 +546,40 @@ class StudentDashboard:
         ColumnFilterDialog(self.root, column_name, self.apply_column_filter)
 
     def apply_column_filter(self, column=None, **kwargs):
-        if column == "Name" and "keyword" in kwargs:
-            students = search_students(keyword=kwargs.get("keyword"))
+        done_timing = stopwatch("ui", "apply_column_filter")
+
+        def show(students):
+            done_timing(len(students))
+            self.table_is_full = False
+            self.table.set_rows(students)
+            missing = getattr(students, "missing", None)
+            self.show_partial(missing)
+            if missing:
+                ModernDialog(self.root, "Filter Applied",
+                             f"⚠ Showing {len(students)} record(s) after filtering by {column}.\n"
+                             f"{missing_note(missing)}", "warning")
+                return
+            ModernDialog(self.root, "Filter Applied",
+                         f"✅ Showing {len(students)} record(s) after filtering by {column}.",
+                         "success")
+
+        if column in ("Roll No", "Marks", "Attendance") and self.index.loaded:
+            # Range filters are answered from the in-memory index, no round trip.
+            self.runner.cancel("table")
+            show(self.index.filter(**kwargs))
+        elif column == "Name" and "keyword" in kwargs:
+            keyword = kwargs.get("keyword")
+
+            def work():
+                # Substring matches first; on none, the closest names (typos) instead.
+                return search_students(keyword=keyword) or fuzzy_search_students(keyword)
+
+            self.runner.submit(work, key="table", label=f"Filtering by {column}", on_success=show,
+                               on_error=self.failed(done_timing))
         else:
-            students = filter_students(**{k: v for k, v in kwargs.items() if v is not None})
-
-        self.tree.delete(*self.tree.get_children())
-        for s in students:
-            tag = "debarred" if s[4] < 75 else ""
-            self.tree.insert("", "end", values=s, tags=(tag,))
-        self.tree.tag_configure("debarred", foreground="#FF4D4D", background="#3B0000")
-        ModernDialog(self.root, "Filter Applied",
-                     f"✅ Showing {len(students)} record(s) after filtering by {column}.",
-                     "success")
+            self.runner.submit(filter_students, key="table", label=f"Filtering by {column}",
+                               on_success=show, on_error=self.failed(done_timing),
+                               **{k: v for k, v in kwargs.items() if v is not None})
 
     # ------------------ CRUD ------------------
     def ask_sequence_inputs(self, inputs):
@@ -407,12 +592,15 @@ class StudentDashboard:
             results.append(dlg.value)
         return results
 
+    def branch_prompt(self, text="Enter Branch"):
+        return f"{text} ({'/'.join(list_branches())}):"
+
     def add_student_ui(self):
         try:
             prompts = [
                 ("Add Student", "Enter Roll No:", "int"),
                 ("Add Student", "Enter Name:", "text"),
-                ("Add Student", "Enter Branch (CSE/AIML/DS/CC):", "text"),
+                ("Add Student", self.branch_prompt(), "text"),
                 ("Add Student", "Enter Marks:", "float"),
                 ("Add Student", "Enter Attendance:", "float"),
             ]
@@ -420,18 +608,22 @@ class StudentDashboard:
             if not vals:
                 return
             roll_no, name, branch, marks, attendance = vals
-            success = add_student(int(roll_no), name, branch, float(marks), float(attendance))
-            ModernDialog(self.root, "Result",
-                         "✅ Student added successfully!" if success else "❌ Failed to add student.",
-                         "success" if success else "error")
-            self.load_data()
+
+            def done(success):
+                ModernDialog(self.root, "Result",
+                             "✅ Student added successfully!" if success else "❌ Failed to add student.",
+                             "success" if success else "error")
+                self.refresh_data()
+
+            self.runner.submit(add_student, int(roll_no), name, branch, float(marks), float(attendance),
+                               label="Adding student", on_success=done)
         except Exception as e:
             ModernDialog(self.root, "Error", f"⚠ {e}", "error")
 
     def update_student_ui(self):
         prompts = [
             ("Update Student", "Enter Roll No to update:", "int"),
-            ("Update Student", "Enter Branch (CSE/AIML/DS/CC):", "text"),
+            ("Update Student", self.branch_prompt(), "text"),
             ("Update Student", "Enter new Marks:", "float"),
             ("Update Student", "Enter new Attendance:", "float"),
         ]
@@ -439,15 +631,22 @@ class StudentDashboard:
         if not vals:
             return
         roll_no, branch, marks, attendance = vals
-        success = update_student(int(roll_no), branch, float(marks), float(attendance))
-        ModernDialog(self.root, "Update", "✅ Record updated." if success else "❌ Update failed.",
-                     "success" if success else "error")
-        self.load_data()
+
+        def done(success):
+            ModernDialog(self.root, "Update", "✅ Record updated." if success else "❌ Update failed.",
+                         "success" if success else "error")
+            self.refresh_data()
+
+        try:
+            self.runner.submit(update_student, int(roll_no), branch, float(marks), float(attendance),
+                               label="Updating student", on_success=done)
+        except ValueError as e:
+            self.show_error(e)
 
     def delete_student_ui(self):
         prompts = [
             ("Delete Student", "Enter Roll No:", "int"),
-            ("Delete Student", "Enter Branch (CSE/AIML/DS/CC):", "text"),
+            ("Delete Student", self.branch_prompt(), "text"),
         ]
         vals = self.ask_sequence_inputs(prompts)
         if not vals:
@@ -456,59 +655,177 @@ class StudentDashboard:
         confirm = ConfirmDialog(self.root, "Confirm Delete",
                                 f"Delete student {roll_no} from {branch}?")
         if confirm.result:
-            success = delete_student(int(roll_no), branch)
-            ModernDialog(self.root, "Delete", "🗑 Record deleted."
-                         if success else "❌ Delete failed.",
-                         "success" if success else "error")
-            self.load_data()
+            def done(success):
+                ModernDialog(self.root, "Delete", "🗑 Record deleted."
+                             if success else "❌ Delete failed.",
+                             "success" if success else "error")
+                self.refresh_data()
+
+            self.runner.submit(delete_student, int(roll_no), branch,
+                               label="Deleting student", on_success=done)
+
+    def import_csv_ui(self):
+        path = filedialog.askopenfilename(
+            parent=self.root, title="Import Students (CSV)",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")])
+        if not path:
+            return
+        progress, status = self.new_progress()
+
+        def on_progress(done, total):
+            progress.set(done / (total or 1))
+            status.configure(text=f"Imported {done} of {total} rows")
+
+        def done(result):
+            ModernDialog(self.root, "Import Finished", result.summary(),
+                         "warning" if result.errors else "success")
+            self.refresh_data()
+
+        # Shards load in parallel on worker threads; progress is marshalled to the Tk thread.
+        self.runner.submit(import_students_csv, path, label="Importing CSV", on_success=done,
+                           on_error=lambda e: ModernDialog(self.root, "Import Failed", f"⚠ {e}", "error"),
+                           progress=lambda d, t: self.runner.call_soon(on_progress, d, t))
+
+    def export_ui(self):
+        path = filedialog.asksaveasfilename(
+            parent=self.root, title="Export Students", defaultextension=".csv",
+            initialfile="students.csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines", "*.jsonl"),
+                       ("Parquet (needs pyarrow)", "*.parquet"), ("All files", "*.*")])
+        if not path:
+            return
+        progress, status = self.new_progress()
+
+        def on_progress(done, total):
+            progress.set(done / (total or 1))
+            status.configure(text=f"Exported {done} of {total} rows")
+
+        def done(result):
+            progress.set(1)
+            ModernDialog(self.root, "Export Finished", result.summary(),
+                         "warning" if result.partial else "success")
+
+        # Straight from the fragments in chunks, not from the table, so any size fits in memory.
+        self.runner.submit(export_students, path, label="Exporting students", on_success=done,
+                           on_error=lambda e: ModernDialog(self.root, "Export Failed", f"⚠ {e}", "error"),
+                           progress=lambda d, t: self.runner.call_soon(on_progress, d, t))
 
     # ------------------ Algorithms ------------------
     def sort_data(self):
-        students = fetch_all_students()
-        sorted_students = merge_sort(students, key_index=3)
-        self.tree.delete(*self.tree.get_children())
-        for s in sorted_students:
-            tag = "debarred" if s[4] < 75 else ""
-            self.tree.insert("", "end", values=s, tags=(tag,))
-        self.tree.tag_configure("debarred", foreground="#FF4D4D", background="#3B0000")
-        ModernDialog(self.root, "Merge Sort", "✅ Sorted by marks.", "info")
+        done_timing = stopwatch("ui", "sort_data")
+
+        def show(sorted_students):
+            done_timing(len(sorted_students))
+            self.table_is_full = False
+            self.table.set_rows(sorted_students)
+            missing = getattr(sorted_students, "missing", None)
+            self.show_partial(missing)
+            if missing:
+                ModernDialog(self.root, "Merge Sort", f"⚠ Sorted by marks.\n{missing_note(missing)}", "warning")
+                return
+            ModernDialog(self.root, "Merge Sort", "✅ Sorted by marks.", "info")
+
+        # Each fragment sorts its own rows; the coordinator only merges the streams.
+        self.runner.submit(fetch_sorted_students, "marks", key="table",
+                           label="Sorting by marks", on_success=show, on_error=self.failed(done_timing))
+
+    def top_students(self, k=50):
+        done_timing = stopwatch("ui", "top_students")
+
+        def show(students):
+            done_timing(len(students))
+            self.table_is_full = False
+            self.table.set_rows(students)
+            missing = getattr(students, "missing", None)
+            self.show_partial(missing)
+            message = f"🏆 Top {len(students)} students by marks across all branches."
+            if missing:
+                message += f"\n{missing_note(missing)}"
+            ModernDialog(self.root, "Top Students", message, "warning" if missing else "info")
+
+        self.runner.submit(fetch_top_students, k, key="table", label=f"Fetching top {k}",
+                           on_success=show, on_error=self.failed(done_timing))
 
     def search_data(self):
-        """Binary search by Roll Number — classical algorithmic mode."""
-        dlg = CustomInputDialog(self.root, "Binary Search", "Enter Roll No to search:", "int")
+        """Look up a Roll Number in the in-memory hash index (built on first use)."""
+        dlg = CustomInputDialog(self.root, "Search by Roll No", "Enter Roll No to search:", "int")
         if dlg.value is None:
             ModernDialog(self.root, "Cancelled", "Search cancelled.", "info")
             return
         try:
             roll_no = int(dlg.value)
-            students = fetch_all_students()
-            students.sort(key=lambda x: x[0])
-            result = binary_search(students, roll_no)
+        except ValueError as e:
+            self.show_error(e)
+            return
+
+        def show(result):
             if result:
                 ModernDialog(self.root, "Found",
                              f"🎯 {result[1]} ({result[2]})\nMarks: {result[3]}, Attendance: {result[4]}",
                              "success")
             else:
                 ModernDialog(self.root, "Not Found", "No student found with that Roll No.", "warning")
-        except Exception as e:
-            ModernDialog(self.root, "Error", f"⚠ {e}", "error")
+
+        if self.index.loaded:
+            show(self.index.get(roll_no))
+            return
+
+        def work():
+            students = fetch_all_students()
+            if students.missing:
+                # Don't cache an index with branches missing; answer from these rows only.
+                return next((s for s in students if s[0] == roll_no), None)
+            self.index.build(students)
+            return self.index.get(roll_no)
+
+        self.runner.submit(work, key="search", label=f"Searching roll {roll_no}", on_success=show)
 
     # ------------------ Summary ------------------
+    @instrument("ui")
+    def compute_summary(self):
+        """
+        Per-branch stats from the materialized summary store: built once by aggregation
+        pushdown, then maintained from write events, so opening the window is O(branches).
+        """
+        branches = self.summary.snapshot()
+        debarred = sum(s["debarred"] for s in branches.values())
+        # Chart rendered off the UI thread; unchanged data comes straight from the PNG cache.
+        # matplotlib is only imported here, on first use, to keep it out of cold start.
+        from ui.summary_chart import get_summary_chart
+        png = get_summary_chart().render(branches) if branches else None
+        return branches, debarred, png
+
     def show_summary(self):
-        students = fetch_all_students()
-        if not students:
+        done_timing = stopwatch("ui", "show_summary")
+
+        def show(res):
+            self.show_summary_window(*res)
+            done_timing()
+
+        self.runner.submit(self.compute_summary, key="summary", label="Computing summary",
+                           on_success=show, on_error=self.failed(done_timing))
+
+    def rebuild_summary(self, win):
+        """Consistency check: recompute the store from the fragments and reopen the window."""
+        done_timing = stopwatch("ui", "rebuild_summary")
+
+        def done(drifted):
+            done_timing()
+            win.destroy()
+            self.show_summary()
+            if drifted:
+                ModernDialog(self.root, "Summary Rebuilt",
+                             f"⚠ Corrected drift in: {', '.join(drifted)}", "warning")
+
+        self.runner.submit(self.summary.rebuild, key="summary", label="Rebuilding summary",
+                           on_success=done, on_error=self.failed(done_timing))
+
+    @instrument("ui")
+    def show_summary_window(self, branches, debarred, png):
+        if not branches:
             ModernDialog(self.root, "No Data", "No records found.", "warning")
             return
 
-        branches, debarred = {}, 0
-        for s in students:
-            b = s[2].upper()
-            branches.setdefault(b, {"marks": [], "attendance": []})
-            branches[b]["marks"].append(s[3])
-            branches[b]["attendance"].append(s[4])
-            if s[4] < 75:
-                debarred += 1
-
         # Create summary window
         win = ctk.CTkToplevel(self.root)
         win.title("Summary")
@@ -527,13 +844,13 @@ class StudentDashboard:
 
         # Text summary
         text = ""
-        for b, vals in branches.items():
-            m, a = np.array(vals["marks"]), np.array(vals["attendance"])
+        for b, st in branches.items():
             text += f"─── {b} BRANCH ───\n"
-            text += f"Average Marks: {m.mean():.2f}\n"
-            text += f"Max Marks: {m.max():.2f}\n"
-            text += f"Min Marks: {m.min():.2f}\n"
-            text += f"Average Attendance: {a.mean():.2f}%\n\n"
+            text += f"Students: {st['count']}\n"
+            text += f"Average Marks: {st['mean_marks']:.2f} (σ {st['std_marks']:.2f})\n"
+            text += f"Max Marks: {st['max_marks']:.2f}\n"
+            text += f"Min Marks: {st['min_marks']:.2f}\n"
+            text += f"Average Attendance: {st['mean_attendance']:.2f}%\n\n"
         text += f"🚫 Total Debarred (Attendance < 75%): {debarred}\n"
 
         box = ctk.CTkTextbox(scroll, width=440, height=240)
@@ -541,61 +858,30 @@ class StudentDashboard:
         box.insert("1.0", text)
         box.configure(state="disabled")
 
-        # --- Improved Graph ---
-        fig, axs = plt.subplots(1, 2, figsize=(10, 4), facecolor="#1E1E1E")
-        fig.subplots_adjust(wspace=0.4)
-        plt.style.use("ggplot")
-
-        branches_list = list(branches.keys())
-        avg_marks = [np.mean(branches[b]["marks"]) for b in branches_list]
-        avg_att = [np.mean(branches[b]["attendance"]) for b in branches_list]
-
-        # Colors
-        bar_colors = plt.cm.plasma(np.linspace(0.2, 0.8, len(branches_list)))
-
-        # --- Average Marks ---
-        ax1 = axs[0]
-        ax1.bar(branches_list, avg_marks, color=bar_colors, edgecolor="white", linewidth=1.2)
-        ax1.set_title("Average Marks by Branch", color="white", fontsize=13, weight="bold")
-        ax1.set_ylabel("Marks", color="white", fontsize=11)
-        ax1.tick_params(axis="x", rotation=15, colors="white")
-        ax1.tick_params(axis="y", colors="white")
-        ax1.grid(alpha=0.3, linestyle="--")
-
-        for i, val in enumerate(avg_marks):
-            ax1.text(i, val + 0.5, f"{val:.1f}", color="white", ha="center", fontsize=10, weight="bold")
-
-        # --- Attendance ---
-        ax2 = axs[1]
-        ax2.bar(branches_list, avg_att, color=plt.cm.viridis(np.linspace(0.3, 0.8, len(branches_list))),
-            edgecolor="white", linewidth=1.2)
-        ax2.set_title("Average Attendance (%)", color="white", fontsize=13, weight="bold")
-        ax2.set_ylabel("Attendance (%)", color="white", fontsize=11)
-        ax2.tick_params(axis="x", rotation=15, colors="white")
-        ax2.tick_params(axis="y", colors="white")
-        ax2.grid(alpha=0.3, linestyle="--")
-        ax2.yaxis.set_major_formatter(mticker.PercentFormatter())
-
-        for i, val in enumerate(avg_att):
-            ax2.text(i, val + 0.5, f"{val:.1f}%", color="white", ha="center", fontsize=10, weight="bold")
-
-        # Display chart in CTk window
-        canvas = FigureCanvasTkAgg(fig, master=scroll)
-        canvas.draw()
-        widget = canvas.get_tk_widget()
-        widget.pack(pady=10)
-
-        # --- Safe close handling ---
-        def on_close():
-            try:
-                widget.destroy()
-                plt.close(fig)
-            except Exception:
-                pass
-            win.destroy()
-
-        win.protocol("WM_DELETE_WINDOW", on_close)
-        ctk.CTkButton(win, text="Close", width=80, fg_color="#0D6EFD", command=on_close).pack(pady=10)
+        # --- Chart (pre-rendered by SummaryChart) ---
+        image = tk.PhotoImage(master=win, data=base64.b64encode(png))
+        chart = tk.Label(scroll, image=image, bg="#2B2B2B", borderwidth=0)
+        chart.image = image     # keep a reference while the window lives
+        chart.pack(pady=10)
+
+        win.protocol("WM_DELETE_WINDOW", win.destroy)
+        buttons = ctk.CTkFrame(win, fg_color="transparent")
+        buttons.pack(pady=10)
+        ctk.CTkButton(buttons, text="🔄 Rebuild", width=100, fg_color="#6C757D",
+                      command=lambda: self.rebuild_summary(win)).pack(side="left", padx=6)
+        ctk.CTkButton(buttons, text="Close", width=80, fg_color="#0D6EFD", command=win.destroy).pack(side="left", padx=6)
+
+    # ------------------ Metrics ------------------
+    def show_metrics(self):
+        """
+        Live latency/row/byte metrics (backend/metrics.py). ui-layer handlers that run a
+        background job are timed from the click until the result is on screen (superseded
+        clicks record nothing). Handlers that wait on modal dialogs (add/update/delete/import)
+        are not timed; their database work shows up as job_seconds and db-layer calls.
+        """
+        from ui.metrics_panel import MetricsPanel
+        panel = MetricsPanel(self.root)
+        center_window(panel, self.root, 980, 520)
 
 # ------------------ Entry Point ------------------
 if __name__ == "__main__":
@@ -603,11 +889,16 @@ if __name__ == "__main__":
 
     def safe_exit():
         try:
-            plt.close('all')
+            dashboard.runner.shutdown()
+            stop_replication()
+            close_all_pools()
         except Exception:
             pass
         root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", safe_exit)
-    StudentDashboard(root)
+    root.bind("<<StartupDone>>", lambda _e: safe_exit())
+    profiler.mark("Tk root created")
+    dashboard = StudentDashboard(root)
+    start_replication()     # ships change_log to replicas if enabled; always trims it to retention_hours
     root.mainloop()
@@ -7,7 +7,8 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from backend.db_handler import fetch_all_students
-from backend.algorithm_utils import merge_sort, binary_search
+from backend.algorithm_utils import merge_sort
+from backend.student_index import get_index
 
 class StudentAnalyzerApp:
     def __init__(self, root):
@@ -43,7 +44,7 @@ class StudentAnalyzerApp:
         sort_btn.grid(row=0, column=1, padx=10)
 
         search_btn = tk.Button(
-            btn_frame, text="🔍 Search by Roll No (Binary Search)", bg="#FFC107", fg="black",
+            btn_frame, text="🔍 Search by Roll No", bg="#FFC107", fg="black",
             font=("Arial", 11, "bold"), relief="ridge", command=self.search_data
         )
         search_btn.grid(row=0, column=2, padx=10)
@@ -64,6 +65,7 @@ class StudentAnalyzerApp:
             self.tree.delete(row)
 
         students = fetch_all_students()
+        get_index().build(students)
         for s in students:
             self.tree.insert("", tk.END, values=s)
 
@@ -80,16 +82,15 @@ class StudentAnalyzerApp:
         messagebox.showinfo("Merge Sort", "Students sorted by marks successfully!")
 
     def search_data(self):
-        """Use Binary Search to find a student by roll number."""
-        students = fetch_all_students()
-        # Make sure it's sorted by roll number (index 0)
-        students.sort(key=lambda x: x[0])
-
-        roll_no = simpledialog.askinteger("Binary Search", "Enter Roll No to search:")
+        """Find a student by roll number using the in-memory hash index."""
+        roll_no = simpledialog.askinteger("Search by Roll No", "Enter Roll No to search:")
         if roll_no is None:
             return
 
-        result = binary_search(students, roll_no)
+        index = get_index()
+        if not index.loaded:
+            index.build(fetch_all_students())
+        result = index.get(roll_no)
         if result:
             messagebox.showinfo("Result", f"✅ Found: {result[1]} ({result[2]})\nMarks: {result[3]}, Attendance: {result[4]}")
         else:
@@ -0,0 +1,100 @@
+# ui/metrics_panel.py
+
+import customtkinter as ctk
+from tkinter import ttk, filedialog
+
+from backend.metrics import get_metrics
+
+COLUMNS = ("Metric", "Labels", "Count", "p50 ms", "p95 ms", "Max ms", "Value")
+REFRESH_MS = 1000
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.1f}"
+
+
+def metric_rows(snapshot: dict):
+    """Treeview rows for a Metrics.snapshot(): histograms, then counters, then gauges."""
+    for name, series in sorted(snapshot["histograms"].items()):
+        for s in sorted(series, key=lambda s: -s["sum"]):
+            labels = ", ".join(f"{k}={v}" for k, v in s["labels"].items())
+            yield (name, labels, s["count"], _ms(s["p50"]), _ms(s["p95"]), _ms(s["max"]),
+                   f"{_ms(s['sum'])} ms total")
+    for kind in ("counters", "gauges"):
+        for name, series in sorted(snapshot[kind].items()):
+            for s in series:
+                labels = ", ".join(f"{k}={v}" for k, v in s["labels"].items())
+                value = s["value"]
+                yield (name, labels, "", "", "", "", f"{value:,.3f}" if isinstance(value, float) else f"{value:,}")
+
+
+class MetricsPanel(ctk.CTkToplevel):
+    """
+    Live view of backend.metrics: call latency per db_handler function and dashboard
+    handler, per-shard timings, rows and bytes, pool checkouts, Treeview/chart render
+    time, plus pool, read-router and replication gauges. Refreshes every second.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Metrics")
+        self.geometry("980x520")
+        self.configure(fg_color="#1E1E1E")
+        self.metrics = get_metrics()
+
+        ctk.CTkLabel(self, text="⏱ Query & Render Metrics", font=("Helvetica", 18, "bold"),
+                     text_color="#F8F9FA").pack(pady=(14, 6))
+        frame = ctk.CTkFrame(self, fg_color="#343A40", corner_radius=12)
+        frame.pack(padx=14, pady=6, fill="both", expand=True)
+        self.tree = ttk.Treeview(frame, columns=COLUMNS, show="headings")
+        for col, width in zip(COLUMNS, (170, 260, 70, 80, 80, 80, 150)):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor="w" if col in ("Metric", "Labels") else "e")
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y", pady=8)
+        self.tree.pack(side="left", fill="both", expand=True, padx=8, pady=8)
+
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(pady=10)
+        ctk.CTkButton(buttons, text="💾 JSON", width=100, fg_color="#198754",
+                      command=lambda: self.export(".json")).pack(side="left", padx=6)
+        ctk.CTkButton(buttons, text="💾 Prometheus", width=120, fg_color="#6610F2",
+                      command=lambda: self.export(".prom")).pack(side="left", padx=6)
+        ctk.CTkButton(buttons, text="♻ Reset", width=90, fg_color="#6C757D",
+                      command=self.reset).pack(side="left", padx=6)
+        ctk.CTkButton(buttons, text="Close", width=80, fg_color="#0D6EFD",
+                      command=self.destroy).pack(side="left", padx=6)
+
+        self._job = None
+        self.refresh()
+
+    def refresh(self):
+        """Rewrite the rows in place (keeping the scroll position) and schedule the next pass."""
+        rows = list(metric_rows(self.metrics.snapshot()))
+        items = list(self.tree.get_children())
+        for iid, row in zip(items, rows):
+            self.tree.item(iid, values=row)
+        for row in rows[len(items):]:
+            self.tree.insert("", "end", values=row)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+        self._job = self.after(REFRESH_MS, self.refresh)
+
+    def reset(self):
+        self.metrics.reset()
+        self.tree.delete(*self.tree.get_children())
+
+    def export(self, extension: str):
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Export Metrics", defaultextension=extension,
+            initialfile=f"metrics{extension}",
+            filetypes=[("Prometheus text", "*.prom"), ("JSON", "*.json"), ("All files", "*.*")])
+        if path:
+            self.metrics.export(path)
+
+    def destroy(self):
+        if self._job is not None:
+            self.after_cancel(self._job)
+            self._job = None
+        super().destroy()
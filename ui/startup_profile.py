@@ -0,0 +1,108 @@
+# ui/startup_profile.py
+"""
+Startup timing for the dashboard.
+
+Enabled with `python ui/dashboard.py --profile-startup` (or DASHBOARD_PROFILE_STARTUP=1).
+While enabled, every first-time import is timed through a builtins.__import__ wrapper
+(self time excludes nested imports), and named marks such as "window built" and
+"first paint" are recorded relative to process start-up of this module.
+
+    --profile-json PATH   also write the report as JSON
+    --exit-after-paint    quit right after the first paint (used by benchmarks/bench_startup.py)
+"""
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class StartupProfiler:
+    def __init__(self, enabled: bool = False, json_path: Optional[str] = None,
+                 exit_after_paint: bool = False):
+        self.t0 = time.perf_counter()
+        self.enabled = enabled
+        self.json_path = json_path
+        self.exit_after_paint = exit_after_paint
+        self.marks: List[Tuple[str, float]] = []
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self._stack: List[List[float]] = []       # [start, time spent in child imports]
+        self._original_import = None
+        self._thread = threading.get_ident()
+        if enabled:
+            self._install()
+
+    @classmethod
+    def from_argv(cls, argv: List[str]) -> "StartupProfiler":
+        json_path = None
+        if "--profile-json" in argv:
+            i = argv.index("--profile-json")
+            json_path = argv[i + 1] if i + 1 < len(argv) else None
+        exit_after_paint = "--exit-after-paint" in argv
+        enabled = ("--profile-startup" in argv or bool(json_path) or exit_after_paint
+                   or os.environ.get("DASHBOARD_PROFILE_STARTUP") == "1")
+        return cls(enabled, json_path, exit_after_paint)
+
+    # ---------------------------
+    # Import timing
+    # ---------------------------
+    def _install(self):
+        self._original_import = builtins.__import__
+        original = self._original_import
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level or name in sys.modules or threading.get_ident() != self._thread:
+                return original(name, globals, locals, fromlist, level)
+            self._stack.append([time.perf_counter(), 0.0])
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                start, children = self._stack.pop()
+                total = time.perf_counter() - start
+                if self._stack:
+                    self._stack[-1][1] += total
+                if name not in self.imports:
+                    self.imports[name] = {"total": total, "self": total - children}
+
+        builtins.__import__ = timed_import
+
+    def _uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    # ---------------------------
+    # Marks / report
+    # ---------------------------
+    def mark(self, name: str):
+        if self.enabled:
+            self.marks.append((name, time.perf_counter() - self.t0))
+
+    def to_dict(self) -> dict:
+        return {
+            "marks": {name: round(t, 6) for name, t in self.marks},
+            "imports": {name: {k: round(v, 6) for k, v in t.items()} for name, t in self.imports.items()},
+        }
+
+    def report(self, top: int = 15) -> str:
+        lines = ["⏱ Startup profile", "  marks (s since start):"]
+        lines += [f"    {name:<24}{t:8.3f}" for name, t in self.marks]
+        lines.append(f"  slowest imports (top {top}, ms):   self     total")
+        slowest = sorted(self.imports.items(), key=lambda kv: kv[1]["self"], reverse=True)[:top]
+        lines += [f"    {name:<30}{t['self'] * 1000:8.1f}{t['total'] * 1000:10.1f}" for name, t in slowest]
+        return "\n".join(lines)
+
+    def finish(self):
+        """Stop timing imports and print (and optionally save) the report. Safe to call twice."""
+        if not self.enabled or self._original_import is None:
+            return
+        self._uninstall()
+        print(self.report(), file=sys.stderr)
+        if self.json_path:
+            with open(self.json_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, indent=2)
+
+
+profiler = StartupProfiler.from_argv(sys.argv)
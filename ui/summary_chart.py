@@ -0,0 +1,133 @@
+# ui/summary_chart.py
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import matplotlib.style
+import matplotlib.ticker as mticker
+import numpy as np
+from matplotlib import cm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from backend.metrics import get_metrics
+
+BACKGROUND = "#1E1E1E"
+
+
+@lru_cache(maxsize=32)
+def bar_colors(cmap: str, n: int, low: float, high: float):
+    return getattr(cm, cmap)(np.linspace(low, high, n))
+
+
+class SummaryChart:
+    """
+    The Summary Stats bar charts (average marks / average attendance per branch).
+
+    One Figure and one off-screen Agg canvas live for the whole session: styling,
+    axes and colormaps are set up once, and new data only moves bar heights and
+    value labels in place (the bars are rebuilt only when the branch list changes).
+    Rendered PNGs are kept in a small LRU keyed by a hash of the plotted values, so
+    reopening an unchanged summary skips drawing entirely. Not tied to Tk: render()
+    can run on a worker thread and the UI thread only wraps the bytes in a PhotoImage.
+    """
+
+    def __init__(self, cache_size: int = 8, dpi: int = 100):
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self.cache_size = cache_size
+        self.cache_hits = 0
+
+        with matplotlib.style.context("ggplot"):
+            self.fig = Figure(figsize=(10, 4), dpi=dpi, facecolor=BACKGROUND)
+            self.canvas = FigureCanvasAgg(self.fig)
+            self.axes = self.fig.subplots(1, 2)
+        self.fig.subplots_adjust(wspace=0.4)
+        titles = (("Average Marks by Branch", "Marks"), ("Average Attendance (%)", "Attendance (%)"))
+        for ax, (title, ylabel) in zip(self.axes, titles):
+            ax.set_title(title, color="white", fontsize=13, weight="bold")
+            ax.set_ylabel(ylabel, color="white", fontsize=11)
+            ax.tick_params(axis="x", rotation=15, colors="white")
+            ax.tick_params(axis="y", colors="white")
+            ax.grid(alpha=0.3, linestyle="--")
+        self.axes[1].yaxis.set_major_formatter(mticker.PercentFormatter())
+
+        self._branches: List[str] = []
+        self._bars = [None, None]
+        self._labels: List[List] = [[], []]
+
+    # ---------------------------
+    # Data -> artists
+    # ---------------------------
+    @staticmethod
+    def data_key(branches: Dict[str, Dict[str, float]]) -> str:
+        values = [(b, round(s["mean_marks"], 4), round(s["mean_attendance"], 4)) for b, s in branches.items()]
+        return hashlib.sha1(repr(values).encode()).hexdigest()
+
+    def _rebuild_bars(self, names: List[str]):
+        palettes = (("plasma", 0.2, 0.8), ("viridis", 0.3, 0.8))
+        for i, (ax, (cmap, low, high)) in enumerate(zip(self.axes, palettes)):
+            if self._bars[i] is not None:
+                self._bars[i].remove()
+            for label in self._labels[i]:
+                label.remove()
+            # Numeric positions + tick labels: a categorical axis would keep removed branches.
+            x = list(range(len(names)))
+            self._bars[i] = ax.bar(x, [0.0] * len(names), color=bar_colors(cmap, len(names), low, high),
+                                   edgecolor="white", linewidth=1.2)
+            ax.set_xticks(x)
+            ax.set_xticklabels(names)
+            self._labels[i] = [ax.text(pos, 0.0, "", color="white", ha="center", fontsize=10, weight="bold")
+                               for pos in x]
+        self._branches = names
+
+    def update(self, branches: Dict[str, Dict[str, float]]):
+        """Move the bars and value labels to the new averages."""
+        names = list(branches)
+        if names != self._branches:
+            self._rebuild_bars(names)
+        series = ([branches[b]["mean_marks"] for b in names], [branches[b]["mean_attendance"] for b in names])
+        for i, (ax, values, fmt) in enumerate(zip(self.axes, series, ("{:.1f}", "{:.1f}%"))):
+            for bar, label, val in zip(self._bars[i], self._labels[i], values):
+                bar.set_height(val)
+                label.set_y(val + 0.5)
+                label.set_text(fmt.format(val))
+            ax.set_ylim(0, max(values, default=1.0) * 1.12)     # headroom for the value labels
+
+    # ---------------------------
+    # Rendering
+    # ---------------------------
+    def render(self, branches: Dict[str, Dict[str, float]]) -> bytes:
+        """PNG bytes for `branches`, drawn only when this data has not been rendered recently."""
+        key = self.data_key(branches)
+        with self._lock:
+            png = self._cache.get(key)
+            if png is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return png
+            with get_metrics().timer("render_seconds", what="chart"):
+                self.update(branches)
+                buf = io.BytesIO()
+                self.canvas.print_png(buf)
+            png = buf.getvalue()
+            self._cache[key] = png
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            return png
+
+
+_chart: Optional[SummaryChart] = None
+_chart_lock = threading.Lock()
+
+
+def get_summary_chart() -> SummaryChart:
+    global _chart
+    with _chart_lock:
+        if _chart is None:
+            _chart = SummaryChart()
+        return _chart
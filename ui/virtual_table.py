@@ -0,0 +1,230 @@
+# ui/virtual_table.py
+
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from backend.metrics import get_metrics
+
+
+class VirtualTable:
+    """
+    Drives a ttk.Treeview for result sets of any size.
+
+    * Small results (<= virtual_threshold rows) are inserted for real, `chunk_size`
+      rows per after() tick, reporting progress as (rendered, total).
+    * Larger results switch to virtual mode: the Treeview only ever holds the visible
+      window plus `buffer` rows, and scrolling rewrites those items in place.
+    """
+
+    def __init__(self, tree, scrollbar, row_height: int = 28, buffer: int = 10,
+                 chunk_size: int = 500, virtual_threshold: int = 2000,
+                 tag_fn: Optional[Callable[[Sequence], Tuple[str, ...]]] = None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_height = row_height
+        self.buffer = buffer
+        self.chunk_size = chunk_size
+        self.virtual_threshold = virtual_threshold
+        self.tag_fn = tag_fn or (lambda row: ())
+
+        self.rows: List[Sequence] = []
+        self.virtual = False
+        self.offset = 0            # index of the first row shown in virtual mode
+        self._rendered = 0         # rows inserted so far in normal mode
+        self._job = None           # pending after() id of the insert pump
+        self._finished = True
+        self._on_progress = None
+        self._on_done = None
+
+        self.scrollbar.configure(command=self._on_scrollbar)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.tree.bind("<MouseWheel>", self._on_wheel, add="+")
+        self.tree.bind("<Button-4>", lambda e: self._scroll_units(-3), add="+")
+        self.tree.bind("<Button-5>", lambda e: self._scroll_units(3), add="+")
+        self.tree.bind("<Configure>", lambda e: self.virtual and self._render_window(), add="+")
+
+    # ---------------------------
+    # Public API
+    # ---------------------------
+    def clear(self):
+        self._cancel_pump()
+        self.tree.delete(*self.tree.get_children())
+        self.rows, self.virtual, self.offset, self._rendered = [], False, 0, 0
+        self._finished = True
+        self._on_progress = self._on_done = None
+        self.scrollbar.set(0, 1)
+
+    def begin(self, on_progress: Optional[Callable[[int, int], None]] = None,
+              on_done: Optional[Callable[[int], None]] = None):
+        """Start a streamed load; feed it with append_rows() and close it with finish()."""
+        self.clear()
+        self._finished = False
+        self._on_progress, self._on_done = on_progress, on_done
+
+    def append_rows(self, rows: Sequence[Sequence]):
+        self.rows.extend(rows)
+        if not self.virtual and len(self.rows) > self.virtual_threshold:
+            self._enter_virtual_mode()
+        if self.virtual:
+            if self.offset + self.window_size() > len(self.rows) - len(rows):
+                self._render_window()
+            self._update_scrollbar()
+            self._report()
+        elif self._job is None:
+            self._job = self.tree.after(1, self._pump)
+
+    def finish(self):
+        self._finished = True
+        if self.virtual or self._rendered >= len(self.rows):
+            self._report()
+            self._complete()
+
+    def set_rows(self, rows: Sequence[Sequence], on_progress=None, on_done=None):
+        self.begin(on_progress, on_done)
+        self.append_rows(rows)
+        self.finish()
+
+    def apply_changes(self, upserts: Sequence[Sequence], deletes: Sequence) -> bool:
+        """
+        Patch the shown rows in place: replace rows by roll_no (column 0), append new
+        ones and drop deleted ones, touching only the affected Treeview items. Returns
+        False (nothing changed) while a load is still streaming in.
+        """
+        if not self._finished or (not self.virtual and self._rendered < len(self.rows)):
+            return False
+        start = time.perf_counter()
+        gone = set(deletes)
+        updated = {row[0]: row for row in upserts}
+        items = [] if self.virtual else list(self.tree.get_children())
+        kept, seen = [], set()
+        for i, row in enumerate(self.rows):
+            roll = row[0]
+            if roll in gone:
+                if items:
+                    self.tree.delete(items[i])
+                continue
+            if roll in updated:
+                row = updated[roll]
+                seen.add(roll)
+                if items:
+                    self.tree.item(items[i], values=row, tags=self.tag_fn(row))
+            kept.append(row)
+        added = [row for roll, row in updated.items() if roll not in seen]
+        self.rows = kept + added
+        if self.virtual:
+            self._render_window()
+        else:
+            for row in added:
+                self.tree.insert("", "end", values=row, tags=self.tag_fn(row))
+            self._rendered = len(self.rows)
+            if len(self.rows) > self.virtual_threshold:
+                self._enter_virtual_mode()
+        get_metrics().observe("render_seconds", time.perf_counter() - start, what="apply_changes")
+        return True
+
+    def window_size(self) -> int:
+        """Rows that fit in the widget, plus the buffer."""
+        height = self.tree.winfo_height()
+        visible = max(1, height // self.row_height) if height > 1 else int(self.tree.cget("height") or 20)
+        return visible + self.buffer
+
+    # ---------------------------
+    # Normal mode: chunked inserts
+    # ---------------------------
+    def _pump(self):
+        self._job = None
+        start = time.perf_counter()
+        end = min(self._rendered + self.chunk_size, len(self.rows))
+        for row in self.rows[self._rendered:end]:
+            self.tree.insert("", "end", values=row, tags=self.tag_fn(row))
+        metrics = get_metrics()
+        metrics.observe("render_seconds", time.perf_counter() - start, what="tree_insert")
+        metrics.inc("render_rows_total", end - self._rendered, what="tree_insert")
+        self._rendered = end
+        self._report()
+        if self._rendered < len(self.rows):
+            self._job = self.tree.after(1, self._pump)
+        elif self._finished:
+            self._complete()
+
+    def _cancel_pump(self):
+        if self._job is not None:
+            self.tree.after_cancel(self._job)
+            self._job = None
+
+    # ---------------------------
+    # Virtual mode: windowed rendering
+    # ---------------------------
+    def _enter_virtual_mode(self):
+        self._cancel_pump()
+        self.tree.delete(*self.tree.get_children())
+        self.virtual, self.offset, self._rendered = True, 0, 0
+        self._render_window()
+
+    def _render_window(self):
+        """Rewrite the materialized items to show rows[offset : offset + window]."""
+        start = time.perf_counter()
+        window = self.rows[self.offset:self.offset + self.window_size()]
+        items = list(self.tree.get_children())
+        for iid, row in zip(items, window):
+            self.tree.item(iid, values=row, tags=self.tag_fn(row))
+        for row in window[len(items):]:
+            self.tree.insert("", "end", values=row, tags=self.tag_fn(row))
+        if len(items) > len(window):
+            self.tree.delete(*items[len(window):])
+        self.tree.yview_moveto(0)
+        self._update_scrollbar()
+        get_metrics().observe("render_seconds", time.perf_counter() - start, what="virtual_window")
+
+    def _scroll_to(self, offset: int):
+        max_offset = max(0, len(self.rows) - (self.window_size() - self.buffer))
+        offset = max(0, min(int(offset), max_offset))
+        if offset != self.offset:
+            self.offset = offset
+            self._render_window()
+
+    def _scroll_units(self, units: int):
+        if not self.virtual:
+            self.tree.yview_scroll(units, "units")
+            return "break"
+        self._scroll_to(self.offset + units)
+        return "break"
+
+    def _on_wheel(self, event):
+        step = -1 if event.delta > 0 else 1
+        if abs(event.delta) >= 120:
+            step *= abs(event.delta) // 120
+        return self._scroll_units(3 * step)
+
+    def _on_scrollbar(self, *args):
+        if not self.virtual:
+            self.tree.yview(*args)
+            return
+        page = self.window_size() - self.buffer
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * len(self.rows))
+        elif args[0] == "scroll":
+            amount = int(args[1]) * (page if args[2] == "pages" else 1)
+            self._scroll_to(self.offset + amount)
+
+    def _on_tree_scroll(self, first, last):
+        if not self.virtual:
+            self.scrollbar.set(first, last)
+
+    def _update_scrollbar(self):
+        total = len(self.rows) or 1
+        visible = self.window_size() - self.buffer
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + visible) / total))
+
+    # ---------------------------
+    # Callbacks
+    # ---------------------------
+    def _report(self):
+        if self._on_progress:
+            done = len(self.rows) if self.virtual else self._rendered
+            self._on_progress(done, len(self.rows))
+
+    def _complete(self):
+        callback, self._on_done = self._on_done, None
+        if callback:
+            callback(len(self.rows))